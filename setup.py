@@ -28,12 +28,16 @@ INSTALL_REQUIRES = [
     'pybel>=0.14.0,<0.15.0',
     'bio2bel>=0.3.0,<0.4.0',
     'click',
+    'numpy',
     'pandas',
     'sqlalchemy',
     'six',
     'tqdm',
 ]
 EXTRAS_REQUIRE = {
+    'parquet': [
+        'pyarrow',
+    ],
     'web': [
         'flask',
         'flask_admin',
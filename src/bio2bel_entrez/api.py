@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+
+"""A JSON API for high-throughput gene lookups.
+
+The API is registered under ``/api`` on the application from :meth:`bio2bel_entrez.Manager.get_flask_admin_app`, so
+it is served by ``python -m bio2bel_entrez web`` next to the admin interface. It has the following endpoints:
+
+- ``GET /api/genes?entrez_id=5594,116590`` or ``POST /api/genes`` with a JSON list of Entrez Gene identifiers
+- ``GET /api/genes/<entrez_id>``
+- ``GET /api/genes/<entrez_id>/orthologs?tax_id=10090,10116``
+- ``GET /api/species/<taxonomy_id>/genes?symbol=MAPK1,MAPK3``
+- ``GET /api/species/<taxonomy_id>/genes/<symbol>``
+- ``GET /api/xrefs/<database>?value=ENSG00000100030``, which maps to Entrez Gene identifiers
+- ``GET /api/version``
+
+Genes are serialized like :meth:`bio2bel_entrez.models.Gene.to_json`. Results, including misses, are kept in an
+in-process LRU cache that is warmed with genes at startup. ``GET`` responses have an ``ETag`` derived from the data
+version and the request, so clients revalidating with ``If-None-Match`` get a ``304 Not Modified`` without a lookup.
+The data version is the one recorded by the last load of the database (see :mod:`bio2bel_entrez.data_version`). It is
+checked again at most every few seconds, so the cache is emptied and the entity tags change soon after the database is
+reloaded, even by another process.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+from flask import Blueprint, Flask, abort, current_app, jsonify, request
+
+from .cache import DEFAULT_CACHE_SIZE, LRUCache
+from .manager import Manager
+
+__all__ = [
+    'DEFAULT_CHECK_INTERVAL',
+    'DEFAULT_MAX_AGE',
+    'LookupService',
+    'api',
+    'register_api',
+]
+
+log = logging.getLogger(__name__)
+
+#: The default number of seconds clients may cache responses for
+DEFAULT_MAX_AGE = 3600
+
+#: The default number of seconds between checks of the data version
+DEFAULT_CHECK_INTERVAL = 10
+
+_MISSING = object()
+
+api = Blueprint('entrez_api', __name__, url_prefix='/api')
+
+
+class LookupService:
+    """Looks up genes through a manager, keeping the JSON results in an in-process LRU cache."""
+
+    def __init__(self,
+                 manager: Manager,
+                 cache_size: Optional[int] = DEFAULT_CACHE_SIZE,
+                 max_age: int = DEFAULT_MAX_AGE,
+                 check_interval: Optional[float] = DEFAULT_CHECK_INTERVAL):
+        """Initialize the lookup service.
+
+        :param manager: A manager
+        :param cache_size: The maximum number of results to keep. If none, the cache is unbounded.
+        :param max_age: The number of seconds clients may cache responses for
+        :param check_interval: The number of seconds between checks of the data version. If none, it is only
+         checked again on :meth:`refresh`.
+        """
+        self.manager = manager
+        self.cache: LRUCache[Hashable, Any] = LRUCache(cache_size)
+        self.max_age = max_age
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+        self._checked = time.monotonic()
+        self.data_version = self._get_data_version()
+
+    def _get_data_version(self) -> str:
+        """Get the version of the loaded data that changes when the database is reloaded.
+
+        Databases loaded before data versions were recorded fall back to a digest of the counts from
+        :meth:`bio2bel_entrez.Manager.summarize`.
+        """
+        data_version = self.manager.check_data_version()
+        if data_version is not None:
+            return data_version
+
+        summary = json.dumps(self.manager.summarize(), sort_keys=True)
+        return hashlib.sha1(summary.encode('utf-8')).hexdigest()[:16]
+
+    def check_data_version(self) -> bool:
+        """Empty the cache if the data version changed, checking at most once per interval.
+
+        Checking the version can rebuild the manager's indexes, so only one request thread checks at a time.
+
+        :return: If the data version changed
+        """
+        if not self._is_check_due():
+            return False
+
+        with self._check_lock:
+            if not self._is_check_due():  # another thread checked while this one waited
+                return False
+
+            self._checked = time.monotonic()
+            data_version = self._get_data_version()
+            if data_version == self.data_version:
+                return False
+
+            log.info('data version changed from %s to %s', self.data_version, data_version)
+            with self._lock:
+                self.cache.clear()
+            self.data_version = data_version
+            return True
+
+    def _is_check_due(self) -> bool:
+        return self.check_interval is not None and self.check_interval <= time.monotonic() - self._checked
+
+    def refresh(self) -> None:
+        """Empty the cache and get the data version again, e.g., after the database was reloaded."""
+        with self._check_lock:
+            with self._lock:
+                self.cache.clear()
+            self._checked = time.monotonic()
+            self.data_version = self._get_data_version()
+
+    def warm(self, limit: Optional[int] = None) -> int:
+        """Fill the cache with genes by Entrez Gene identifier.
+
+        :param limit: The maximum number of genes to load. Defaults to the size of the cache.
+        :return: The number of genes loaded
+        """
+        limit = limit or self.cache.maxsize
+        genes = self.manager.list_genes(limit=limit, records=True)
+        with self._lock:
+            for gene in genes:
+                self.cache[('gene', gene.entrez_id)] = gene.to_json()
+        log.info('warmed the lookup cache with %d genes', len(genes))
+        return len(genes)
+
+    def _get_many(self, keys: Dict[Hashable, str], fetch: Callable[[List[str]], Dict[str, Any]]) -> Dict[str, Any]:
+        """Get values from the cache, fetching the missing ones at once.
+
+        :param keys: A dictionary from cache keys to the values they are looked up by
+        :param fetch: A function from the values that are not cached to the results that exist
+        """
+        rv = {}
+        missing = {}
+        with self._lock:
+            for key, value in keys.items():
+                result = self.cache.get(key, _MISSING)
+                if result is _MISSING:
+                    missing[key] = value
+                elif result is not None:
+                    rv[value] = result
+
+        if not missing:
+            return rv
+
+        fetched = fetch(list(missing.values()))
+        with self._lock:
+            for key, value in missing.items():
+                result = fetched.get(value)
+                self.cache[key] = result
+                if result is not None:
+                    rv[value] = result
+
+        return rv
+
+    def get_genes(self, entrez_ids: Iterable[str]) -> Dict[str, Dict[str, str]]:
+        """Get a dictionary from Entrez Gene identifiers to genes, for the identifiers that exist."""
+        def fetch(missing_entrez_ids):
+            genes = self.manager.get_genes_by_entrez_ids(missing_entrez_ids, records=True)
+            return {entrez_id: gene.to_json() for entrez_id, gene in genes.items()}
+
+        return self._get_many({('gene', entrez_id): entrez_id for entrez_id in entrez_ids}, fetch)
+
+    def get_genes_by_symbols(self, taxonomy_id: str, symbols: Iterable[str]) -> Dict[str, Dict[str, str]]:
+        """Get a dictionary from symbols to genes in the given species, for the symbols that exist."""
+        def fetch(missing_symbols):
+            genes = self.manager.get_genes_by_symbols(taxonomy_id, missing_symbols, records=True)
+            return {symbol: gene.to_json() for symbol, gene in genes.items()}
+
+        return self._get_many({('symbol', taxonomy_id, symbol): symbol for symbol in symbols}, fetch)
+
+    def get_orthologs(self, entrez_id: str, tax_id_filter: Optional[List[str]] = None) -> List[Dict[str, str]]:
+        """Get the orthologs of a gene, not including the gene itself."""
+        def fetch(_):
+            orthologs = self.manager.get_orthologs(entrez_id, tax_id_filter=tax_id_filter, records=True)
+            return {entrez_id: [ortholog.to_json() for ortholog in orthologs]}
+
+        key = ('orthologs', entrez_id, tax_id_filter and tuple(sorted(tax_id_filter)))
+        return self._get_many({key: entrez_id}, fetch)[entrez_id]
+
+    def map_xrefs(self, database: str, values: Iterable[str]) -> Dict[str, List[str]]:
+        """Map identifiers from the given database to Entrez Gene identifiers, for the identifiers that exist."""
+        def fetch(missing_values):
+            return self.manager.map_xrefs(database, missing_values)
+
+        return self._get_many({('xref', database, value): value for value in values}, fetch)
+
+    def get_etag(self, path: str) -> str:
+        """Get the entity tag of the response to a request, which changes with the data version."""
+        return hashlib.sha1(f'{self.data_version}:{path}'.encode('utf-8')).hexdigest()
+
+
+def register_api(app: Flask,
+                 manager: Manager,
+                 cache_size: Optional[int] = DEFAULT_CACHE_SIZE,
+                 max_age: int = DEFAULT_MAX_AGE,
+                 warm: bool = True,
+                 check_interval: Optional[float] = DEFAULT_CHECK_INTERVAL) -> LookupService:
+    """Register the JSON API on an application.
+
+    :param app: A Flask application
+    :param manager: A manager
+    :param cache_size: The maximum number of results to keep in memory
+    :param max_age: The number of seconds clients may cache responses for
+    :param warm: If true, fill the cache with genes before serving
+    :param check_interval: The number of seconds between checks of the data version
+    :return: The lookup service used by the API
+    """
+    service = LookupService(manager, cache_size=cache_size, max_age=max_age, check_interval=check_interval)
+    if warm:
+        service.warm()
+
+    app.extensions['bio2bel_entrez_lookup'] = service
+    app.register_blueprint(api)
+
+    @app.teardown_appcontext
+    def remove_session(_):
+        """Return the request thread's connection to the pool."""
+        manager.session.remove()
+
+    return service
+
+
+def _get_service() -> LookupService:
+    return current_app.extensions['bio2bel_entrez_lookup']
+
+
+def _get_list_arg(name: str) -> List[str]:
+    """Get a query argument that is given several times, comma separated, or both."""
+    return [
+        value
+        for arg in request.args.getlist(name)
+        for value in arg.split(',')
+        if value
+    ]
+
+
+@api.before_request
+def check_etag():
+    """Answer conditional requests for the current data version without looking anything up."""
+    service = _get_service()
+    service.check_data_version()
+    if request.method == 'GET' and service.get_etag(request.full_path) in request.if_none_match:
+        response = current_app.response_class(status=304)
+        return _add_cache_headers(response)
+
+
+@api.after_request
+def add_cache_headers(response):
+    """Add the entity tag and caching directives to successful responses."""
+    if request.method == 'GET' and response.status_code == 200:
+        _add_cache_headers(response)
+    return response
+
+
+def _add_cache_headers(response):
+    service = _get_service()
+    response.set_etag(service.get_etag(request.full_path))
+    response.cache_control.public = True
+    response.cache_control.max_age = service.max_age
+    return response
+
+
+@api.route('/version')
+def get_version():
+    """Get the data version and the statistics of the cache."""
+    service = _get_service()
+    return jsonify(data_version=service.data_version, cache=service.cache.info()._asdict())
+
+
+@api.route('/genes', methods=['GET', 'POST'])
+def get_genes():
+    """Get genes by Entrez Gene identifiers from the ``entrez_id`` argument or a JSON list in the body."""
+    if request.method == 'POST':
+        entrez_ids = request.get_json(force=True)
+        if not isinstance(entrez_ids, list):
+            abort(400, 'expected a JSON list of Entrez Gene identifiers')
+        entrez_ids = [str(entrez_id) for entrez_id in entrez_ids]
+    else:
+        entrez_ids = _get_list_arg('entrez_id')
+
+    return jsonify(_get_service().get_genes(entrez_ids))
+
+
+@api.route('/genes/<entrez_id>')
+def get_gene(entrez_id: str):
+    """Get a gene by Entrez Gene identifier."""
+    gene = _get_service().get_genes([entrez_id]).get(entrez_id)
+    if gene is None:
+        abort(404, f'gene not found: {entrez_id}')
+    return jsonify(gene)
+
+
+@api.route('/genes/<entrez_id>/orthologs')
+def get_orthologs(entrez_id: str):
+    """Get the orthologs of a gene, optionally only from the species in the ``tax_id`` argument."""
+    tax_id_filter = _get_list_arg('tax_id') or None
+    return jsonify(_get_service().get_orthologs(entrez_id, tax_id_filter=tax_id_filter))
+
+
+@api.route('/species/<taxonomy_id>/genes')
+def get_genes_by_symbols(taxonomy_id: str):
+    """Get genes in a species by the symbols in the ``symbol`` argument."""
+    return jsonify(_get_service().get_genes_by_symbols(taxonomy_id, _get_list_arg('symbol')))
+
+
+@api.route('/species/<taxonomy_id>/genes/<symbol>')
+def get_gene_by_symbol(taxonomy_id: str, symbol: str):
+    """Get a gene in a species by its symbol."""
+    gene = _get_service().get_genes_by_symbols(taxonomy_id, [symbol]).get(symbol)
+    if gene is None:
+        abort(404, f'gene not found in {taxonomy_id}: {symbol}')
+    return jsonify(gene)
+
+
+@api.route('/xrefs/<database>')
+def map_xrefs(database: str):
+    """Map the identifiers in the ``value`` argument from a database to Entrez Gene identifiers."""
+    return jsonify(_get_service().map_xrefs(database, _get_list_arg('value')))
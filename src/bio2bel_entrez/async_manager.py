@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+"""An :mod:`asyncio` interface to the read methods of the manager.
+
+SQLAlchemy 1.3, which Bio2BEL builds on, has no async engine, so the :class:`AsyncManager` runs the manager's read
+methods in a pool of worker threads instead. The manager's session is a :class:`sqlalchemy.orm.scoped_session`, so
+each worker thread uses its own session and connection from the engine's pool, and concurrent lookups do not
+serialize behind one session. Each lookup returns its session's connection to the pool when it is done.
+
+Models can not be shared between threads, so the lookups return :class:`bio2bel_entrez.models.GeneRecord` snapshots.
+
+.. code-block:: python
+
+    async with AsyncManager.from_connection('postgresql://...', pool_size=20) as manager:
+        genes = await asyncio.gather(*(manager.get_gene_by_entrez_id(entrez_id) for entrez_id in entrez_ids))
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, TypeVar
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from pybel.dsl import BaseEntity
+from .manager import Manager
+from .models import GeneRecord
+
+__all__ = [
+    'AsyncManager',
+    'DEFAULT_POOL_SIZE',
+]
+
+log = logging.getLogger(__name__)
+
+X = TypeVar('X')
+
+#: The default number of connections, and worker threads, used by :meth:`AsyncManager.from_connection`
+DEFAULT_POOL_SIZE = 10
+
+
+class AsyncManager:
+    """Runs the read methods of a :class:`bio2bel_entrez.Manager` in worker threads."""
+
+    def __init__(self, manager: Optional[Manager] = None, max_workers: Optional[int] = None):
+        """Initialize the async manager.
+
+        :param manager: A manager whose session is a :class:`sqlalchemy.orm.scoped_session`. If none, builds one with
+         the default connection.
+        :param max_workers: The number of worker threads. Defaults to the number of connections the engine's pool
+         keeps, so lookups do not wait on the pool.
+        :raises ValueError: If the manager's session is not scoped, since it can not be shared between threads
+        """
+        if manager is None:
+            manager = Manager()
+        if not isinstance(manager.session, scoped_session):
+            raise ValueError('the manager needs a scoped session to be used from several threads')
+
+        self.manager = manager
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or _get_pool_capacity(manager),
+            thread_name_prefix='bio2bel_entrez',
+        )
+
+    @classmethod
+    def from_connection(cls, connection: str, pool_size: int = DEFAULT_POOL_SIZE) -> 'AsyncManager':
+        """Build an async manager with a connection pool and a worker thread for each of its connections.
+
+        :param connection: A connection string
+        :param pool_size: The number of connections in the pool. Ignored by SQLite, which does not pool connections
+         to files.
+        """
+        kwargs = {} if connection.startswith('sqlite') else dict(pool_size=pool_size, max_overflow=0)
+        engine = create_engine(connection, **kwargs)
+        session = scoped_session(sessionmaker(bind=engine))
+        return cls(Manager(engine=engine, session=session), max_workers=pool_size)
+
+    async def __aenter__(self) -> 'AsyncManager':  # noqa: D105
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):  # noqa: D105
+        self.close()
+
+    def close(self) -> None:
+        """Wait for the running lookups then stop the worker threads."""
+        self.executor.shutdown(wait=True)
+
+    async def _run(self, func: Callable[..., X], *args, **kwargs) -> X:
+        """Run a method of the manager in a worker thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, lambda: self._call(func, *args, **kwargs))
+
+    def _call(self, func: Callable[..., X], *args, **kwargs) -> X:
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.manager.session.remove()
+
+    async def get_gene_by_entrez_id(self, entrez_id: str) -> Optional[GeneRecord]:
+        """Get a gene with the given Entrez Gene identifier, if it exists.
+
+        :param entrez_id: Entrez Gene identifier
+        """
+        return await self._run(self.manager.get_gene_by_entrez_id, entrez_id, records=True)
+
+    async def get_genes_by_entrez_ids(self, entrez_ids: Iterable[str]) -> Dict[str, GeneRecord]:
+        """Get a dictionary from Entrez Gene identifiers to genes, for the identifiers that exist.
+
+        :param entrez_ids: Entrez Gene identifiers
+        """
+        return await self._run(self.manager.get_genes_by_entrez_ids, list(entrez_ids), records=True)
+
+    async def get_gene_by_symbol(self, taxonomy_id: str, symbol: str) -> Optional[GeneRecord]:
+        """Get a gene by its symbol (case insensitive) in the given species.
+
+        :param taxonomy_id: NCBI taxonomy identifier
+        :param symbol: Entrez Gene symbol
+        """
+        return await self._run(self.manager.get_gene_by_symbol, taxonomy_id, symbol, records=True)
+
+    async def get_genes_by_symbols(self, taxonomy_id: str, symbols: Iterable[str]) -> Dict[str, GeneRecord]:
+        """Get a dictionary from symbols to genes in the given species, for the symbols that exist.
+
+        :param taxonomy_id: NCBI taxonomy identifier
+        :param symbols: Entrez Gene symbols
+        """
+        return await self._run(self.manager.get_genes_by_symbols, taxonomy_id, list(symbols), records=True)
+
+    async def get_orthologs(self, entrez_id: str, tax_id_filter: Optional[Iterable[str]] = None) -> List[GeneRecord]:
+        """Get the orthologs of a gene, not including the gene itself.
+
+        :param entrez_id: Entrez Gene identifier
+        :param tax_id_filter: If given, only return orthologs from these species
+        """
+        if tax_id_filter is not None:
+            tax_id_filter = list(tax_id_filter)
+        return await self._run(self.manager.get_orthologs, entrez_id, tax_id_filter=tax_id_filter, records=True)
+
+    async def get_genes_by_xref(self, database: str, value: str) -> List[GeneRecord]:
+        """Get the genes with the given database cross-reference.
+
+        :param database: The database of the cross-reference as it appears in gene_info, like ``Ensembl``
+        :param value: The identifier in the database as it appears in gene_info, like ``ENSG00000100030``
+        """
+        return await self._run(self.manager.get_genes_by_xref, database, value, records=True)
+
+    async def map_xrefs(self, database: str, values: Iterable[str]) -> Dict[str, List[str]]:
+        """Map many identifiers from the given database to Entrez Gene identifiers.
+
+        :param database: The database of the cross-references, like ``Ensembl``
+        :param values: Identifiers in the database
+        """
+        return await self._run(self.manager.map_xrefs, database, list(values))
+
+    async def lookup_nodes(self, nodes: Iterable[BaseEntity]) -> Dict[BaseEntity, GeneRecord]:
+        """Look up the genes for many nodes at once.
+
+        :param nodes: PyBEL nodes
+        """
+        return await self._run(self.manager.lookup_nodes, list(nodes), records=True)
+
+
+def _get_pool_capacity(manager: Manager) -> Optional[int]:
+    """Get the number of connections the manager's engine pool keeps, if it is bounded."""
+    pool = manager.engine.pool
+    if isinstance(pool, QueuePool):
+        return pool.size()
+    return None
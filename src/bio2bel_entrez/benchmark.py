@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmarks for loading, looking up, and enriching with Bio2BEL Entrez.
+
+Synthetic gene_info and HomoloGene files are generated at a given scale with a fixed seed, so runs are reproducible
+and comparable between releases. The timings are written as JSON.
+
+Run from the command line with ``python -m bio2bel_entrez benchmark``. To benchmark PostgreSQL, pass a connection
+string to an empty database with ``--database``.
+"""
+
+import json
+import logging
+import os
+import platform
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import sqlalchemy
+
+from pybel import BELGraph
+from pybel.dsl import gene, protein
+from .constants import CONSORTIUM_SPECIES_MAPPING, DEFAULT_TAX_IDS
+from .homologene_manager import Manager as HomologeneManager
+from .manager import Manager
+
+__all__ = [
+    'BENCHMARK_VERSION',
+    'generate_gene_info',
+    'generate_homologene',
+    'run_benchmark',
+    'write_results',
+]
+
+log = logging.getLogger(__name__)
+
+#: The version of the layout of the benchmark results
+BENCHMARK_VERSION = 1
+
+#: The number of rows generated at a time, which bounds the memory used when generating large files
+GENERATE_CHUNKSIZE = 1_000_000
+
+#: The species the synthetic genes are spread over. The first three are the HGNC, MGI, and RGD species.
+BENCHMARK_TAX_IDS = (
+    CONSORTIUM_SPECIES_MAPPING['HGNC'],
+    CONSORTIUM_SPECIES_MAPPING['MGI'],
+    CONSORTIUM_SPECIES_MAPPING['RGD'],
+    *DEFAULT_TAX_IDS[3:6],
+)
+
+
+def _iter_synthetic_chunks(n_genes: int, seed: int) -> Iterable[pd.DataFrame]:
+    """Iterate over chunks of synthetic genes.
+
+    Gene ``i`` belongs to species ``i % len(BENCHMARK_TAX_IDS)`` and to HomoloGene group ``i // len(BENCHMARK_TAX_IDS)``
+    if its group is selected, so each group has at most one gene per species.
+    """
+    rng = np.random.RandomState(seed)
+    n_species = len(BENCHMARK_TAX_IDS)
+    tax_ids = np.array(BENCHMARK_TAX_IDS)
+
+    for start in range(0, n_genes, GENERATE_CHUNKSIZE):
+        index = np.arange(start, min(n_genes, start + GENERATE_CHUNKSIZE))
+        symbols = pd.Series(index).map('GENE{}'.format)
+        yield pd.DataFrame({
+            'index': index,
+            '#tax_id': tax_ids[index % n_species],
+            'GeneID': index + 1,
+            'Symbol': symbols.values,
+            'dbXrefs': pd.Series(index).map('Ensembl:ENSG{0:011d}|Vega:OTTHUMG{0:011d}'.format).values,
+            'description': symbols.map('synthetic gene {}'.format).values,
+            'type_of_gene': np.where(rng.rand(len(index)) < 0.8, 'protein-coding', 'ncRNA'),
+            'homologene_id': index // n_species + 1,
+            'in_group': rng.rand(len(index)) < 0.7,
+        })
+
+
+def generate_gene_info(path: str, n_genes: int, seed: int = 0) -> None:
+    """Write a synthetic gene_info file.
+
+    :param path: The path to write to. Compressed if it ends with ``.gz``.
+    :param n_genes: The number of genes
+    :param seed: The seed for the random number generator
+    """
+    columns = ['#tax_id', 'GeneID', 'Symbol', 'dbXrefs', 'description', 'type_of_gene']
+    for i, df in enumerate(_iter_synthetic_chunks(n_genes, seed)):
+        df[columns].to_csv(path, sep='\t', index=False, header=(i == 0), mode='w' if i == 0 else 'a')
+
+
+def generate_homologene(path: str, n_genes: int, seed: int = 0) -> None:
+    """Write a synthetic HomoloGene file for the genes from :func:`generate_gene_info` with the same seed.
+
+    :param path: The path to write to
+    :param n_genes: The number of genes
+    :param seed: The seed for the random number generator
+    """
+    for i, df in enumerate(_iter_synthetic_chunks(n_genes, seed)):
+        df = df[df['in_group']]
+        pd.DataFrame({
+            'homologene_id': df['homologene_id'],
+            'tax_id': df['#tax_id'],
+            'gene_id': df['GeneID'],
+            'gene_symbol': df['Symbol'],
+            'protein_gi': df['GeneID'],
+            'protein_accession': df['GeneID'].map('NP_{}.1'.format),
+        }).to_csv(path, sep='\t', index=False, header=False, mode='w' if i == 0 else 'a')
+
+
+def _make_graph(n_genes: int, n_nodes: int, seed: int) -> BELGraph:
+    """Make a graph with nodes for random synthetic genes, half by Entrez Gene identifier and half by HGNC symbol."""
+    rng = np.random.RandomState(seed)
+    n_species = len(BENCHMARK_TAX_IDS)
+    graph = BELGraph()
+    for i in rng.choice(n_genes, size=min(n_nodes, n_genes), replace=False):
+        if i % 2:
+            graph.add_node_from_data(protein(namespace='ncbigene', identifier=str(i + 1)))
+        else:
+            human = i - i % n_species
+            graph.add_node_from_data(gene(namespace='HGNC', name=f'GENE{human}'))
+    return graph
+
+
+def run_benchmark(n_genes: int = 10_000,
+                  connection: Optional[str] = None,
+                  n_nodes: int = 1_000,
+                  seed: int = 0,
+                  workers: Optional[int] = None,
+                  steps: Optional[Sequence[str]] = None,
+                  ) -> Dict[str, Any]:
+    """Time loading, looking up, and enriching synthetic data.
+
+    :param n_genes: The number of synthetic genes
+    :param connection: A connection string to an empty database. Defaults to a temporary SQLite file.
+    :param n_nodes: The number of nodes in the graphs used for looking up and enriching
+    :param seed: The seed for the random number generator
+    :param workers: The number of worker processes for :meth:`bio2bel_entrez.Manager.populate_gene_info`
+    :param steps: The steps to time after loading. Defaults to all of them.
+    :return: A JSON dictionary of the configuration, environment, and timings in seconds
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        return _run_benchmark(directory, n_genes, connection, n_nodes, seed, workers, steps)
+    finally:
+        shutil.rmtree(directory)
+
+
+def _run_benchmark(directory: str,
+                   n_genes: int,
+                   connection: Optional[str],
+                   n_nodes: int,
+                   seed: int,
+                   workers: Optional[int],
+                   steps: Optional[Sequence[str]],
+                   ) -> Dict[str, Any]:
+    gene_info_path = os.path.join(directory, 'gene_info')
+    homologene_path = os.path.join(directory, 'homologene.data')
+    connection = connection or 'sqlite:///{}'.format(os.path.join(directory, 'benchmark.db'))
+
+    timings = {}
+
+    @contextmanager
+    def timed(key: str):
+        log.info('benchmarking %s', key)
+        t = time.perf_counter()
+        yield
+        timings[key] = time.perf_counter() - t
+
+    with timed('generate'):
+        generate_gene_info(gene_info_path, n_genes, seed=seed)
+        generate_homologene(homologene_path, n_genes, seed=seed)
+
+    manager = Manager(connection=connection)
+    manager.drop_all()
+    manager.create_all()
+
+    with timed('populate_gene_info'):
+        manager.populate_gene_info(url=gene_info_path, tax_id_filter=None, workers=workers)
+    with timed('populate_homologene'):
+        manager.populate_homologene(url=homologene_path)
+    load_metrics = manager.load_metrics.to_json()
+
+    graph = _make_graph(n_genes, n_nodes, seed)
+    benchmarks = dict(
+        lookup_node=lambda: [manager.lookup_node(node) for node in graph],
+        iter_genes=lambda: list(manager.iter_genes(graph)),
+        enrich_orthologies=lambda: manager.enrich_orthologies(graph.copy()),
+        normalize_genes=lambda: manager.normalize_genes(graph.copy()),
+        to_bel=lambda: HomologeneManager(engine=manager.engine, session=manager.session).to_bel(),
+    )
+    for key, func in benchmarks.items():
+        if steps is not None and key not in steps:
+            continue
+        manager.session.expunge_all()
+        with timed(key):
+            func()
+
+    rv = dict(
+        version=BENCHMARK_VERSION,
+        timestamp=time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        config=dict(n_genes=n_genes, n_nodes=n_nodes, seed=seed, workers=workers),
+        environment=dict(
+            python=platform.python_version(),
+            platform=platform.platform(),
+            sqlalchemy=sqlalchemy.__version__,
+            dialect=manager.engine.dialect.name,
+        ),
+        counts=manager.summarize(),
+        timings=timings,
+        load=load_metrics,
+    )
+    manager.session.close()
+    manager.engine.dispose()
+    return rv
+
+
+def write_results(results: Dict[str, Any], path: str) -> None:
+    """Write benchmark results as JSON."""
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2, sort_keys=True)
@@ -0,0 +1,519 @@
+# -*- coding: utf-8 -*-
+
+"""Bulk loading for Bio2BEL Entrez.
+
+The functions in this module skip the ORM and write :mod:`pandas` data frames directly to the tables with
+SQLAlchemy Core ``INSERT`` statements executed in ``executemany`` batches, or with ``COPY`` when the connection is
+to PostgreSQL through :mod:`psycopg2`. Foreign keys are assigned from identifier maps that are read from the database
+once per species instead of once per row.
+
+The same machinery applies a new release of gene_info to an already populated database by diffing on the Entrez Gene
+identifier, so only the rows that changed are written.
+"""
+
+import io
+import logging
+from typing import Iterable, Mapping, NamedTuple, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import Column, Integer, MetaData, Table, bindparam, func, select
+from sqlalchemy.engine import Connection
+
+from .constants import MODULE_NAME
+from .models import Gene, Homologene, IntegerString, Species, Xref
+
+__all__ = [
+    'DEFAULT_CHUNKSIZE',
+    'Tables',
+    'live_tables',
+    'get_species_map',
+    'get_homologene_map',
+    'get_gene_map',
+    'get_max_id',
+    'prepare_gene_df',
+    'prepare_xref_df',
+    'insert_df',
+    'prepare_gene_info_df',
+    'load_gene_info_df',
+    'insert_gene_info',
+    'homologene_member_table',
+    'load_homologene_df',
+    'update_seen_table',
+    'update_gene_info_df',
+    'retire_genes',
+    'retire_homologenes',
+]
+
+log = logging.getLogger(__name__)
+
+#: The number of rows sent to the database in each ``executemany`` call
+DEFAULT_CHUNKSIZE = 50_000
+
+species_table: Table = Species.__table__
+homologene_table: Table = Homologene.__table__
+gene_table: Table = Gene.__table__
+xref_table: Table = Xref.__table__
+
+
+class Tables(NamedTuple):
+    """The tables that make up one generation of the database."""
+
+    species: Table
+    homologene: Table
+    gene: Table
+    xref: Table
+
+
+#: The tables behind the models in :mod:`bio2bel_entrez.models`
+live_tables = Tables(
+    species=species_table,
+    homologene=homologene_table,
+    gene=gene_table,
+    xref=xref_table,
+)
+
+
+def get_species_map(connection: Connection,
+                    taxonomy_ids: Iterable[str],
+                    tables: Tables = live_tables,
+                    ) -> Mapping[str, int]:
+    """Get a dictionary from NCBI taxonomy identifiers to species primary keys, creating the missing species.
+
+    :param connection: A connection to the database
+    :param taxonomy_ids: NCBI taxonomy identifiers
+    :param tables: The tables to use
+    """
+    taxonomy_ids = set(taxonomy_ids)
+    species_map = _get_species_map(connection, tables)
+
+    missing = sorted(taxonomy_ids - set(species_map))
+    if missing:
+        connection.execute(tables.species.insert(), [dict(taxonomy_id=taxonomy_id) for taxonomy_id in missing])
+        species_map = _get_species_map(connection, tables)
+
+    return species_map
+
+
+def _get_species_map(connection: Connection, tables: Tables) -> Mapping[str, int]:
+    query = select([tables.species.c.taxonomy_id, tables.species.c.id])
+    return dict(connection.execute(query).fetchall())
+
+
+def get_homologene_map(connection: Connection,
+                       homologene_ids: Optional[Iterable[str]] = None,
+                       tables: Tables = live_tables,
+                       ) -> Mapping[str, int]:
+    """Get a dictionary from HomoloGene identifiers to HomoloGene primary keys.
+
+    :param connection: A connection to the database
+    :param homologene_ids: HomoloGene identifiers to create if they are missing
+    :param tables: The tables to use
+    """
+    homologene_map = _get_homologene_map(connection, tables)
+    if homologene_ids is None:
+        return homologene_map
+
+    missing = sorted(set(homologene_ids) - set(homologene_map))
+    if missing:
+        insert_df(connection, tables.homologene, pd.DataFrame({'homologene_id': missing}))
+        homologene_map = _get_homologene_map(connection, tables)
+
+    return homologene_map
+
+
+def _get_homologene_map(connection: Connection, tables: Tables) -> Mapping[str, int]:
+    query = select([tables.homologene.c.homologene_id, tables.homologene.c.id])
+    return dict(connection.execute(query).fetchall())
+
+
+def get_gene_map(connection: Connection,
+                 species_id: Optional[int] = None,
+                 min_id: Optional[int] = None,
+                 tables: Tables = live_tables,
+                 ) -> Mapping[str, int]:
+    """Get a dictionary from Entrez Gene identifiers to gene primary keys.
+
+    :param connection: A connection to the database
+    :param species_id: The primary key of a species to restrict the map to
+    :param min_id: Only include genes whose primary keys are greater than this
+    :param tables: The tables to use
+    """
+    query = select([tables.gene.c.entrez_id, tables.gene.c.id])
+    if species_id is not None:
+        query = query.where(tables.gene.c.species_id == species_id)
+    if min_id is not None:
+        query = query.where(tables.gene.c.id > min_id)
+    return dict(connection.execute(query).fetchall())
+
+
+def get_max_id(connection: Connection, table: Table) -> int:
+    """Get the largest primary key in the table, or 0 if it is empty."""
+    return connection.execute(select([func.max(table.c.id)])).scalar() or 0
+
+
+def prepare_gene_df(df: pd.DataFrame) -> pd.DataFrame:
+    """Prepare the rows for the gene table from a subset of gene_info.
+
+    Rows without a symbol are placeholder entries for GeneRIFs and are skipped.
+
+    :param df: A data frame with the columns from :data:`bio2bel_entrez.constants.GENE_INFO_COLUMNS`
+    """
+    df = df[df['Symbol'].notna()]
+    return pd.DataFrame({
+        'entrez_id': df['GeneID'].astype(str),
+        'name': df['Symbol'],
+        'name_lower': df['Symbol'].str.lower(),
+        'description': df['description'],
+        'type_of_gene': df['type_of_gene'],
+    })
+
+
+def prepare_xref_df(df: pd.DataFrame) -> pd.DataFrame:
+    """Prepare the ``(entrez_id, database, value)`` rows for the cross-reference table from a subset of gene_info.
+
+    :param df: A data frame with the columns from :data:`bio2bel_entrez.constants.GENE_INFO_COLUMNS`
+    """
+    df = df[df['Symbol'].notna() & df['dbXrefs'].notna()]
+    xrefs = df.set_index(df['GeneID'].astype(str))['dbXrefs'].str.split('|').explode()
+    xrefs = xrefs[xrefs.str.contains(':', regex=False)]
+    split_xrefs = xrefs.str.split(':', n=1, expand=True)
+    return pd.DataFrame({
+        'entrez_id': split_xrefs.index,
+        'database': split_xrefs[0].values,
+        'value': split_xrefs[1].values,
+    })
+
+
+def insert_df(connection: Connection, table: Table, df: pd.DataFrame, chunksize: Optional[int] = None) -> int:
+    """Insert the rows of a data frame whose columns match the table's columns.
+
+    :param connection: A connection to the database
+    :param table: The table to insert into
+    :param df: A data frame whose columns are a subset of the table's columns
+    :param chunksize: The number of rows to send at a time. Defaults to :data:`DEFAULT_CHUNKSIZE`.
+    :return: The number of rows inserted
+    """
+    if df.empty:
+        return 0
+
+    if connection.dialect.name == 'postgresql' and connection.dialect.driver == 'psycopg2':
+        _copy_df(connection, table, df)
+    else:
+        chunksize = chunksize or DEFAULT_CHUNKSIZE
+        for start in range(0, len(df.index), chunksize):
+            connection.execute(table.insert(), _df_to_records(df.iloc[start:start + chunksize]))
+
+    return len(df.index)
+
+
+def _df_to_records(df: pd.DataFrame):
+    """Convert a data frame to a list of dictionaries, replacing missing values with None."""
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+def _copy_df(connection: Connection, table: Table, df: pd.DataFrame) -> None:
+    """Insert the rows of a data frame with PostgreSQL's ``COPY``."""
+    buffer = io.StringIO()
+    df.to_csv(buffer, header=False, index=False, na_rep='\\N')
+    buffer.seek(0)
+
+    columns = ', '.join(df.columns)
+    sql = f"COPY {table.name} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(sql, buffer)
+    finally:
+        cursor.close()
+
+
+def prepare_gene_info_df(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Prepare the gene and cross-reference rows from a subset of gene_info.
+
+    This does not touch the database, so it can run in a worker process.
+
+    :param df: A data frame with the columns from :data:`bio2bel_entrez.constants.GENE_INFO_COLUMNS`
+    :return: The data frames from :func:`prepare_gene_df` and :func:`prepare_xref_df`
+    """
+    return prepare_gene_df(df), prepare_xref_df(df)
+
+
+def load_gene_info_df(connection: Connection,
+                      df: pd.DataFrame,
+                      species_id: int,
+                      homologene_map: Optional[Mapping[str, int]] = None,
+                      chunksize: Optional[int] = None,
+                      tables: Tables = live_tables,
+                      ) -> Tuple[int, int]:
+    """Insert the genes and cross-references for a single species.
+
+    :param connection: A connection to the database
+    :param df: The subset of gene_info for one species
+    :param species_id: The primary key of the species
+    :param homologene_map: A dictionary from Entrez Gene identifiers to HomoloGene primary keys
+    :param chunksize: The number of rows to send at a time
+    :param tables: The tables to insert into
+    :return: The number of genes and cross-references inserted
+    """
+    gene_df, xref_df = prepare_gene_info_df(df)
+    return insert_gene_info(
+        connection,
+        gene_df,
+        xref_df,
+        species_id=species_id,
+        homologene_map=homologene_map,
+        chunksize=chunksize,
+        tables=tables,
+    )
+
+
+def insert_gene_info(connection: Connection,
+                     gene_df: pd.DataFrame,
+                     xref_df: pd.DataFrame,
+                     species_id: int,
+                     homologene_map: Optional[Mapping[str, int]] = None,
+                     chunksize: Optional[int] = None,
+                     tables: Tables = live_tables,
+                     ) -> Tuple[int, int]:
+    """Insert the prepared genes and cross-references for a single species.
+
+    Genes are written in a first pass, then the primary keys of only the newly inserted genes are read back to
+    write the cross-references in a second pass.
+
+    :param connection: A connection to the database
+    :param gene_df: The genes from :func:`prepare_gene_df`
+    :param xref_df: The cross-references from :func:`prepare_xref_df`
+    :param species_id: The primary key of the species
+    :param homologene_map: A dictionary from Entrez Gene identifiers to HomoloGene primary keys
+    :param chunksize: The number of rows to send at a time
+    :param tables: The tables to insert into
+    :return: The number of genes and cross-references inserted
+    """
+    gene_df = gene_df.assign(species_id=species_id)
+    if homologene_map is not None:
+        gene_df['homologene_id'] = gene_df['entrez_id'].map(homologene_map).astype('Int64')
+
+    max_id = get_max_id(connection, tables.gene)
+    n_genes = insert_df(connection, tables.gene, gene_df, chunksize=chunksize)
+
+    gene_map = get_gene_map(connection, species_id=species_id, min_id=max_id, tables=tables)
+    xref_df = xref_df.assign(gene_id=xref_df['entrez_id'].map(gene_map).astype('Int64')).drop(columns='entrez_id')
+    n_xrefs = insert_df(connection, tables.xref, xref_df, chunksize=chunksize)
+
+    return n_genes, n_xrefs
+
+
+#: A scratch table of the HomoloGene primary key of each Entrez Gene identifier, used to set the genes' groups. It is
+#: temporary, so it is only visible to the connection that loads HomoloGene and concurrent loads do not share it.
+homologene_member_table = Table(
+    f'{MODULE_NAME}_homologene_member',
+    MetaData(),
+    Column('entrez_id', IntegerString, primary_key=True),
+    Column('homologene_id', Integer, nullable=False),
+    prefixes=['TEMPORARY'],
+)
+
+
+def load_homologene_df(connection: Connection,
+                       df: pd.DataFrame,
+                       chunksize: Optional[int] = None,
+                       tables: Tables = live_tables,
+                       ) -> Tuple[int, int]:
+    """Insert the missing HomoloGene groups then set the groups of the genes that are already loaded.
+
+    The distinct groups are inserted in one pass and their primary keys are read back once. The memberships are
+    written to a temporary scratch table so that the genes' foreign keys are set with a single ``UPDATE`` with a
+    correlated subquery instead of one statement per gene.
+
+    :param connection: A connection to the database
+    :param df: A data frame with the ``homologene_id`` and ``gene_id`` columns of HomoloGene
+    :param chunksize: The number of rows to send at a time
+    :param tables: The tables to use
+    :return: The number of HomoloGene groups inserted and the number of genes updated
+    """
+    n_groups = len(_get_homologene_map(connection, tables))
+    homologene_map = get_homologene_map(connection, df['homologene_id'].unique(), tables=tables)
+    n_groups = len(homologene_map) - n_groups
+
+    member_df = pd.DataFrame({
+        'entrez_id': df['gene_id'],
+        'homologene_id': df['homologene_id'].map(homologene_map),
+    }).drop_duplicates('entrez_id')
+
+    homologene_member_table.drop(connection, checkfirst=True)
+    homologene_member_table.create(connection)
+    insert_df(connection, homologene_member_table, member_df, chunksize=chunksize)
+
+    member = homologene_member_table.c
+    gene = tables.gene
+    update = gene.update().where(gene.c.entrez_id.in_(select([member.entrez_id]))).values(
+        homologene_id=select([member.homologene_id]).where(member.entrez_id == gene.c.entrez_id).as_scalar(),
+    )
+    n_genes = connection.execute(update).rowcount
+    homologene_member_table.drop(connection)
+
+    return n_groups, n_genes
+
+
+#: A scratch table of the Entrez Gene identifiers in the new gene_info, used while updating
+update_seen_table = Table(
+    f'{MODULE_NAME}_update_seen',
+    MetaData(),
+    Column('entrez_id', IntegerString, primary_key=True),
+    Column('chunk', Integer, nullable=False, index=True),
+)
+
+#: The columns of the gene table that are compared while updating
+GENE_UPDATE_COLUMNS = [
+    'species_id',
+    'name',
+    'name_lower',
+    'description',
+    'type_of_gene',
+    'homologene_id',
+]
+
+
+def update_gene_info_df(connection: Connection,
+                        df: pd.DataFrame,
+                        chunk: int,
+                        species_map: Mapping[str, int],
+                        homologene_map: Mapping[str, int],
+                        chunksize: Optional[int] = None,
+                        ) -> Tuple[int, int]:
+    """Apply a chunk of a new release of gene_info to the database.
+
+    New genes are inserted and genes whose columns or cross-references changed are updated. The Entrez Gene
+    identifiers in the chunk are recorded in :data:`update_seen_table` so :func:`retire_genes` can remove the genes
+    that are no longer in the release. The table must already exist.
+
+    :param connection: A connection to the database
+    :param df: A chunk of gene_info
+    :param chunk: The number of the chunk
+    :param species_map: A dictionary from NCBI taxonomy identifiers to species primary keys
+    :param homologene_map: A dictionary from Entrez Gene identifiers to HomoloGene primary keys
+    :param chunksize: The number of rows to send at a time
+    :return: The number of genes inserted and updated
+    """
+    gene_df = prepare_gene_df(df)
+    gene_df['species_id'] = df.loc[gene_df.index, '#tax_id'].map(species_map).astype('Int64')
+    gene_df['homologene_id'] = gene_df['entrez_id'].map(homologene_map).astype('Int64')
+
+    insert_df(connection, update_seen_table, pd.DataFrame({'entrez_id': gene_df['entrez_id'], 'chunk': chunk}))
+    seen_in_chunk = update_seen_table.c.chunk == chunk
+
+    existing_df = _select_df(
+        connection,
+        select([gene_table.c.id, gene_table.c.entrez_id] + [gene_table.c[column] for column in GENE_UPDATE_COLUMNS])
+        .select_from(gene_table.join(update_seen_table, gene_table.c.entrez_id == update_seen_table.c.entrez_id))
+        .where(seen_in_chunk)
+    )
+    merged_df = gene_df.merge(existing_df, on='entrez_id', how='left', suffixes=('', '_old'))
+    is_new = merged_df['id'].isna()
+
+    changed = pd.Series(False, index=merged_df.index)
+    for column in GENE_UPDATE_COLUMNS:
+        changed |= _differs(merged_df[column], merged_df[f'{column}_old'])
+    changed &= ~is_new
+
+    # insert the new genes and their cross-references
+    max_id = get_max_id(connection, gene_table)
+    n_inserted = insert_df(connection, gene_table, gene_df[is_new.values], chunksize=chunksize)
+    gene_map = dict(zip(existing_df['entrez_id'], existing_df['id']))
+    gene_map.update(get_gene_map(connection, min_id=max_id))
+
+    xref_df = prepare_xref_df(df)
+    xref_df['gene_id'] = xref_df.pop('entrez_id').map(gene_map).astype('Int64')
+
+    # find the existing genes whose cross-references changed
+    existing_xref_df = _select_df(
+        connection,
+        select([xref_table.c.gene_id, xref_table.c.database, xref_table.c.value])
+        .select_from(
+            xref_table
+            .join(gene_table, xref_table.c.gene_id == gene_table.c.id)
+            .join(update_seen_table, gene_table.c.entrez_id == update_seen_table.c.entrez_id)
+        )
+        .where(seen_in_chunk)
+    )
+    old_xrefs = _get_xref_keys(existing_xref_df)
+    new_xrefs = _get_xref_keys(xref_df)
+    existing_ids = set(existing_df['id'])
+    xref_changed_ids = {
+        gene_id
+        for gene_id in existing_ids
+        if old_xrefs.get(gene_id) != new_xrefs.get(gene_id)
+    }
+
+    # update the changed genes
+    changed |= merged_df['id'].isin(xref_changed_ids)
+    updated_df = merged_df.loc[changed, ['id'] + GENE_UPDATE_COLUMNS].astype({'id': int})
+    if not updated_df.empty:
+        update = gene_table.update().where(gene_table.c.id == bindparam('b_id')).values({
+            column: bindparam(f'b_{column}')
+            for column in GENE_UPDATE_COLUMNS
+        })
+        connection.execute(update, _df_to_records(updated_df.add_prefix('b_')))
+
+    if xref_changed_ids:
+        delete = xref_table.delete().where(xref_table.c.gene_id == bindparam('b_gene_id'))
+        connection.execute(delete, [dict(b_gene_id=gene_id) for gene_id in xref_changed_ids])
+
+    inserted_ids = set(gene_map.values()) - existing_ids
+    insert_df(
+        connection,
+        xref_table,
+        xref_df[xref_df['gene_id'].isin(xref_changed_ids | inserted_ids)],
+        chunksize=chunksize,
+    )
+
+    return n_inserted, len(updated_df.index)
+
+
+def _select_df(connection: Connection, query) -> pd.DataFrame:
+    result = connection.execute(query)
+    return pd.DataFrame.from_records(result.fetchall(), columns=list(result.keys()))
+
+
+def _differs(a: pd.Series, b: pd.Series) -> pd.Series:
+    """Compare two series element-wise, treating missing values as equal to each other."""
+    a_values = a.astype(object).where(a.notna(), None)
+    b_values = b.astype(object).where(b.notna(), None)
+    return ~((a_values == b_values) | (a.isna() & b.isna()))
+
+
+def _get_xref_keys(df: pd.DataFrame) -> Mapping[int, str]:
+    """Get a dictionary from gene primary keys to a canonical string of their cross-references."""
+    if df.empty:
+        return {}
+    xrefs = (df['database'] + ':' + df['value']).groupby(df['gene_id'].astype(int))
+    return xrefs.agg(lambda values: '|'.join(sorted(values))).to_dict()
+
+
+def retire_genes(connection: Connection, tax_id_filter: Optional[Iterable[str]] = None) -> int:
+    """Delete the genes that were not in the new release of gene_info, after :func:`update_gene_info_df`.
+
+    :param connection: A connection to the database
+    :param tax_id_filter: The species that were updated. If none, all species were updated.
+    :return: The number of genes deleted
+    """
+    retired = select([gene_table.c.id]).where(
+        ~gene_table.c.entrez_id.in_(select([update_seen_table.c.entrez_id]))
+    )
+    if tax_id_filter is not None:
+        retired = retired.where(gene_table.c.species_id.in_(
+            select([species_table.c.id]).where(species_table.c.taxonomy_id.in_(list(tax_id_filter)))
+        ))
+
+    connection.execute(xref_table.delete().where(xref_table.c.gene_id.in_(retired)))
+    return connection.execute(gene_table.delete().where(gene_table.c.id.in_(retired))).rowcount
+
+
+def retire_homologenes(connection: Connection) -> int:
+    """Delete the HomoloGene groups that no longer have any genes.
+
+    :param connection: A connection to the database
+    :return: The number of HomoloGene groups deleted
+    """
+    used = select([gene_table.c.homologene_id]).where(gene_table.c.homologene_id.isnot(None))
+    return connection.execute(homologene_table.delete().where(~homologene_table.c.id.in_(used))).rowcount
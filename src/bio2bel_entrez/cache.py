@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+"""Bounded caches for Bio2BEL Entrez.
+
+The :class:`bio2bel_entrez.Manager` caches the primary keys of the models it gets or creates instead of the models
+themselves, so the caches do not keep instances bound to an old session alive and their size can be bounded.
+"""
+
+from collections import OrderedDict
+from typing import Generic, Hashable, NamedTuple, Optional, TypeVar
+
+__all__ = [
+    'DEFAULT_CACHE_SIZE',
+    'CacheInfo',
+    'LRUCache',
+]
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+#: The default number of entries kept by each of the manager's caches
+DEFAULT_CACHE_SIZE = 100_000
+
+
+class CacheInfo(NamedTuple):
+    """Statistics about a cache, like :func:`functools.lru_cache` gives."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class LRUCache(Generic[K, V]):
+    """A mapping that evicts the least recently used entries once it holds more than a maximum number of them."""
+
+    def __init__(self, maxsize: Optional[int] = DEFAULT_CACHE_SIZE) -> None:
+        """Initialize the cache.
+
+        :param maxsize: The maximum number of entries. If none, the cache is unbounded.
+        """
+        if maxsize is not None and maxsize < 0:
+            raise ValueError(f'maxsize must not be negative: {maxsize}')
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: 'OrderedDict[K, V]' = OrderedDict()
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """Get the value for the key and mark it as the most recently used, counting a hit or a miss."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:  # noqa: D105
+        if self.maxsize == 0:
+            return
+
+        self._data[key] = value
+        self._data.move_to_end(key)
+
+        if self.maxsize is not None:
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __delitem__(self, key: K) -> None:  # noqa: D105
+        del self._data[key]
+
+    def __contains__(self, key) -> bool:  # noqa: D105
+        return key in self._data
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self._data)
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """Remove the key and return its value, without counting a hit or a miss."""
+        return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        """Remove all entries. The statistics are kept."""
+        self._data.clear()
+
+    def info(self) -> CacheInfo:
+        """Get the statistics of the cache."""
+        return CacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            maxsize=self.maxsize,
+            currsize=len(self._data),
+        )
@@ -2,9 +2,17 @@
 
 """CLI for Bio2BEL Entrez."""
 
+import json
+import sys
+
 import click
 
-from .manager import Manager
+from .benchmark import run_benchmark, write_results
+from .download import SOURCES, download_sources
+from .export import EXPORT_FORMATS, export_genes
+from .manager import EXPORT_CHUNKSIZE, Manager
+from .migration import migrate_to_integer_keys
+from .snapshot import export_snapshot
 
 main = Manager.get_cli()
 
@@ -39,8 +47,86 @@ def get(manager, entrez_id):
 @click.pass_obj
 def ls(manager, limit, offset):
     """List TSV of genes' identifiers, names, then species taxonomy identifiers."""
-    for g in manager.list_genes(limit=limit, offset=offset):
-        click.echo('\t'.join([g.entrez_id, g.name, str(g.species)]))
+    for g in manager.list_genes(limit=limit, offset=offset, records=True):
+        click.echo('\t'.join([g.entrez_id, g.name, g.taxonomy_id]))
+
+
+@gene.command()
+@click.option('-f', '--format', 'fmt', type=click.Choice(EXPORT_FORMATS), default='tsv', show_default=True)
+@click.option('-o', '--output', type=click.File('wb'), default='-', help='Defaults to standard out')
+@click.option('-t', '--tax-id', multiple=True, help='Only export genes from this species. Can specify multiple.')
+@click.option('--chunksize', type=int, default=EXPORT_CHUNKSIZE, show_default=True,
+              help='Number of genes to read and write at a time')
+@click.pass_obj
+def export(manager, fmt, output, tax_id, chunksize):
+    """Export all genes with their species and HomoloGene groups."""
+    export_genes(manager, output, fmt=fmt, chunksize=chunksize, tax_id_filter=(tax_id or None))
+
+
+@main.command()
+@click.option('-d', '--directory', help='Directory of the snapshot. Defaults to the Bio2BEL data directory.')
+@click.pass_obj
+def snapshot(manager, directory):
+    """Export a memory-mapped snapshot of the genes for read-only lookups."""
+    count = export_snapshot(manager.engine, directory=directory, data_version=manager.check_data_version())
+    click.echo(f'Wrote {count} genes')
+
+
+@main.command(name='data-version')
+@click.pass_obj
+def data_version(manager):
+    """Show the sources, species, and row counts of the last load of the database."""
+    latest = manager.get_data_version()
+    if latest is None:
+        click.echo('No data version recorded. Use populate first')
+        sys.exit(1)
+
+    click.echo(json.dumps(latest.to_json(), indent=2))
+
+
+@main.command()
+@click.option('--keep-previous', is_flag=True, help='Keep the string tables so the migration can be rolled back')
+@click.pass_obj
+def migrate(manager, keep_previous):
+    """Migrate a database from string to integer identifier columns."""
+    manager.session.close()
+    counts = migrate_to_integer_keys(manager.engine, keep_previous=keep_previous)
+    if counts:
+        click.echo(f'Migrated: {counts}')
+    else:
+        click.echo('Already migrated')
+
+
+@main.command()
+@click.option('-n', '--genes', 'n_genes', type=int, default=10_000, show_default=True,
+              help='Number of synthetic genes')
+@click.option('--nodes', 'n_nodes', type=int, default=1_000, show_default=True,
+              help='Number of nodes in the graph for the lookup and enrichment benchmarks')
+@click.option('--database', help='Connection string to an empty database. Defaults to a temporary SQLite file.')
+@click.option('--seed', type=int, default=0, show_default=True)
+@click.option('-w', '--workers', type=int, help='Number of worker processes for loading gene_info')
+@click.option('-o', '--output', type=click.Path(dir_okay=False), help='Write the results as JSON to this file')
+def benchmark(n_genes, n_nodes, database, seed, workers, output):
+    """Benchmark loading, lookups, and enrichment with synthetic data."""
+    results = run_benchmark(n_genes=n_genes, connection=database, n_nodes=n_nodes, seed=seed, workers=workers)
+
+    for key, seconds in results['timings'].items():
+        click.echo(f'{key}\t{seconds:.3f}')
+
+    if output:
+        write_results(results, output)
+
+
+@main.command()
+@click.option('-s', '--source', 'names', multiple=True, type=click.Choice(list(SOURCES)),
+              help='Download this file. Can specify multiple. Defaults to all.')
+@click.option('--check', is_flag=True, help='Download the files again that changed on the server')
+@click.option('--force', is_flag=True, help='Download all of the files again')
+def fetch(names, check, force):
+    """Download the source files in parallel."""
+    sources = {name: SOURCES[name] for name in names or SOURCES}
+    for name, result in download_sources(sources, force=force, check=check).items():
+        click.echo(f'{name}: {result.status} {result.path} ({result.size} bytes)')
 
 
 @main.group()
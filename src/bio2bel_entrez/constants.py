@@ -9,13 +9,22 @@ from bio2bel import get_data_dir
 MODULE_NAME = 'ncbigene'
 DATA_DIR = get_data_dir(MODULE_NAME)
 
-GENE_INFO_URL = 'ftp://ftp.ncbi.nlm.nih.gov/gene/DATA/gene_info.gz'
-GENE2REFSEQ_URL = 'ftp://ftp.ncbi.nlm.nih.gov/gene/DATA/gene2refseq.gz'
+# NCBI serves the same files over HTTPS as over FTP, which supports resuming and revalidating downloads
+GENE_INFO_URL = 'https://ftp.ncbi.nlm.nih.gov/gene/DATA/gene_info.gz'
+GENE2REFSEQ_URL = 'https://ftp.ncbi.nlm.nih.gov/gene/DATA/gene2refseq.gz'
 GENE_INFO_DATA_PATH = os.path.join(DATA_DIR, 'gene_info.gz')
+#: A directory of Parquet files with gene_info partitioned by taxonomy identifier
+GENE_INFO_CACHE_PATH = os.path.join(DATA_DIR, 'gene_info.parquet')
+#: The file in a Parquet cache directory, of gene_info or gene2refseq, that records which version of the source file
+#: it was built from
+CACHE_MANIFEST = 'source.json'
+#: The directory of the memory-mapped snapshot written by :func:`bio2bel_entrez.snapshot.export_snapshot`
+SNAPSHOT_PATH = os.path.join(DATA_DIR, 'snapshot')
 GENE2REFSEQ_DATA_PATH = os.path.join(DATA_DIR, 'gene2refseq.gz')
-GENE2REFSEQ_HUMAN_DATA_PATH = os.path.join(DATA_DIR, 'gene2refseq.human')
-GENE2REFSEQ_HUMAN_SLIM_DATA_PATH = os.path.join(DATA_DIR, 'gene2refseq.human.slim')
+#: A directory of Parquet files with the rows of gene2refseq for some species, partitioned by taxonomy identifier
+GENE2REFSEQ_CACHE_PATH = os.path.join(DATA_DIR, 'gene2refseq.parquet')
 HOMOLOGENE_DATA_PATH = os.path.join(DATA_DIR, 'homologene.data')
+HOMOLOGENE_BUILD_DATA_PATH = os.path.join(DATA_DIR, 'homologene_release_number.txt')
 
 #: Columns fro gene_info.gz that are used
 GENE_INFO_COLUMNS = [
@@ -27,8 +36,11 @@ GENE_INFO_COLUMNS = [
     'type_of_gene',
 ]
 
-HOMOLOGENE_BUILD_URL = 'ftp://ftp.ncbi.nih.gov/pub/HomoloGene/current/RELEASE_NUMBER'
-HOMOLOGENE_URL = 'ftp://ftp.ncbi.nih.gov/pub/HomoloGene/current/homologene.data'
+#: The number of rows of gene_info.gz to read at a time
+GENE_INFO_CHUNKSIZE = 200_000
+
+HOMOLOGENE_BUILD_URL = 'https://ftp.ncbi.nih.gov/pub/HomoloGene/current/RELEASE_NUMBER'
+HOMOLOGENE_URL = 'https://ftp.ncbi.nih.gov/pub/HomoloGene/current/homologene.data'
 
 HOMOLOGENE_COLUMNS = [
     'homologene_id',
@@ -69,6 +81,15 @@ CONSORTIUM_SPECIES_MAPPING = {
 VALID_ENTREZ_NAMESPACES = {'egid', 'eg', 'entrez', 'ncbigene'}
 VALID_MGI_NAMESPACES = {'mgi', 'mgd'}
 
+#: All namespace codes (in upper case) whose names are gene symbols of a given species
+SYMBOL_NAMESPACE_SPECIES_MAPPING = {
+    **CONSORTIUM_SPECIES_MAPPING,
+    **{
+        namespace.upper(): CONSORTIUM_SPECIES_MAPPING['MGI']
+        for namespace in VALID_MGI_NAMESPACES
+    },
+}
+
 ENCODING = {
     'protein-coding': 'GRP',
     'miscRNA': 'GR',
@@ -102,6 +123,20 @@ GENE2REFSEQ_HEADER = [
     'Symbol',
 ]
 
+#: The columns of gene2refseq with the locations of genes on genomic accessions
+GENE2REFSEQ_LOCATION_COLUMNS = [
+    '#tax_id',
+    'GeneID',
+    'genomic_nucleotide_accession.version',
+    'start_position_on_the_genomic_accession',
+    'end_position_on_the_genomic_accession',
+    'orientation',
+    'assembly',
+]
+
+#: The number of rows of gene2refseq to read at a time
+GENE2REFSEQ_CHUNKSIZE = 500_000
+
 GENE2REFSEQ_COLUMNS = [
     '#tax_id',
     'GeneID',
@@ -120,3 +155,10 @@ GENE2REFSEQ_COLUMNS = [
     # 'mature_peptide_gi',
     'Symbol',
 ]
+
+#: The columns of gene2refseq that are kept in its Parquet cache
+GENE2REFSEQ_CACHE_COLUMNS = [
+    column
+    for column in GENE2REFSEQ_HEADER
+    if column in GENE2REFSEQ_COLUMNS or column in GENE2REFSEQ_LOCATION_COLUMNS
+]
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+"""Versions of the loaded data, for telling whether the database is up to date with the source files.
+
+After each load, a :class:`bio2bel_entrez.models.DataVersion` row records the HomoloGene release, the size and MD5
+checksum of each source file, the species that were loaded, the row counts of each table, and the time. Its
+``version`` is a digest of the checksums and the species, so loading the same files for the same species gives the
+same version:
+
+- :meth:`bio2bel_entrez.Manager.populate` skips loading when the database already has the version of the sources,
+  and swaps in a new generation with :meth:`bio2bel_entrez.Manager.reload` when it has another version
+- :meth:`bio2bel_entrez.Manager.check_data_version` empties the manager's in-process caches and indexes when the
+  version changed, e.g., after another process reloaded the database
+- :class:`bio2bel_entrez.api.LookupService` empties its cache and changes its entity tags when the version changes
+- :func:`bio2bel_entrez.snapshot.export_snapshot` records the version a snapshot was exported from
+
+Show the current version with ``python -m bio2bel_entrez data-version``.
+"""
+
+import hashlib
+import json
+import uuid
+from typing import Any, Iterable, List, Mapping, Optional
+
+__all__ = [
+    'DATA_VERSION_LENGTH',
+    'read_homologene_release',
+    'get_tax_ids',
+    'make_data_version',
+]
+
+#: The number of hexadecimal digits in a data version
+DATA_VERSION_LENGTH = 16
+
+
+def read_homologene_release(path: str) -> str:
+    """Read the release number of HomoloGene from a downloaded ``RELEASE_NUMBER`` file."""
+    with open(path) as file:
+        return file.read().strip()
+
+
+def get_tax_ids(tax_id_filter: Optional[Iterable[str]]) -> Optional[List[str]]:
+    """Get the sorted, distinct NCBI taxonomy identifiers of a filter, or None if it keeps all species."""
+    if tax_id_filter is None:
+        return
+    return sorted(set(tax_id_filter))
+
+
+def make_data_version(stamps: Mapping[str, Mapping[str, Any]], tax_ids: Optional[List[str]]) -> str:
+    """Get a digest of the checksums of the source files and the species that were loaded from them.
+
+    If the checksum of a file is not known, the version is random so that it does not match any other load.
+
+    :param stamps: A dictionary from the names of the sources to their stamps from
+     :func:`bio2bel_entrez.download.get_source_stamp`
+    :param tax_ids: The species that were loaded, from :func:`get_tax_ids`
+    """
+    checksums = {name: stamp['md5'] for name, stamp in stamps.items()}
+    if None in checksums.values():
+        return uuid.uuid4().hex[:DATA_VERSION_LENGTH]
+
+    key = json.dumps(dict(checksums=checksums, tax_ids=tax_ids), sort_keys=True)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:DATA_VERSION_LENGTH]
@@ -0,0 +1,581 @@
+# -*- coding: utf-8 -*-
+
+"""Concurrent, resumable downloads of the NCBI source files.
+
+A :class:`Download` fetches a file over HTTP(S) to the Bio2BEL data directory:
+
+- The file is written to a ``.part`` file first. After an interruption, the next attempt resumes it with a ``Range``
+  request, unless the remote file has changed since.
+- The size is checked against the ``Content-Length``. If an MD5 checksum is given, the file must match it.
+- With ``check=True``, a downloaded file is revalidated with ``If-None-Match`` and ``If-Modified-Since``, so it is
+  only downloaded again when the remote file changed. The validators, size, and checksum are kept in a JSON file next
+  to the downloaded file.
+- A download can be read while it is being written. Files ending with ``.gz`` are decompressed in a pipeline, in a
+  ``pigz`` process when it is installed, so parsing starts with the first bytes that arrive.
+
+:func:`download_sources` downloads several of the :data:`SOURCES` at once in a thread pool. URLs with other schemes,
+like ``ftp://``, are downloaded in full without resuming or revalidating. Run from the command line with
+``python -m bio2bel_entrez fetch``.
+"""
+
+import email.utils
+import gzip
+import hashlib
+import http.client
+import io
+import json
+import logging
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, Dict, Mapping, NamedTuple, Optional, Tuple
+from urllib.error import HTTPError
+from urllib.parse import urlparse
+from urllib.request import Request, urlopen
+
+from .constants import (
+    GENE2REFSEQ_DATA_PATH, GENE2REFSEQ_URL, GENE_INFO_DATA_PATH, GENE_INFO_URL, HOMOLOGENE_BUILD_DATA_PATH,
+    HOMOLOGENE_BUILD_URL, HOMOLOGENE_DATA_PATH, HOMOLOGENE_URL,
+)
+
+__all__ = [
+    'Source',
+    'SOURCES',
+    'DownloadError',
+    'DownloadResult',
+    'Download',
+    'download',
+    'download_sources',
+    'start_downloads',
+    'open_decompressed',
+    'get_pigz',
+    'get_md5',
+    'get_source_stamp',
+]
+
+log = logging.getLogger(__name__)
+
+#: The number of seconds to wait for the server
+DEFAULT_TIMEOUT = 60
+
+#: The number of bytes to read and write at a time
+BLOCK_SIZE = 1 << 20
+
+
+class Source(NamedTuple):
+    """A remote file and the local path it is downloaded to."""
+
+    url: str
+    path: str
+
+
+#: The files from NCBI used by this package, by name
+SOURCES: Dict[str, Source] = {
+    'gene_info': Source(GENE_INFO_URL, GENE_INFO_DATA_PATH),
+    'homologene': Source(HOMOLOGENE_URL, HOMOLOGENE_DATA_PATH),
+    'homologene_build': Source(HOMOLOGENE_BUILD_URL, HOMOLOGENE_BUILD_DATA_PATH),
+    'gene2refseq': Source(GENE2REFSEQ_URL, GENE2REFSEQ_DATA_PATH),
+}
+
+
+class DownloadError(OSError):
+    """Raised when a download is interrupted or the downloaded file does not have the expected size or checksum."""
+
+
+class DownloadResult(NamedTuple):
+    """The outcome of a download."""
+
+    url: str
+    path: str
+    #: One of ``cached`` (used without asking the server), ``not_modified``, ``downloaded``, or ``resumed``
+    status: str
+    size: int
+    #: The MD5 checksum of the file, if it was downloaded with this module
+    md5: Optional[str]
+
+    @property
+    def transferred(self) -> bool:
+        """Check if the file was downloaded, in full or in part."""
+        return self.status in {'downloaded', 'resumed'}
+
+
+class Download:
+    """A download of a file that can be read while it is being written.
+
+    Use it as a context manager. The request is sent on entering. On exiting, the download is finished if it was not
+    read to the end, or stopped if there was an exception, keeping the ``.part`` file to resume later.
+    """
+
+    def __init__(self,
+                 url: str,
+                 path: str,
+                 force: bool = False,
+                 check: bool = False,
+                 md5: Optional[str] = None,
+                 timeout: float = DEFAULT_TIMEOUT):
+        """Prepare a download.
+
+        :param url: The URL of the file
+        :param path: The path to write the file to
+        :param force: If true, download the whole file even if it was downloaded before
+        :param check: If true, download the file again if the remote file changed since it was downloaded. Otherwise,
+         a previously downloaded file is used without asking the server.
+        :param md5: The expected MD5 checksum of the file
+        :param timeout: The number of seconds to wait for the server
+        """
+        self.url = url
+        self.path = path
+        self.force = force
+        self.check = check
+        self.md5 = md5
+        self.timeout = timeout
+
+        #: The outcome, once the file is available
+        self.result: Optional[DownloadResult] = None
+
+        self._response = None
+        self._offset = 0
+        self._size: Optional[int] = None
+        self._validators: Dict[str, Optional[str]] = {}
+        self._reader: Optional[BinaryIO] = None
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    @property
+    def part_path(self) -> str:
+        """Get the path the file is written to until it is complete."""
+        return f'{self.path}.part'
+
+    @property
+    def is_current(self) -> bool:
+        """Check if the file at the path is ready to read without a transfer."""
+        return self.result is not None and not self.result.transferred
+
+    def __enter__(self) -> 'Download':  # noqa: D105
+        self._request()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):  # noqa: D105
+        if exc_type is None:
+            self.wait()
+        else:
+            self.close()
+
+    def _request(self) -> None:
+        exists = os.path.exists(self.path)
+        if exists and not self.force and not self.check:
+            log.info('using cached data at %s', self.path)
+            self.result = self._get_existing_result('cached')
+            return
+
+        if urlparse(self.url).scheme not in {'http', 'https'}:
+            log.info('downloading %s to %s', self.url, self.path)
+            self._response = urlopen(self.url, timeout=self.timeout)
+            self._size = _get_int(self._response.headers.get('Content-Length'))
+            return
+
+        headers = self._get_range_headers()
+        if exists and not self.force:
+            headers.update(_get_conditional_headers(_read_json(_get_sidecar_path(self.path))))
+
+        self._request_http(headers)
+
+    def _get_range_headers(self) -> Dict[str, str]:
+        """Get the headers to resume a previous attempt, if it was of the same URL and can be validated."""
+        partial = _read_json(_get_sidecar_path(self.part_path))
+        if_range = _get_if_range(partial)
+        if not os.path.exists(self.part_path) or partial.get('url') != self.url or if_range is None:
+            return {}
+
+        self._offset = os.path.getsize(self.part_path)
+        return {
+            'Range': f'bytes={self._offset}-',
+            'If-Range': if_range,
+        }
+
+    def _request_http(self, headers: Dict[str, str]) -> None:
+        try:
+            response = urlopen(Request(self.url, headers=headers), timeout=self.timeout)
+        except HTTPError as e:
+            if e.code == 304:
+                log.info('%s is not modified', self.url)
+                self.result = self._get_existing_result('not_modified')
+                return
+            if e.code == 416 and self._offset:
+                log.info('can not resume %s. Starting over', self.url)
+                self._remove_part()
+                self._offset = 0
+                return self._request()
+            raise DownloadError(f'could not download {self.url}: {e}') from e
+
+        if response.status == 206:
+            start, self._size = _parse_content_range(response.headers['Content-Range'])
+            if start != self._offset:
+                response.close()
+                raise DownloadError(f'asked for {self.url} from byte {self._offset} but got it from byte {start}')
+            log.info('resuming %s to %s at byte %d', self.url, self.path, self._offset)
+        else:
+            self._offset = 0
+            self._size = _get_int(response.headers.get('Content-Length'))
+            log.info('downloading %s to %s', self.url, self.path)
+
+        self._validators = dict(
+            url=self.url,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+        )
+        _write_json(_get_sidecar_path(self.part_path), self._validators)
+        self._response = response
+
+    def _get_existing_result(self, status: str) -> DownloadResult:
+        return DownloadResult(self.url, self.path, status, os.path.getsize(self.path), _get_recorded_md5(self.path))
+
+    def _transfer(self, sink: Optional[Callable[[bytes], Any]] = None) -> DownloadResult:
+        """Write the rest of the file, also passing all of its bytes to the sink if given."""
+        md5 = hashlib.md5()
+        self._write_part(md5, sink)
+
+        size = os.path.getsize(self.part_path)
+        if self._size is not None and size != self._size:
+            raise DownloadError(f'got {size} of {self._size} bytes of {self.url}')
+
+        checksum = md5.hexdigest()
+        if self.md5 is not None and checksum != self.md5:
+            self._remove_part()
+            raise DownloadError(f'the MD5 checksum of {self.url} is {checksum}, not {self.md5}')
+
+        os.replace(self.part_path, self.path)
+        if self._validators.get('last_modified'):
+            mtime = email.utils.parsedate_to_datetime(self._validators['last_modified']).timestamp()
+            os.utime(self.path, (mtime, mtime))
+        _write_json(
+            _get_sidecar_path(self.path),
+            dict(self._validators, size=size, mtime=os.stat(self.path).st_mtime, md5=checksum),
+        )
+        self._remove_part()
+
+        status = 'resumed' if self._offset else 'downloaded'
+        log.info('%s %s to %s (%d bytes)', status, self.url, self.path, size)
+        return DownloadResult(self.url, self.path, status, size, checksum)
+
+    def _write_part(self, md5, sink: Optional[Callable[[bytes], Any]]) -> None:
+        """Append the response to the part file, hashing the whole file and passing it to the sink."""
+        if self._offset:
+            with open(self.part_path, 'rb') as file:
+                for block in iter(lambda: file.read(BLOCK_SIZE), b''):
+                    md5.update(block)
+                    if sink is not None:
+                        sink(block)
+
+        try:
+            with open(self.part_path, 'ab' if self._offset else 'wb') as file:
+                for block in iter(lambda: self._response.read(BLOCK_SIZE), b''):
+                    file.write(block)
+                    md5.update(block)
+                    if sink is not None:
+                        sink(block)
+        except (http.client.HTTPException, OSError) as e:
+            raise DownloadError(f'the download of {self.url} was interrupted: {e}') from e
+        finally:
+            self._response.close()
+
+    def _remove_part(self) -> None:
+        for path in (self.part_path, _get_sidecar_path(self.part_path)):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def open(self) -> BinaryIO:
+        """Open the file for reading, decompressing it if it ends with ``.gz``.
+
+        If the file is being downloaded, it is read while it is being written and has to be read to the end for the
+        download to finish. Errors of the download are raised when the end is read.
+        """
+        if self._response is None:
+            return open_decompressed(self.path)
+
+        if self._reader is not None:
+            raise ValueError(f'the download of {self.url} is already being read')
+
+        pigz = get_pigz() if self.path.endswith('.gz') else None
+        if pigz is not None:
+            process = subprocess.Popen([pigz, '-dc'], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+            sink, pipe = process.stdin, process.stdout
+            file = pipe
+        else:
+            process = None
+            read_fd, write_fd = os.pipe()
+            sink, pipe = os.fdopen(write_fd, 'wb'), os.fdopen(read_fd, 'rb')
+            file = gzip.GzipFile(fileobj=pipe) if self.path.endswith('.gz') else pipe
+
+        self._thread = threading.Thread(target=self._feed, args=(sink,), daemon=True)
+        self._thread.start()
+
+        def on_eof():
+            self._join()
+            if process is not None and process.wait() != 0:
+                raise subprocess.CalledProcessError(process.returncode, pigz)
+
+        def on_close():
+            pipe.close()
+            if process is not None and process.poll() is None:
+                process.kill()
+                process.wait()
+            self._thread.join()
+
+        self._reader = io.BufferedReader(_PipeReader(file, on_eof, on_close), BLOCK_SIZE)
+        return self._reader
+
+    def _feed(self, sink: BinaryIO) -> None:
+        try:
+            self.result = self._transfer(sink=sink.write)
+        except BaseException as e:
+            self._error = e
+        finally:
+            try:
+                sink.close()
+            except OSError:
+                pass
+
+    def _join(self) -> None:
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def wait(self) -> DownloadResult:
+        """Finish the download if it is not being read, and get its result."""
+        if self._thread is not None:
+            self._join()
+        elif self.result is None:
+            self.result = self._transfer()
+        return self.result
+
+    def close(self) -> None:
+        """Stop the download, keeping the ``.part`` file to resume later."""
+        if self._reader is not None:
+            self._reader.close()
+        elif self._response is not None:
+            self._response.close()
+
+
+class _PipeReader(io.RawIOBase):
+    """Reads from a pipe and checks that its writer succeeded when the pipe is empty."""
+
+    def __init__(self, file: BinaryIO, on_eof: Callable[[], None], on_close: Callable[[], None]):
+        self._file = file
+        self._on_eof = on_eof
+        self._on_close = on_close
+        self._finished = False
+
+    def readable(self) -> bool:  # noqa: D102
+        return True
+
+    def readinto(self, buffer) -> int:  # noqa: D102
+        try:
+            n = self._file.readinto(buffer)
+        except EOFError:
+            # a truncated gzip stream, which is explained by an error of the writer if there was one
+            self._finish()
+            raise
+
+        if not n:
+            self._finish()
+        return n
+
+    def _finish(self) -> None:
+        if not self._finished:
+            self._finished = True
+            self._on_eof()
+
+    def close(self) -> None:  # noqa: D102
+        if not self.closed:
+            self._file.close()
+            self._on_close()
+        super().close()
+
+
+def download(url: str,
+             path: str,
+             force: bool = False,
+             check: bool = False,
+             md5: Optional[str] = None,
+             timeout: float = DEFAULT_TIMEOUT) -> DownloadResult:
+    """Download a file, resuming a previous attempt if possible.
+
+    :param url: The URL of the file
+    :param path: The path to write the file to
+    :param force: If true, download the whole file even if it was downloaded before
+    :param check: If true, download the file again if the remote file changed since it was downloaded
+    :param md5: The expected MD5 checksum of the file
+    :param timeout: The number of seconds to wait for the server
+    :raises DownloadError: If the download is interrupted or the file does not have the expected size or checksum
+    """
+    with Download(url, path, force=force, check=check, md5=md5, timeout=timeout) as rv:
+        return rv.wait()
+
+
+def start_downloads(sources: Optional[Mapping[str, Source]] = None,
+                    force: bool = False,
+                    check: bool = False,
+                    max_workers: Optional[int] = None) -> Dict[str, Future]:
+    """Start downloading files in a thread pool without waiting for them.
+
+    :param sources: A dictionary from names to the files to download. Defaults to :data:`SOURCES`.
+    :param force: If true, download the whole files even if they were downloaded before
+    :param check: If true, download the files again that changed since they were downloaded
+    :param max_workers: The number of files to download at once. Defaults to all of them.
+    :return: A dictionary from names to futures of :class:`DownloadResult`
+    """
+    if sources is None:
+        sources = SOURCES
+
+    if not sources:
+        return {}
+
+    executor = ThreadPoolExecutor(max_workers=max_workers or len(sources))
+    rv = {
+        name: executor.submit(download, source.url, source.path, force=force, check=check)
+        for name, source in sources.items()
+    }
+    executor.shutdown(wait=False)
+    return rv
+
+
+def download_sources(sources: Optional[Mapping[str, Source]] = None,
+                     force: bool = False,
+                     check: bool = False,
+                     max_workers: Optional[int] = None) -> Dict[str, DownloadResult]:
+    """Download files at once in a thread pool.
+
+    :param sources: A dictionary from names to the files to download. Defaults to :data:`SOURCES`.
+    :param force: If true, download the whole files even if they were downloaded before
+    :param check: If true, download the files again that changed since they were downloaded
+    :param max_workers: The number of files to download at once. Defaults to all of them.
+    :return: A dictionary from names to the results of the downloads
+    :raises DownloadError: If any download fails, after all of them are done
+    """
+    futures = start_downloads(sources, force=force, check=check, max_workers=max_workers)
+    return {
+        name: future.result()
+        for name, future in futures.items()
+    }
+
+
+def get_pigz() -> Optional[str]:
+    """Get the path of the ``pigz`` executable, if it is installed."""
+    return shutil.which('pigz')
+
+
+def open_decompressed(path: str) -> BinaryIO:
+    """Open a local file for reading, decompressing it if it ends with ``.gz``.
+
+    The file is decompressed in a separate ``pigz`` process if it is installed, so decompressing runs in parallel
+    with the reader. Otherwise, it is decompressed with :mod:`gzip`.
+    """
+    if not path.endswith('.gz'):
+        return open(path, 'rb')
+
+    pigz = get_pigz()
+    if pigz is None:
+        return gzip.open(path, 'rb')
+
+    process = subprocess.Popen([pigz, '-dc', path], stdout=subprocess.PIPE)
+
+    def on_eof():
+        if process.wait() != 0:
+            raise subprocess.CalledProcessError(process.returncode, pigz)
+
+    def on_close():
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+    return io.BufferedReader(_PipeReader(process.stdout, on_eof, on_close), BLOCK_SIZE)
+
+
+def get_md5(path: str) -> str:
+    """Get the MD5 checksum of a file, without reading it if it was downloaded with this module and is unchanged."""
+    md5 = _get_recorded_md5(path)
+    if md5 is not None:
+        return md5
+
+    md5 = hashlib.md5()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(BLOCK_SIZE), b''):
+            md5.update(block)
+    return md5.hexdigest()
+
+
+def get_source_stamp(url: str, checksum: bool = True) -> Dict[str, Any]:
+    """Get the modification time, size, and MD5 checksum of a source file.
+
+    :param url: The path of the file. If it is a URL that was read without downloading it, only the URL is recorded.
+    :param checksum: If false, leaves out the checksum
+    """
+    if not os.path.exists(url):
+        rv = dict(url=url, mtime=None, size=None)
+        if checksum:
+            rv['md5'] = None
+        return rv
+
+    stat = os.stat(url)
+    rv = dict(url=url, mtime=stat.st_mtime, size=stat.st_size)
+    if checksum:
+        rv['md5'] = get_md5(url)
+    return rv
+
+
+def _get_recorded_md5(path: str) -> Optional[str]:
+    """Get the MD5 checksum recorded when the file was downloaded, if it has not changed since."""
+    sidecar = _read_json(_get_sidecar_path(path))
+    stat = os.stat(path)
+    if sidecar.get('size') == stat.st_size and sidecar.get('mtime') == stat.st_mtime:
+        return sidecar.get('md5')
+
+
+def _get_sidecar_path(path: str) -> str:
+    return f'{path}.json'
+
+
+def _read_json(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+
+    with open(path) as file:
+        return json.load(file)
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    with open(path, 'w') as file:
+        json.dump(data, file)
+
+
+def _get_conditional_headers(sidecar: Dict[str, Any]) -> Dict[str, str]:
+    rv = {}
+    if sidecar.get('etag'):
+        rv['If-None-Match'] = sidecar['etag']
+    if sidecar.get('last_modified'):
+        rv['If-Modified-Since'] = sidecar['last_modified']
+    return rv
+
+
+def _get_if_range(validators: Dict[str, Any]) -> Optional[str]:
+    """Get the validator that makes a range request return the whole file if it has changed."""
+    etag = validators.get('etag')
+    if etag and not etag.startswith('W/'):  # weak entity tags can not be used for ranges
+        return etag
+    return validators.get('last_modified')
+
+
+def _parse_content_range(value: str) -> Tuple[int, Optional[int]]:
+    """Get the first byte and the total size from a header like ``bytes 100-199/200``."""
+    byte_range, _, total = value.split(' ', 1)[1].partition('/')
+    return int(byte_range.split('-')[0]), _get_int(total)
+
+
+def _get_int(value: Optional[str]) -> Optional[int]:
+    if value is None or not value.isdigit():
+        return
+    return int(value)
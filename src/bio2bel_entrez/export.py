@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""Streaming export of the genes.
+
+The genes are read with :meth:`bio2bel_entrez.Manager.iter_genes_table` and written one page at a time, so exporting
+takes time linear in the number of genes and constant memory. Run from the command line with
+``python -m bio2bel_entrez gene export``.
+"""
+
+import logging
+from typing import BinaryIO, Iterable, Optional
+
+from .manager import EXPORT_CHUNKSIZE, Manager
+from .models import GeneRecord
+
+__all__ = [
+    'EXPORT_FORMATS',
+    'export_genes',
+]
+
+log = logging.getLogger(__name__)
+
+#: The formats genes can be exported to. Parquet needs :mod:`pyarrow`.
+EXPORT_FORMATS = ('tsv', 'jsonl', 'parquet')
+
+
+def export_genes(manager: Manager,
+                 file: BinaryIO,
+                 fmt: str = 'tsv',
+                 chunksize: int = EXPORT_CHUNKSIZE,
+                 tax_id_filter: Optional[Iterable[str]] = None) -> int:
+    """Write all genes to a file.
+
+    :param manager: A manager
+    :param file: A file opened for writing bytes, like ``sys.stdout.buffer``
+    :param fmt: One of :data:`EXPORT_FORMATS`
+    :param chunksize: The number of genes to read and write at a time
+    :param tax_id_filter: If given, only export genes from these species
+    :return: The number of genes written
+    :raises ValueError: If the format is not one of :data:`EXPORT_FORMATS`
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f'invalid format: {fmt}. Use one of {EXPORT_FORMATS}')
+
+    tables = manager.iter_genes_table(chunksize=chunksize, tax_id_filter=tax_id_filter)
+    if fmt == 'parquet':
+        return _write_parquet(file, tables)
+
+    count = 0
+    for df in tables:
+        if fmt == 'tsv':
+            text = df.to_csv(sep='\t', index=False, header=(count == 0))
+        else:
+            text = df.to_json(orient='records', lines=True).rstrip('\n') + '\n'
+        file.write(text.encode('utf-8'))
+        count += len(df.index)
+
+    if fmt == 'tsv' and count == 0:
+        file.write(('\t'.join(GeneRecord._fields) + '\n').encode('utf-8'))
+
+    log.info('exported %d genes', count)
+    return count
+
+
+def _write_parquet(file: BinaryIO, tables) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(field, pa.string()) for field in GeneRecord._fields])
+    count = 0
+    with pq.ParquetWriter(file, schema) as writer:
+        for df in tables:
+            writer.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+            count += len(df.index)
+
+    log.info('exported %d genes', count)
+    return count
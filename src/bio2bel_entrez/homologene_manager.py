@@ -64,7 +64,7 @@ class Manager(AbstractManager, BELNamespaceManagerMixin, BELManagerMixin):
     def to_bel(self) -> BELGraph:
         """Convert HomoloGene to BEL."""
         graph = BELGraph()
-        for homologene, gene in self._get_query(Homologene).join(Gene):
+        for homologene, gene in self.session.query(Homologene, Gene).join(Gene, Gene.homologene_id == Homologene.id):
             graph.add_is_a(gene.as_bel(), homologene.as_bel())
         return graph
 
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+"""An in-memory interval index of the locations of genes on genomic accessions.
+
+The locations on each genomic accession are kept in :mod:`numpy` arrays sorted by start and by end position. The array
+sorted by start is also an implicit, augmented binary search tree: the node at index ``i`` on level ``k`` is the one
+whose ``k`` lowest bits are set, its children are at ``i - 2 ** (k - 1)`` and ``i + 2 ** (k - 1)``, and each node
+stores the largest end position in its subtree. Genes overlapping a region are found by descending the tree, skipping
+the subtrees that end before the region starts and the right subtrees of genes that start after it ends, so the time
+is logarithmic in the number of genes plus the number of overlapping genes, however long the longest gene is.
+
+The nearest gene to a position is either a gene overlapping it, the first gene starting after it, or the last gene
+ending before it, which are each found in logarithmic time.
+"""
+
+import logging
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+__all__ = [
+    'Location',
+    'LocationIndex',
+]
+
+log = logging.getLogger(__name__)
+
+#: The end position of the padding nodes of the interval trees, which is before any region
+_PADDING_END = np.iinfo(np.int64).min
+
+
+class Location(NamedTuple):
+    """The location of a gene on a genomic accession. Positions are 0-based and inclusive."""
+
+    entrez_id: str
+    accession: str
+    start_position: int
+    end_position: int
+    orientation: Optional[str]
+
+    def distance(self, position: int) -> int:
+        """Get the number of bases between the gene and the position, or 0 if the gene overlaps it."""
+        return max(0, self.start_position - position, position - self.end_position)
+
+
+class _AccessionIndex(NamedTuple):
+    """The locations of genes on one accession."""
+
+    #: The start positions, sorted
+    starts: np.ndarray
+    #: The end positions, in the order of the starts
+    ends: np.ndarray
+    #: The Entrez Gene identifiers, in the order of the starts
+    entrez_ids: np.ndarray
+    #: The orientations, in the order of the starts
+    orientations: np.ndarray
+    #: The indexes of the locations sorted by their ends
+    end_order: np.ndarray
+    #: The end positions, sorted
+    sorted_ends: np.ndarray
+    #: The largest end position in the subtree of each node of the interval tree over the starts, padded to a
+    #: complete tree
+    max_ends: np.ndarray
+    #: The level of the root of the interval tree
+    height: int
+
+
+class LocationIndex:
+    """Finds the genes overlapping regions and the genes nearest to positions in logarithmic time."""
+
+    def __init__(self, df: pd.DataFrame):
+        """Build the index.
+
+        :param df: A data frame with the columns of :class:`Location`, like from the gene_location table
+        """
+        self._accessions: Dict[str, _AccessionIndex] = {}
+
+        df = df.sort_values(['accession', 'start_position', 'end_position', 'entrez_id'])
+        for accession, sub_df in df.groupby('accession', sort=False):
+            starts = sub_df['start_position'].values.astype(np.int64)
+            ends = sub_df['end_position'].values.astype(np.int64)
+            end_order = np.argsort(ends, kind='stable')
+            max_ends, height = _build_max_ends(ends)
+            self._accessions[accession] = _AccessionIndex(
+                starts=starts,
+                ends=ends,
+                entrez_ids=sub_df['entrez_id'].values,
+                orientations=sub_df['orientation'].values,
+                end_order=end_order,
+                sorted_ends=ends[end_order],
+                max_ends=max_ends,
+                height=height,
+            )
+
+        self._size = len(df.index)
+        log.info('indexed %d locations on %d accessions', self._size, len(self._accessions))
+
+    @classmethod
+    def from_locations(cls, locations: Iterable[Location]) -> 'LocationIndex':
+        """Build the index from locations."""
+        return cls(pd.DataFrame(list(locations), columns=Location._fields))
+
+    def __len__(self) -> int:  # noqa: D105
+        return self._size
+
+    @property
+    def accessions(self) -> List[str]:
+        """Get the indexed genomic accessions."""
+        return sorted(self._accessions)
+
+    def _get_location(self, index: _AccessionIndex, accession: str, i: int) -> Location:
+        return Location(
+            entrez_id=index.entrez_ids[i],
+            accession=accession,
+            start_position=int(index.starts[i]),
+            end_position=int(index.ends[i]),
+            orientation=index.orientations[i],
+        )
+
+    def get_overlapping(self, accession: str, start: int, end: int) -> List[Location]:
+        """Get the genes overlapping a region, sorted by start position.
+
+        :param accession: A genomic accession and version, like ``NC_000022.11``
+        :param start: The 0-based start position of the region
+        :param end: The 0-based, inclusive end position of the region
+        """
+        index = self._accessions.get(accession)
+        if index is None:
+            return []
+
+        return [
+            self._get_location(index, accession, i)
+            for i in sorted(_iter_overlapping(index, start, end))
+        ]
+
+    def get_nearest(self, accession: str, position: int) -> Optional[Location]:
+        """Get the gene nearest to a position.
+
+        A gene overlapping the position is nearest. If several genes overlap it, the one starting first is returned.
+        If the genes before and after the position are equally far, the one before is returned.
+
+        :param accession: A genomic accession and version, like ``NC_000022.11``
+        :param position: A 0-based position
+        """
+        index = self._accessions.get(accession)
+        if index is None:
+            return
+
+        overlapping = self.get_overlapping(accession, position, position)
+        if overlapping:
+            return overlapping[0]
+
+        candidates = []
+
+        before = np.searchsorted(index.sorted_ends, position, side='left') - 1
+        if 0 <= before:
+            candidates.append(self._get_location(index, accession, index.end_order[before]))
+
+        after = np.searchsorted(index.starts, position, side='right')
+        if after < len(index.starts):
+            candidates.append(self._get_location(index, accession, after))
+
+        if candidates:
+            return min(candidates, key=lambda location: location.distance(position))
+
+
+def _build_max_ends(ends: np.ndarray) -> Tuple[np.ndarray, int]:
+    """Get the largest end position in the subtree of each node of the implicit interval tree over sorted starts.
+
+    :param ends: The end positions, in the order of the sorted starts
+    :return: The largest end positions, padded to a complete tree of ``2 ** (height + 1) - 1`` nodes, and the height
+    """
+    height = len(ends).bit_length() - 1
+
+    max_ends = np.full(2 ** (height + 1) - 1, _PADDING_END, dtype=np.int64)
+    max_ends[:len(ends)] = ends
+    for level in range(1, height + 1):
+        nodes = np.arange(2 ** level - 1, len(max_ends), 2 ** (level + 1))
+        offset = 2 ** (level - 1)
+        max_ends[nodes] = np.maximum(max_ends[nodes], np.maximum(max_ends[nodes - offset], max_ends[nodes + offset]))
+    return max_ends, height
+
+
+def _iter_overlapping(index: _AccessionIndex, start: int, end: int) -> Iterator[int]:
+    """Iterate over the positions in the sorted starts of the genes overlapping a region."""
+    size = len(index.starts)
+    stack = [(2 ** index.height - 1, index.height)]
+    while stack:
+        node, level = stack.pop()
+        if index.max_ends[node] < start:
+            continue  # everything in this subtree ends before the region
+
+        offset = 2 ** (level - 1) if level else 0
+        if level:
+            stack.append((node - offset, level - 1))
+
+        if size <= node or end < index.starts[node]:
+            continue  # this gene and everything after it starts after the region
+
+        if start <= index.ends[node]:
+            yield node
+        if level:
+            stack.append((node + offset, level - 1))
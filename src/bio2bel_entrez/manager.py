@@ -2,27 +2,40 @@
 
 """Manager for Bio2BEL Entrez."""
 
+import json
 import logging
 import sys
 import time
-from typing import Dict, Iterable, List, Optional, Tuple
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Type, TypeVar, Union
 
 import click
+import pandas as pd
 from bio2bel import AbstractManager
 from bio2bel.manager.flask_manager import FlaskMixin
 from bio2bel.manager.namespace_manager import BELNamespaceManagerMixin
 from networkx import relabel_nodes
 from pybel import BELGraph
-from pybel.constants import FUNCTION, NAMESPACE
-from pybel.dsl import BaseEntity
+from pybel.constants import FUNCTION
+from pybel.dsl import BaseAbundance, BaseEntity
 from pybel.manager.models import Namespace, NamespaceEntry
-from sqlalchemy import and_
+from sqlalchemy import and_, select
+from sqlalchemy.orm import contains_eager, joinedload
 from tqdm import tqdm
 
-from .constants import DEFAULT_TAX_IDS, MODULE_NAME, VALID_ENTREZ_NAMESPACES, VALID_MGI_NAMESPACES
+from . import bulk, parallel, swap
+from .cache import CacheInfo, DEFAULT_CACHE_SIZE, LRUCache
+from .constants import (
+    CONSORTIUM_SPECIES_MAPPING, DEFAULT_TAX_IDS, MODULE_NAME, SYMBOL_NAMESPACE_SPECIES_MAPPING, VALID_ENTREZ_NAMESPACES,
+)
+from .data_version import get_tax_ids, make_data_version, read_homologene_release
+from .download import SOURCES, download_sources, get_source_stamp, start_downloads
 from .homologene_manager import Manager as HomologeneManager
-from .models import Base, Gene, Homologene, Species, Xref
-from .parser import get_gene_info_df, get_homologene_df
+from .locations import Location, LocationIndex
+from .metrics import LoadMetrics
+from .models import Base, DataVersion, Gene, GeneLocation, GeneRecord, Homologene, Species, Xref
+from .parser import get_homologene_df, iter_gene_info_chunks, iter_gene_location_chunks
+from .profiling import QueryProfiler, profiled
 
 __all__ = [
     'Manager',
@@ -30,13 +43,23 @@ __all__ = [
 
 log = logging.getLogger(__name__)
 
+X = TypeVar('X')
+
+#: The number of values to put in each ``IN (...)`` clause, which keeps below SQLite's limit on bound parameters
+IN_CHUNKSIZE = 500
+
+#: The number of genes in each page of :meth:`Manager.iter_genes_table`
+EXPORT_CHUNKSIZE = 50_000
+
+_UNCHECKED = object()
+
 
 class Manager(AbstractManager, BELNamespaceManagerMixin, FlaskMixin):
     """Genes and orthologies."""
 
     module_name = MODULE_NAME
     _base = Base
-    flask_admin_models = [Gene, Homologene, Species, Xref]
+    flask_admin_models = [DataVersion, Gene, GeneLocation, Homologene, Species, Xref]
 
     namespace_model = Gene
     identifiers_recommended = 'NCBI Gene'
@@ -45,13 +68,72 @@ class Manager(AbstractManager, BELNamespaceManagerMixin, FlaskMixin):
     identifiers_namespace = 'ncbigene'
     identifiers_url = 'http://identifiers.org/ncbigene/'
 
-    def __init__(self, *args, **kwargs):  # noqa: D107
+    def __init__(self, *args, cache_size: Optional[int] = DEFAULT_CACHE_SIZE, profile: bool = False, **kwargs):
+        """Initialize the manager.
+
+        :param cache_size: The maximum number of primary keys kept by each of the caches used by the
+         ``get_or_create_*`` methods. If none, the caches are unbounded.
+        :param profile: If true, start profiling the read methods. See :meth:`start_profiling`.
+        """
         super().__init__(*args, **kwargs)
 
-        self.species_cache = {}
-        self.gene_cache = {}
-        self.homologene_cache = {}
-        self.gene_homologene = {}
+        self.species_cache: LRUCache[str, int] = LRUCache(cache_size)
+        self.gene_cache: LRUCache[str, int] = LRUCache(cache_size)
+        self.homologene_cache: LRUCache[str, int] = LRUCache(cache_size)
+        self.xref_index = {}
+        self.location_index: Optional[LocationIndex] = None
+        self.load_metrics = LoadMetrics()
+        self.profiler: Optional[QueryProfiler] = None
+        self._data_version = _UNCHECKED
+        if profile:
+            self.start_profiling()
+
+    def start_profiling(self) -> QueryProfiler:
+        """Count the SQL statements, database time, hydrated rows, and wall time of each call to the read methods.
+
+        :return: The profiler, whose :meth:`QueryProfiler.report` summarizes the statistics per method
+        """
+        if self.profiler is None:
+            self.profiler = QueryProfiler(self.engine)
+        self.profiler.start()
+        return self.profiler
+
+    def stop_profiling(self) -> Optional[QueryProfiler]:
+        """Stop profiling the read methods.
+
+        :return: The profiler with the statistics collected so far, if profiling was started
+        """
+        profiler, self.profiler = self.profiler, None
+        if profiler is not None:
+            profiler.stop()
+        return profiler
+
+    def cache_info(self) -> Dict[str, CacheInfo]:
+        """Get the hit, miss, and eviction counts of the caches used by the ``get_or_create_*`` methods."""
+        return dict(
+            species=self.species_cache.info(),
+            genes=self.gene_cache.info(),
+            homologenes=self.homologene_cache.info(),
+        )
+
+    def clear_caches(self) -> None:
+        """Empty the caches, e.g., after the primary keys changed because the tables were reloaded."""
+        self.species_cache.clear()
+        self.gene_cache.clear()
+        self.homologene_cache.clear()
+
+    def get_flask_admin_app(self, url: Optional[str] = None, secret_key: Optional[str] = None):
+        """Create a Flask application with the admin interface and the JSON lookup API under ``/api``.
+
+        :param url: Optional mount point of the admin application. Defaults to ``'/'``.
+        :param secret_key: The secret key of the application
+        :rtype: flask.Flask
+        """
+        from .api import register_api
+
+        app = super().get_flask_admin_app(url=url, secret_key=secret_key)
+        register_api(app, self)
+        return app
 
     def is_populated(self) -> bool:
         """Check if the database is already populated."""
@@ -74,42 +156,249 @@ class Manager(AbstractManager, BELNamespaceManagerMixin, FlaskMixin):
 
         :param taxonomy_id: NCBI taxonomy identifier
         """
-        species = self.species_cache.get(taxonomy_id)
+        return self._get_or_create(self.species_cache, Species, Species.taxonomy_id, taxonomy_id, **kwargs)
 
-        if species is not None:
-            self.session.add(species)
-            return species
+    def _get_or_create(self, cache: LRUCache, model: Type[Base], column, key: str, **kwargs) -> Base:
+        """Get or create a model, caching its primary key.
 
-        species = self.session.query(Species).filter(Species.taxonomy_id == taxonomy_id).one_or_none()
+        A cached primary key is looked up in the session's identity map before querying by primary key, so
+        instances are never shared across sessions. A stale primary key, e.g., of a deleted row, is dropped.
+        """
+        primary_key = cache.get(key)
+        if primary_key is not None:
+            instance = self.session.query(model).get(primary_key)
+            if instance is not None:
+                return instance
+            cache.pop(key)
 
-        if species is None:
-            species = self.species_cache[taxonomy_id] = Species(taxonomy_id=taxonomy_id, **kwargs)
-            self.session.add(species)
+        instance = self.session.query(model).filter(column == key).one_or_none()
 
-        return species
+        if instance is None:
+            instance = model(**{column.key: key}, **kwargs)
+            self.session.add(instance)
+            self.session.flush()
 
-    def get_gene_by_entrez_id(self, entrez_id: str) -> Optional[Gene]:
+        cache[key] = instance.id
+        return instance
+
+    @profiled
+    def get_gene_by_entrez_id(self, entrez_id: str, records: bool = False) -> Union[None, Gene, GeneRecord]:
         """Get a gene with the given Entrez Gene identifier, if it exists.
 
         :param entrez_id: Entrez Gene identifier
+        :param records: If true, return a :class:`GeneRecord` snapshot from a column-only query instead of a model
         """
+        if records:
+            return next(iter(self._get_gene_records(Gene.entrez_id == entrez_id)), None)
+
         return self.session.query(Gene).filter(Gene.entrez_id == entrez_id).one_or_none()
 
+    @profiled
+    def get_genes_by_entrez_ids(self,
+                                entrez_ids: Iterable[str],
+                                records: bool = False) -> Dict[str, Union[Gene, GeneRecord]]:
+        """Get a dictionary from Entrez Gene identifiers to genes, for the identifiers that exist.
+
+        The genes are loaded with their species and HomoloGene groups.
+
+        :param entrez_ids: Entrez Gene identifiers
+        :param records: If true, return :class:`GeneRecord` snapshots from a column-only query instead of models
+        """
+        rv = {}
+        for chunk in _chunked(sorted(set(entrez_ids)), IN_CHUNKSIZE):
+            if records:
+                genes = self._get_gene_records(Gene.entrez_id.in_(chunk))
+            else:
+                genes = self.session.query(Gene).filter(Gene.entrez_id.in_(chunk)).options(
+                    joinedload(Gene.species),
+                    joinedload(Gene.homologene),
+                )
+            rv.update((gene.entrez_id, gene) for gene in genes)
+        return rv
+
+    def _get_gene_records(self, *criteria, limit: Optional[int] = None,
+                          offset: Optional[int] = None) -> List[GeneRecord]:
+        """Get the genes matching the criteria as records, without building ORM models."""
+        query = _select_gene_records()
+        if criteria:
+            query = query.where(and_(*criteria))
+        if limit:
+            query = query.limit(limit)
+        if offset:
+            query = query.offset(offset)
+        return [GeneRecord._make(row) for row in self.session.execute(query)]
+
     def get_genes_by_name(self, name: str) -> List[Gene]:
         """Get a list of genes with the given name (case insensitive).
 
         :param name: A gene name
         """
-        return self.session.query(Gene).filter(Gene.name.lower() == name.lower()).all()
+        return self.session.query(Gene).filter(Gene.name_lower == name.lower()).all()
+
+    def get_gene_by_symbol(self,
+                           taxonomy_id: str,
+                           symbol: str,
+                           records: bool = False) -> Union[None, Gene, GeneRecord]:
+        """Get a gene by its symbol (case insensitive) in the given species.
+
+        :param taxonomy_id: NCBI taxonomy identifier
+        :param symbol: Entrez Gene symbol
+        :param records: If true, return a :class:`GeneRecord` snapshot from a column-only query instead of a model
+        """
+        return self.get_genes_by_symbols(taxonomy_id, [symbol], records=records).get(symbol)
+
+    @profiled
+    def get_genes_by_symbols(self,
+                             taxonomy_id: str,
+                             symbols: Iterable[str],
+                             records: bool = False) -> Dict[str, Union[Gene, GeneRecord]]:
+        """Get a dictionary from symbols to genes in the given species, for the symbols that exist.
+
+        Symbols are matched case insensitively on :data:`Gene.name_lower`. If several genes match, the one whose
+        symbol matches exactly is preferred, then the one with the lowest Entrez Gene identifier.
+
+        :param taxonomy_id: NCBI taxonomy identifier
+        :param symbols: Entrez Gene symbols
+        :param records: If true, return :class:`GeneRecord` snapshots from a column-only query instead of models
+        """
+        species_id = self.session.query(Species.id).filter(Species.taxonomy_id == taxonomy_id).scalar()
+        if species_id is None:
+            return {}
+
+        symbols = set(symbols)
+        genes = defaultdict(list)
+        for chunk in _chunked(sorted({symbol.lower() for symbol in symbols}), IN_CHUNKSIZE):
+            criteria = Gene.species_id == species_id, Gene.name_lower.in_(chunk)
+            if records:
+                query = self._get_gene_records(*criteria)
+            else:
+                query = self.session.query(Gene).filter(*criteria).options(joinedload(Gene.homologene))
+            for gene in query:
+                genes[gene.name.lower()].append(gene)
+
+        rv = {}
+        for symbol in symbols:
+            candidates = genes.get(symbol.lower())
+            if not candidates:
+                continue
+
+            exact_candidates = [gene for gene in candidates if gene.name == symbol]
+            rv[symbol] = self._return_lowest(symbol, exact_candidates or candidates)
+
+        return rv
+
+    def get_genes_by_xref(self, database: str, value: str, records: bool = False) -> List[Union[Gene, GeneRecord]]:
+        """Get the genes with the given database cross-reference.
+
+        :param database: The database of the cross-reference as it appears in gene_info, like ``Ensembl``,
+         ``HGNC``, or ``MIM``
+        :param value: The identifier in the database as it appears in gene_info, like ``ENSG00000100030``.
+         Note that HGNC identifiers keep their prefix, like ``HGNC:6871``.
+        :param records: If true, return :class:`GeneRecord` snapshots from a column-only query instead of models
+        """
+        if records:
+            gene_ids = select([Xref.gene_id]).where(and_(Xref.database == database, Xref.value == value))
+            return self._get_gene_records(Gene.id.in_(gene_ids))
+
+        return self.session.query(Gene).join(Xref).filter(Xref.database == database, Xref.value == value).all()
+
+    def map_xrefs(self, database: str, values: Iterable[str]) -> Dict[str, List[str]]:
+        """Map many identifiers from the given database to Entrez Gene identifiers.
+
+        If :meth:`build_xref_index` has been called for the database, the identifiers are mapped in memory. Otherwise,
+        they are mapped with a few ``IN`` queries on the database/value index.
+
+        :param database: The database of the cross-references, like ``Ensembl``
+        :param values: Identifiers in the database
+        :return: A dictionary from the identifiers that could be mapped to their Entrez Gene identifiers
+        """
+        xref_index = self.xref_index.get(database)
+        if xref_index is not None:
+            return {
+                value: list(xref_index[value])
+                for value in values
+                if value in xref_index
+            }
+
+        rv = defaultdict(list)
+        for chunk in _chunked(sorted(set(values)), IN_CHUNKSIZE):
+            query = self.session.query(Xref.value, Gene.entrez_id).join(Gene).filter(
+                Xref.database == database,
+                Xref.value.in_(chunk),
+            )
+            for value, entrez_id in query:
+                rv[value].append(entrez_id)
+
+        return dict(rv)
+
+    def build_location_index(self, tax_id_filter: Optional[Iterable[str]] = None) -> LocationIndex:
+        """Build the in-memory interval index used by :meth:`get_genes_overlapping` and :meth:`get_nearest_gene`.
+
+        :param tax_id_filter: If given, only index the locations of genes from these species
+        """
+        query = select([
+            GeneLocation.entrez_id,
+            GeneLocation.accession,
+            GeneLocation.start_position,
+            GeneLocation.end_position,
+            GeneLocation.orientation,
+        ])
+        if tax_id_filter is not None:
+            query = query.where(GeneLocation.taxonomy_id.in_(list(tax_id_filter)))
+
+        df = pd.DataFrame.from_records(self.session.execute(query).fetchall(), columns=Location._fields)
+        self.location_index = LocationIndex(df)
+        return self.location_index
+
+    def _get_location_index(self) -> LocationIndex:
+        if self.location_index is None:
+            return self.build_location_index()
+        return self.location_index
+
+    def get_genes_overlapping(self, accession: str, start: int, end: int) -> List[Location]:
+        """Get the locations of the genes overlapping a region, sorted by start position.
+
+        Builds the interval index with :meth:`build_location_index` on first use.
+
+        :param accession: A genomic accession and version, like ``NC_000022.11``
+        :param start: The 0-based start position of the region
+        :param end: The 0-based, inclusive end position of the region
+        """
+        return self._get_location_index().get_overlapping(accession, start, end)
+
+    def get_nearest_gene(self, accession: str, position: int) -> Optional[Location]:
+        """Get the location of the gene nearest to a position, or one overlapping it.
+
+        Builds the interval index with :meth:`build_location_index` on first use.
+
+        :param accession: A genomic accession and version, like ``NC_000022.11``
+        :param position: A 0-based position
+        """
+        return self._get_location_index().get_nearest(accession, position)
+
+    def build_xref_index(self, databases: Optional[Iterable[str]] = None) -> None:
+        """Build an in-memory index from cross-references to Entrez Gene identifiers used by :meth:`map_xrefs`.
+
+        :param databases: The databases to index. If none, indexes all databases.
+        """
+        query = self.session.query(Xref.database, Xref.value, Gene.entrez_id).join(Gene)
+        if databases is not None:
+            query = query.filter(Xref.database.in_(list(databases)))
+
+        xref_index = defaultdict(lambda: defaultdict(list))
+        for database, value, entrez_id in query.yield_per(IN_CHUNKSIZE * 100):
+            xref_index[database][value].append(entrez_id)
+
+        for database, database_index in xref_index.items():
+            log.info('indexed %d %s cross-references', len(database_index), database)
+            self.xref_index[database] = dict(database_index)
 
     def get_gene_by_rgd_name(self, name: str) -> Optional[Gene]:
         """Get a gene by its RGD name.
 
         :param name: RGD gene symbol
         """
-        rgd_name_filter = and_(Species.taxonomy_id == '10116', Gene.name == name)
-        rv = self.session.query(Gene).join(Species).filter(rgd_name_filter).all()
-        return self._return_lowest(name, rv)
+        return self.get_gene_by_symbol(CONSORTIUM_SPECIES_MAPPING['RGD'], name)
 
     @staticmethod
     def _return_lowest(name, rv):
@@ -131,92 +420,79 @@ class Manager(AbstractManager, BELNamespaceManagerMixin, FlaskMixin):
 
         :param name: MGI gene symbol
         """
-        mgi_name_filter = and_(Species.taxonomy_id == '10090', Gene.name == name)
-        rv = self.session.query(Gene).join(Species).filter(mgi_name_filter).all()
-        return self._return_lowest(name, rv)
+        return self.get_gene_by_symbol(CONSORTIUM_SPECIES_MAPPING['MGI'], name)
 
     def get_gene_by_hgnc_name(self, name: str) -> Optional[Gene]:
         """Get a gene by its HGNC gene symbol."""
-        hgnc_name_filter = and_(Species.taxonomy_id == '9606', Gene.name == name)
-        rv = self.session.query(Gene).join(Species).filter(hgnc_name_filter).all()
-        return self._return_lowest(name, rv)
+        return self.get_gene_by_symbol(CONSORTIUM_SPECIES_MAPPING['HGNC'], name)
 
     def get_or_create_gene(self, entrez_id: str, **kwargs) -> Gene:
         """Get or create a Gene model.
 
         :param entrez_id: Entrez Gene identifier
         """
-        gene = self.gene_cache.get(entrez_id)
-
-        if gene is not None:
-            self.session.add(gene)
-            return gene
-
-        gene = self.get_gene_by_entrez_id(entrez_id)
-
-        if gene is None:
-            gene = self.gene_cache[entrez_id] = Gene(entrez_id=entrez_id, **kwargs)
-            self.session.add(gene)
-
-        return gene
+        return self._get_or_create(self.gene_cache, Gene, Gene.entrez_id, entrez_id, **kwargs)
 
     def get_or_create_homologene(self, homologene_id: str, **kwargs) -> Homologene:
         """Get or create a HomoloGene model.
 
         :param homologene_id: HomoloGene Gene identifier
         """
-        homologene = self.homologene_cache.get(homologene_id)
-
-        if homologene is not None:
-            self.session.add(homologene)
-            return homologene
-
-        homologene = self.session.query(Homologene).filter(Homologene.homologene_id == homologene_id).one_or_none()
-
-        if homologene is None:
-            homologene = self.homologene_cache[homologene_id] = Homologene(homologene_id=homologene_id, **kwargs)
-            self.session.add(homologene)
-
-        return homologene
-
-    def populate_homologene(self, url=None, cache=True, force_download=False, tax_id_filter=None) -> None:
-        """Populate the database.
-
-        :param Optional[str] url: Homologene data url
-        :param bool cache: If true, the data is downloaded to the file system, else it is loaded from the internet
-        :param bool force_download: If true, overwrites a previously cached file
-        :param Optional[iter[str]] tax_id_filter: Species to keep
+        return self._get_or_create(self.homologene_cache, Homologene, Homologene.homologene_id, homologene_id,
+                                   **kwargs)
+
+    def populate_homologene(self,
+                            url: Optional[str] = None,
+                            cache: bool = True,
+                            force_download: bool = False,
+                            tax_id_filter: Optional[Iterable[str]] = None,
+                            interval: Optional[int] = None,
+                            tables: bulk.Tables = bulk.live_tables) -> None:
+        """Populate the HomoloGene groups and set the groups of the genes that are already loaded.
+
+        :param url: Homologene data url
+        :param cache: If true, the data is downloaded to the file system, else it is loaded from the internet
+        :param force_download: If true, overwrites a previously cached file
+        :param tax_id_filter: Species to keep
+        :param interval: The number of records to send to the database at a time
+        :param tables: The tables to insert into
         """
-        df = get_homologene_df(url=url, cache=cache, force_download=force_download)
+        df = self._get_homologene_df(url=url, cache=cache, force_download=force_download,
+                                     tax_id_filter=tax_id_filter)
+
+        log.info('inserting HomoloGene groups')
+        with self.load_metrics.phase('homologene_insert', rows=len(df.index)):
+            n_groups, n_genes = bulk.load_homologene_df(self.session.connection(), df, chunksize=interval,
+                                                        tables=tables)
+        with self.load_metrics.phase('commit'):
+            self.session.commit()
+        log.info('inserted %d HomoloGene groups and set the groups of %d genes', n_groups, n_genes)
+
+    def _get_homologene_df(self,
+                           url: Optional[str] = None,
+                           cache: bool = True,
+                           force_download: bool = False,
+                           tax_id_filter: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        with self.load_metrics.phase('homologene_parse'):
+            df = get_homologene_df(url=url, cache=cache, force_download=force_download)
+        self.load_metrics.add_rows('homologene_parse', len(df.index))
 
         if tax_id_filter is not None:
             tax_id_filter = set(tax_id_filter)
             log.info('filtering HomoloGene to %s', tax_id_filter)
-            df = df[df['tax_id'].isin(tax_id_filter)]
-
-        log.info('preparing HomoloGene models')
-
-        grouped_df = df.groupby('homologene_id')
-        for homologene_id, sub_df in tqdm(grouped_df, desc='HomoloGene', total=len(grouped_df)):
-
-            homologene = Homologene(homologene_id=homologene_id)
-            self.session.add(homologene)
-
-            for _, (homologene_id, taxonomy_id, entrez_id, name, _, _) in sub_df.iterrows():
-                entrez_id = str(int(entrez_id))
-                self.gene_homologene[entrez_id] = homologene
-
-        t = time.time()
-        log.info('committing HomoloGene models')
-        self.session.commit()
-        log.info('committed HomoloGene models in %.2f seconds', time.time() - t)
+            with self.load_metrics.phase('filter'):
+                df = df[df['tax_id'].isin(tax_id_filter)]
+        return df
 
     def populate_gene_info(self,
                            url: Optional[str] = None,
                            cache: bool = True,
                            force_download: bool = False,
                            interval: Optional[int] = None,
-                           tax_id_filter: Iterable[str] = None):
+                           tax_id_filter: Iterable[str] = None,
+                           use_bulk: bool = True,
+                           chunksize: Optional[int] = None,
+                           workers: Optional[int] = None):
         """Populate the database.
 
         :param url: A custom url to download
@@ -224,127 +500,529 @@ class Manager(AbstractManager, BELNamespaceManagerMixin, FlaskMixin):
         :param cache: If true, the data is downloaded to the file system, else it is loaded from the internet
         :param force_download: If true, overwrites a previously cached file
         :param tax_id_filter: Species to keep
+        :param use_bulk: If true, use the bulk loader in :mod:`bio2bel_entrez.bulk`. Otherwise, build ORM models.
+        :param chunksize: The number of rows of gene_info to read at a time
+        :param workers: The number of worker processes that prepare the rows for the bulk loader. If more than one,
+         uses :mod:`bio2bel_entrez.parallel`.
         """
-        df = get_gene_info_df(url=url, cache=cache, force_download=force_download)
-
         if tax_id_filter is not None:
             tax_id_filter = set(tax_id_filter)
             log.info('filtering Entrez Gene to %s', tax_id_filter)
-            df = df[df['#tax_id'].isin(tax_id_filter)]
 
-        log.info('preparing Entrez Gene models')
-        for taxonomy_id, sub_df in tqdm(df.groupby('#tax_id'), desc='Species'):
-            taxonomy_id = str(int(taxonomy_id))
-            species = self.get_or_create_species(taxonomy_id=taxonomy_id)
-
-            species_it = tqdm(sub_df.itertuples(), desc='Tax ID {}'.format(taxonomy_id), total=len(sub_df.index),
-                              leave=False)
-            for idx, _, entrez_id, name, xrefs, description, type_of_gene in species_it:
-                entrez_id = str(int(entrez_id))
-
-                if isinstance(name, float):
-                    log.debug('Missing name: %s %s', entrez_id, description)
-                    # These errors are due to placeholder entries for GeneRIFs and only occur once per species
-                    continue
+        if use_bulk:
+            prepared = _iter_prepared_gene_info(
+                url=url,
+                cache=cache,
+                force_download=force_download,
+                chunksize=chunksize,
+                tax_id_filter=tax_id_filter,
+                workers=workers,
+                metrics=self.load_metrics,
+            )
+            self._populate_gene_info_bulk(prepared, interval=interval)
+            return
 
-                gene = Gene(
-                    entrez_id=entrez_id,
-                    species=species,
-                    name=name,
-                    description=description,
-                    type_of_gene=type_of_gene,
-                    homologene=self.gene_homologene.get(entrez_id)
+        chunks = iter_gene_info_chunks(
+            url=url,
+            cache=cache,
+            force_download=force_download,
+            chunksize=chunksize,
+            tax_id_filter=tax_id_filter,
+            metrics=self.load_metrics,
+        )
+        self._populate_gene_info_orm(chunks, interval=interval)
+
+    def _populate_gene_info_bulk(self,
+                                 prepared: Iterable[parallel.PreparedSpecies],
+                                 interval: Optional[int] = None,
+                                 homologene_map: Optional[Mapping[str, int]] = None,
+                                 tables: bulk.Tables = bulk.live_tables) -> None:
+        """Populate the genes and cross-references with bulk inserts.
+
+        :param prepared: An iterable of taxonomy identifiers with their prepared gene and cross-reference rows
+        :param interval: The number of records to send to the database at a time
+        :param homologene_map: A dictionary from Entrez Gene identifiers to HomoloGene primary keys. If none, the
+         groups are left empty to be set by :meth:`populate_homologene`.
+        :param tables: The tables to insert into
+        """
+        log.info('inserting Entrez Gene rows')
+        metrics = self.load_metrics
+        prepared = metrics.iter_phase('prepare', prepared, count=lambda species: len(species[1].index))
+        for taxonomy_id, gene_df, xref_df in tqdm(prepared, desc='Entrez Gene species'):
+            t = time.time()
+            with metrics.phase('insert'):
+                connection = self.session.connection()
+                species_map = bulk.get_species_map(connection, [taxonomy_id], tables=tables)
+                n_genes, n_xrefs = bulk.insert_gene_info(
+                    connection,
+                    gene_df,
+                    xref_df,
+                    species_id=species_map[taxonomy_id],
+                    homologene_map=homologene_map,
+                    chunksize=interval,
+                    tables=tables,
                 )
-                self.session.add(gene)
+            metrics.add_rows('insert', n_genes + n_xrefs)
+            metrics.add_species_rows(taxonomy_id, n_genes)
 
-                if not isinstance(xrefs, float):
-                    for xref in xrefs.split('|'):
-                        database, value = xref.split(':', 1)
-                        gene.xrefs.append(Xref(database=database, value=value))
+            with metrics.phase('commit'):
+                self.session.commit()
+            log.debug('inserted %d genes and %d xrefs for tax id %s in %.2f seconds', n_genes, n_xrefs,
+                      taxonomy_id, time.time() - t)
 
-                if interval and idx % interval == 0:
-                    self.session.commit()
+    def _populate_gene_info_orm(self, chunks: Iterable[pd.DataFrame], interval: Optional[int] = None) -> None:
+        """Populate the genes and cross-references by building ORM models.
+
+        :param chunks: An iterable of filtered gene_info data frames
+        :param interval: The number of records to commit at a time
+        """
+        log.info('preparing Entrez Gene models')
+        for df in tqdm(chunks, desc='Entrez Gene chunks'):
+            for taxonomy_id, sub_df in df.groupby('#tax_id'):
+                with self.load_metrics.phase('build', rows=len(sub_df.index)):
+                    self._populate_species_orm(taxonomy_id, sub_df, interval=interval)
 
         log.info('committing Entrez Gene models')
-        self.session.commit()
+        with self.load_metrics.phase('commit'):
+            self.session.commit()
+
+    def _populate_species_orm(self, taxonomy_id: str, sub_df: pd.DataFrame, interval: Optional[int] = None) -> None:
+        """Build the ORM models for the genes of a single species."""
+        taxonomy_id = str(int(taxonomy_id))
+        species = self.get_or_create_species(taxonomy_id=taxonomy_id)
+
+        species_it = tqdm(sub_df.itertuples(), desc='Tax ID {}'.format(taxonomy_id), total=len(sub_df.index),
+                          leave=False)
+        for idx, _, entrez_id, name, xrefs, description, type_of_gene in species_it:
+            entrez_id = str(int(entrez_id))
+
+            if pd.isna(name):
+                log.debug('Missing name: %s %s', entrez_id, description)
+                # These errors are due to placeholder entries for GeneRIFs and only occur once per species
+                continue
+
+            gene = Gene(
+                entrez_id=entrez_id,
+                species=species,
+                name=name,
+                name_lower=name.lower(),
+                description=description,
+                type_of_gene=type_of_gene,
+            )
+            self.session.add(gene)
+            self.load_metrics.add_species_rows(taxonomy_id, 1)
+
+            if not pd.isna(xrefs):
+                for xref in xrefs.split('|'):
+                    database, value = xref.split(':', 1)
+                    gene.xrefs.append(Xref(database=database, value=value))
+
+            if interval and idx % interval == 0:
+                with self.load_metrics.phase('commit'):
+                    self.session.commit()
+
+    def populate_gene_locations(self,
+                                url: Optional[str] = None,
+                                cache: bool = True,
+                                force_download: bool = False,
+                                tax_id_filter: Optional[Iterable[str]] = DEFAULT_TAX_IDS,
+                                chunksize: Optional[int] = None,
+                                interval: Optional[int] = None) -> int:
+        """Load the locations of genes on genomic accessions from gene2refseq with bulk inserts.
+
+        The locations of the species in ``tax_id_filter`` that were loaded before are replaced.
+
+        :param url: A custom url to download
+        :param cache: If true, the data is downloaded to the file system, else it is loaded from the internet
+        :param force_download: If true, overwrites a previously cached file
+        :param tax_id_filter: Species to keep. Explicitly set to None to get all taxonomies.
+        :param chunksize: The number of rows of gene2refseq to read at a time
+        :param interval: The number of records to send to the database at a time
+        :return: The number of locations loaded
+        """
+        location_table = GeneLocation.__table__
+        connection = self.session.connection()
+
+        delete = location_table.delete()
+        if tax_id_filter is not None:
+            tax_id_filter = list(tax_id_filter)
+            delete = delete.where(location_table.c.taxonomy_id.in_(tax_id_filter))
+        connection.execute(delete)
+
+        chunks = iter_gene_location_chunks(
+            url=url,
+            cache=cache,
+            force_download=force_download,
+            chunksize=chunksize,
+            tax_id_filter=tax_id_filter,
+        )
+        rv = 0
+        for df in tqdm(self.load_metrics.iter_phase('location_parse', chunks), desc='gene2refseq chunks'):
+            with self.load_metrics.phase('location_insert', rows=len(df.index)):
+                rv += bulk.insert_df(connection, location_table, df, chunksize=interval)
+
+        with self.load_metrics.phase('commit'):
+            self.session.commit()
+        self.location_index = None
+
+        log.info('inserted %d gene locations', rv)
+        return rv
 
     def populate(self,
                  gene_info_url: Optional[str] = None,
                  interval: Optional[int] = None,
                  tax_id_filter: Iterable[str] = DEFAULT_TAX_IDS,
-                 homologene_url: Optional[str] = None):
+                 homologene_url: Optional[str] = None,
+                 use_bulk: bool = True,
+                 chunksize: Optional[int] = None,
+                 workers: Optional[int] = None,
+                 locations: bool = False,
+                 gene2refseq_url: Optional[str] = None):
         """Populate the database.
 
+        If the database is already populated, nothing is loaded when it has the data version of the source files
+        (see :mod:`bio2bel_entrez.data_version`). Otherwise, a new generation is swapped in with :meth:`reload`,
+        since loading on top of the live tables would duplicate the genes. The new generation is always bulk loaded
+        and has to pass the validation of :meth:`reload`, otherwise the live tables are kept.
+
         :param gene_info_url: A custom url to download
         :param interval: The number of records to commit at a time
         :param tax_id_filter: Species to keep. Defaults to 9606 (human), 10090 (mouse), 10116
          (rat), 7227 (fly), and 4932 (yeast). Explicitly set to None to get all taxonomies.
         :param homologene_url: A custom url to download
+        :param use_bulk: If true, load gene_info with bulk inserts. Otherwise, build ORM models. Ignored when
+         reloading an already populated database.
+        :param chunksize: The number of rows of gene_info to read at a time
+        :param workers: The number of worker processes that prepare the rows for the bulk loader
+        :param locations: If true, also load the locations of genes from gene2refseq
+        :param gene2refseq_url: A custom url to download
         """
-        self.populate_homologene(url=homologene_url, tax_id_filter=tax_id_filter)
-        self.populate_gene_info(url=gene_info_url, interval=interval, tax_id_filter=tax_id_filter)
+        self.load_metrics = LoadMetrics()
+        urls = dict(
+            gene_info_url=gene_info_url,
+            homologene_url=homologene_url,
+            locations=locations,
+            gene2refseq_url=gene2refseq_url,
+        )
 
-    def _handle_entrez_node(self, identifier=None, name=None):
-        if identifier:
-            return self.get_gene_by_entrez_id(identifier)
-        elif name:
-            return self.get_gene_by_entrez_id(name)
-        else:
-            raise IndexError
+        if self.is_populated():
+            with self.load_metrics.phase('download'):
+                is_up_to_date = self.is_up_to_date(tax_id_filter=tax_id_filter, **urls)
+            if is_up_to_date:
+                log.info('already loaded data version %s from the same sources', self.get_data_version().version)
+                return
+
+            log.info('already populated from other sources or species, so reloading')
+            if not use_bulk:
+                log.warning('reloading with bulk inserts, since ORM models can not be built in staging tables')
+            try:
+                self.reload(tax_id_filter=tax_id_filter, interval=interval, chunksize=chunksize, workers=workers,
+                            **urls)
+            except swap.StagingValidationError as e:
+                log.error('kept the live tables, since the new ones failed validation: %s', e)
+                raise
+            return
 
-    def _handle_hgnc_node(self, identifier=None, name=None) -> Optional[Gene]:
-        if name:
-            return self.get_gene_by_hgnc_name(name)
+        # the other files download in the background while gene_info is downloaded and parsed
+        prefetch = []
+        if homologene_url is None:
+            prefetch.extend(['homologene', 'homologene_build'])
+        if locations and gene2refseq_url is None:
+            prefetch.append('gene2refseq')
+        downloads = start_downloads({name: SOURCES[name] for name in prefetch})
+
+        self.populate_gene_info(
+            url=gene_info_url,
+            interval=interval,
+            tax_id_filter=tax_id_filter,
+            use_bulk=use_bulk,
+            chunksize=chunksize,
+            workers=workers,
+        )
 
-    def _handle_rgd_node(self, identifier=None, name=None) -> Optional[Gene]:
-        if name:
-            return self.get_gene_by_rgd_name(name)
+        with self.load_metrics.phase('download'):
+            for future in downloads.values():
+                future.result()
 
-    def _handle_mgi_node(self, identifier=None, name=None) -> Optional[Gene]:
-        if name:
-            return self.get_gene_by_mgi_name(name)
+        self.populate_homologene(url=homologene_url, tax_id_filter=tax_id_filter, interval=interval)
+        if locations:
+            self.populate_gene_locations(url=gene2refseq_url, tax_id_filter=tax_id_filter, interval=interval)
 
-    def lookup_node(self, node: BaseEntity) -> Optional[Gene]:
-        """Look up a gene from a PyBEL data dictionary."""
-        namespace = node.get(NAMESPACE)
-        if namespace is None:
+        self._record_data_version(self.get_source_stamps(**urls), tax_id_filter)
+        self.load_metrics.log('populated Entrez Gene')
+
+    def _load_homologene_bulk(self,
+                              url: Optional[str] = None,
+                              force_download: bool = False,
+                              tax_id_filter: Optional[Iterable[str]] = None,
+                              tables: bulk.Tables = bulk.live_tables) -> Mapping[str, int]:
+        """Insert the missing HomoloGene groups.
+
+        :return: A dictionary from Entrez Gene identifiers to HomoloGene primary keys
+        """
+        df = self._get_homologene_df(url=url, force_download=force_download, tax_id_filter=tax_id_filter)
+
+        homologene_ids = bulk.get_homologene_map(
+            self.session.connection(),
+            df['homologene_id'].unique(),
+            tables=tables,
+        )
+        return dict(zip(df['gene_id'], df['homologene_id'].map(homologene_ids)))
+
+    def reload(self,
+               gene_info_url: Optional[str] = None,
+               homologene_url: Optional[str] = None,
+               tax_id_filter: Iterable[str] = DEFAULT_TAX_IDS,
+               interval: Optional[int] = None,
+               chunksize: Optional[int] = None,
+               force_download: bool = False,
+               min_ratio: Optional[float] = 0.5,
+               workers: Optional[int] = None,
+               locations: bool = False,
+               gene2refseq_url: Optional[str] = None) -> Dict[str, int]:
+        """Load a new generation of the database then atomically swap it in, without downtime for readers.
+
+        The new generation is bulk loaded into staging tables while the live tables are untouched. If the row counts
+        of the staging tables pass validation, the live tables are renamed to keep them as the previous generation
+        and the staging tables are renamed to take their place in a single transaction. Use :meth:`rollback` to go
+        back to the previous generation.
+
+        :param gene_info_url: A custom url to download
+        :param homologene_url: A custom url to download
+        :param tax_id_filter: Species to keep. Explicitly set to None to get all taxonomies.
+        :param interval: The number of records to send to the database at a time
+        :param chunksize: The number of rows of gene_info to read at a time
+        :param force_download: If true, downloads the latest releases instead of using previously cached files
+        :param min_ratio: The smallest allowed ratio of the new to the current counts from :meth:`summarize`.
+         If none, only checks that the new tables are not empty.
+        :param workers: The number of worker processes that prepare the rows of gene_info
+        :param locations: If true, also load the locations of genes from gene2refseq after swapping
+        :param gene2refseq_url: A custom url to download
+        :return: The counts of the new generation
+        :raises swap.StagingValidationError: If the new generation does not pass validation. The live tables are
+         left as they were and the staging tables are kept for inspection.
+        """
+        self.load_metrics = LoadMetrics()
+        tables = swap.create_staging_tables(self.engine)
+
+        prepared = _iter_prepared_gene_info(
+            url=gene_info_url,
+            force_download=force_download,
+            chunksize=chunksize,
+            tax_id_filter=tax_id_filter,
+            workers=workers,
+            metrics=self.load_metrics,
+        )
+        self._populate_gene_info_bulk(prepared, interval=interval, tables=tables)
+        self.populate_homologene(
+            url=homologene_url,
+            force_download=force_download,
+            tax_id_filter=tax_id_filter,
+            interval=interval,
+            tables=tables,
+        )
+
+        self.load_metrics.log('staged Entrez Gene')
+
+        counts = swap.count_tables(self.engine, tables)
+        log.info('staged %s', counts)
+        swap.validate_counts(counts, self.summarize(), min_ratio=min_ratio)
+
+        self.session.close()
+        self.clear_caches()
+        swap.swap_staging(self.engine)
+        log.info('swapped in the staged tables')
+
+        if locations:
+            self.populate_gene_locations(url=gene2refseq_url, tax_id_filter=tax_id_filter, interval=interval)
+
+        stamps = self.get_source_stamps(
+            gene_info_url=gene_info_url,
+            homologene_url=homologene_url,
+            locations=locations,
+            gene2refseq_url=gene2refseq_url,
+            check=force_download,
+        )
+        self._record_data_version(stamps, tax_id_filter)
+        return counts
+
+    def rollback(self) -> None:
+        """Exchange the live tables with the previous generation kept by :meth:`reload`."""
+        self.session.close()
+        self.clear_caches()
+        swap.rollback(self.engine)
+
+        # the previous generation was loaded from the sources of the version before the latest
+        data_versions = self.session.query(DataVersion).order_by(DataVersion.id.desc()).limit(2).all()
+        if len(data_versions) < 2:
             return
 
-        name = node.name
-        identifier = node.identifier
+        previous = data_versions[1]
+        self.session.add(DataVersion(**{
+            column.name: getattr(previous, column.name)
+            for column in DataVersion.__table__.columns
+            if column.name != 'id'
+        }))
+        self.session.commit()
+        self._set_data_version(previous.version)
+
+    def update(self,
+               gene_info_url: Optional[str] = None,
+               homologene_url: Optional[str] = None,
+               tax_id_filter: Iterable[str] = DEFAULT_TAX_IDS,
+               interval: Optional[int] = None,
+               chunksize: Optional[int] = None,
+               force_download: bool = False) -> Dict[str, int]:
+        """Incrementally update an already populated database to new releases of gene_info and HomoloGene.
 
-        if namespace.lower() in VALID_ENTREZ_NAMESPACES:
-            return self._handle_entrez_node(identifier, name)
+        The new gene_info is diffed against the database by Entrez Gene identifier so that new genes are inserted,
+        genes whose symbol, description, type, species, HomoloGene group, or cross-references changed are updated,
+        and genes that were discontinued are deleted. Only the rows that changed are written.
+
+        :param gene_info_url: A custom url to download
+        :param homologene_url: A custom url to download
+        :param tax_id_filter: Species to update. Explicitly set to None to update all taxonomies.
+        :param interval: The number of records to send to the database at a time
+        :param chunksize: The number of rows of gene_info to read at a time
+        :param force_download: If true, downloads the latest releases instead of using previously cached files
+        :return: The number of genes inserted, updated, and deleted and the number of HomoloGene groups deleted
+        """
+        if tax_id_filter is not None:
+            tax_id_filter = set(tax_id_filter)
 
-        # if namespace.lower() == 'hgnc':
-        #     return self._handle_hgnc_node(identifier, name)
-        #
-        # if namespace.lower() in VALID_MGI_NAMESPACES:
-        #     return self._handle_mgi_node(identifier, name)
-        #
-        # if namespace.lower() == 'rgd':
-        #     return self._handle_rgd_node(identifier, name)
+        homologene_map = self._load_homologene_bulk(
+            url=homologene_url,
+            force_download=force_download,
+            tax_id_filter=tax_id_filter,
+        )
+
+        connection = self.session.connection()
+        bulk.update_seen_table.drop(connection, checkfirst=True)
+        bulk.update_seen_table.create(connection)
+
+        rv = dict(inserted=0, updated=0)
+        chunks = iter_gene_info_chunks(
+            url=gene_info_url,
+            force_download=force_download,
+            chunksize=chunksize,
+            tax_id_filter=tax_id_filter,
+        )
+        for chunk, df in enumerate(tqdm(chunks, desc='Entrez Gene chunks')):
+            connection = self.session.connection()
+            n_inserted, n_updated = bulk.update_gene_info_df(
+                connection,
+                df,
+                chunk=chunk,
+                species_map=bulk.get_species_map(connection, df['#tax_id'].unique()),
+                homologene_map=homologene_map,
+                chunksize=interval,
+            )
+            rv['inserted'] += n_inserted
+            rv['updated'] += n_updated
+            self.session.commit()
+
+        connection = self.session.connection()
+        rv['deleted'] = bulk.retire_genes(connection, tax_id_filter=tax_id_filter)
+        rv['deleted_homologenes'] = bulk.retire_homologenes(connection)
+        bulk.update_seen_table.drop(connection)
+        self.session.commit()
+        self.session.expire_all()
+        self.clear_caches()
+
+        self._record_data_version(
+            self.get_source_stamps(gene_info_url=gene_info_url, homologene_url=homologene_url, check=force_download),
+            tax_id_filter,
+        )
 
-    def iter_genes(self, graph: BELGraph, use_tqdm: bool = False) -> Iterable[Tuple[BaseEntity, Gene]]:
-        """Iterate over genes in the graph that can be mapped to an Entrez gene."""
+        log.info('updated Entrez Gene: %s', rv)
+        return rv
+
+    @profiled
+    def lookup_node(self, node: BaseEntity, records: bool = False) -> Union[None, Gene, GeneRecord]:
+        """Look up a gene from a PyBEL data dictionary."""
+        return self.lookup_nodes([node], records=records).get(node)
+
+    @profiled
+    def lookup_nodes(self,
+                     nodes: Iterable[BaseEntity],
+                     records: bool = False) -> Dict[BaseEntity, Union[Gene, GeneRecord]]:
+        """Look up the genes for many nodes at once.
+
+        Nodes in the Entrez Gene namespaces are resolved by identifier. Nodes in the namespaces of the nomenclature
+        consortia in :data:`bio2bel_entrez.constants.SYMBOL_NAMESPACE_SPECIES_MAPPING` (e.g., HGNC, MGI, RGD) are
+        resolved by their symbol within the consortium's species.
+
+        Rather than issuing a query per node, the identifiers and symbols of all nodes are collected first then
+        resolved with a few ``IN`` queries.
+
+        :param nodes: PyBEL nodes
+        :param records: If true, return :class:`GeneRecord` snapshots from column-only queries instead of models
+        :return: A dictionary from the nodes that could be resolved to their genes
+        """
+        entrez_id_to_nodes = defaultdict(list)
+        taxonomy_id_to_symbol_to_nodes = defaultdict(lambda: defaultdict(list))
+
+        for node in nodes:
+            namespace = _get_namespace(node)
+            if namespace is None:
+                continue
+
+            if namespace.lower() in VALID_ENTREZ_NAMESPACES:
+                entrez_id = node.identifier or node.name
+                if entrez_id:
+                    entrez_id_to_nodes[entrez_id].append(node)
+
+            elif namespace.upper() in SYMBOL_NAMESPACE_SPECIES_MAPPING and node.name:
+                taxonomy_id = SYMBOL_NAMESPACE_SPECIES_MAPPING[namespace.upper()]
+                taxonomy_id_to_symbol_to_nodes[taxonomy_id][node.name].append(node)
+
+        genes = self.get_genes_by_entrez_ids(entrez_id_to_nodes, records=records)
+        rv = {
+            node: genes[entrez_id]
+            for entrez_id, entrez_nodes in entrez_id_to_nodes.items()
+            if entrez_id in genes
+            for node in entrez_nodes
+        }
+
+        for taxonomy_id, symbol_to_nodes in taxonomy_id_to_symbol_to_nodes.items():
+            genes = self.get_genes_by_symbols(taxonomy_id, symbol_to_nodes, records=records)
+            rv.update(
+                (node, genes[symbol])
+                for symbol, symbol_nodes in symbol_to_nodes.items()
+                if symbol in genes
+                for node in symbol_nodes
+            )
+
+        return rv
+
+    @profiled
+    def iter_genes(self,
+                   graph: BELGraph,
+                   use_tqdm: bool = False,
+                   records: bool = False) -> Iterable[Tuple[BaseEntity, Union[Gene, GeneRecord]]]:
+        """Iterate over genes in the graph that can be mapped to an Entrez gene.
+
+        :param graph: A BEL graph
+        :param use_tqdm: If true, show a progress bar
+        :param records: If true, yield :class:`GeneRecord` snapshots instead of models
+        """
         it = (
             tqdm(graph, desc='Entrez genes')
             if use_tqdm else
             graph
         )
-        for node in it:
-            gene_model = self.lookup_node(node)
-            if gene_model is not None:
-                yield node, gene_model
+        yield from self.lookup_nodes(it, records=records).items()
 
+    @profiled
     def normalize_genes(self, graph: BELGraph, use_tqdm: bool = False) -> None:
         """Add identifiers to all Entrez genes."""
         mapping = {
             node: gene_model.as_bel(func=node.function)
-            for node, gene_model in self.iter_genes(graph, use_tqdm=use_tqdm)
+            for node, gene_model in self.iter_genes(graph, use_tqdm=use_tqdm, records=True)
         }
         relabel_nodes(graph, mapping, copy=False)
 
+    @profiled
     def enrich_genes_with_homologenes(self, graph: BELGraph) -> None:
         """Enrich the nodes in a graph with their HomoloGene parents."""
         self.add_namespace_to_graph(graph)
@@ -356,28 +1034,96 @@ class Manager(AbstractManager, BELNamespaceManagerMixin, FlaskMixin):
                 continue
             graph.add_is_a(node_data, homologene.as_bel(node_data[FUNCTION]))
 
+    @profiled
     def enrich_equivalences(self, graph: BELGraph) -> None:
         """Add equivalent node information."""
         self.add_namespace_to_graph(graph)
 
-        for node, gene_model in list(self.iter_genes(graph)):
+        for node, gene_model in list(self.iter_genes(graph, records=True)):
             graph.add_equivalence(node, gene_model.as_bel(node[FUNCTION]))
 
-    def enrich_orthologies(self, graph: BELGraph) -> None:
-        """Add ortholog relationships to graph."""
+    @profiled
+    def enrich_orthologies(self, graph: BELGraph, tax_id_filter: Optional[Iterable[str]] = None) -> None:
+        """Add ortholog relationships to graph.
+
+        :param graph: A BEL graph
+        :param tax_id_filter: If given, only add orthologs from these species, like ``['10090', '10116']``
+         for mouse and rat.
+        """
         self.add_namespace_to_graph(graph)
         self.add_homologene_namespace_to_graph(graph)
 
-        for node, gene_model in list(self.iter_genes(graph)):
-            if not gene_model.homologene:
+        gene_models = list(self.iter_genes(graph))
+        homologene_members = self.get_homologene_members(
+            {gene_model.homologene_id for _, gene_model in gene_models},
+            tax_id_filter=tax_id_filter,
+        )
+
+        for node, gene_model in gene_models:
+            if gene_model.homologene_id is None:
                 continue  # sad gene doesn't have any friends :/
 
-            for ortholog in gene_model.homologene.genes:
+            for ortholog in homologene_members.get(gene_model.homologene_id, []):
                 ortholog_node = ortholog.as_bel(node[FUNCTION])
-                if ortholog_node == node:
+                if ortholog.id == gene_model.id:
                     continue
                 graph.add_orthology(node, ortholog_node)
 
+    @profiled
+    def get_homologene_members(self,
+                               homologene_ids: Iterable[int],
+                               tax_id_filter: Optional[Iterable[str]] = None,
+                               ) -> Dict[int, List[Gene]]:
+        """Get the member genes of several HomoloGene groups with one query per :data:`IN_CHUNKSIZE` groups.
+
+        :param homologene_ids: Primary keys of HomoloGene groups (i.e., :data:`Gene.homologene_id`)
+        :param tax_id_filter: If given, only return members from these species
+        :return: A dictionary from HomoloGene primary keys to their member genes, with species loaded
+        """
+        homologene_ids = sorted(homologene_id for homologene_id in set(homologene_ids) if homologene_id is not None)
+
+        rv = defaultdict(list)
+        for chunk in _chunked(homologene_ids, IN_CHUNKSIZE):
+            query = self.session.query(Gene).join(Species).filter(Gene.homologene_id.in_(chunk))
+            if tax_id_filter is not None:
+                query = query.filter(Species.taxonomy_id.in_(list(tax_id_filter)))
+            query = query.options(contains_eager(Gene.species))
+
+            for gene in query:
+                rv[gene.homologene_id].append(gene)
+
+        return dict(rv)
+
+    @profiled
+    def get_orthologs(self,
+                      entrez_id: str,
+                      tax_id_filter: Optional[Iterable[str]] = None,
+                      records: bool = False) -> List[Union[Gene, GeneRecord]]:
+        """Get the orthologs of a gene, not including the gene itself.
+
+        :param entrez_id: Entrez Gene identifier
+        :param tax_id_filter: If given, only return orthologs from these species
+        :param records: If true, return :class:`GeneRecord` snapshots from a column-only query instead of models
+        """
+        if records:
+            query_gene = Gene.__table__.alias()
+            homologene_id = select([query_gene.c.homologene_id]).where(query_gene.c.entrez_id == entrez_id)
+            criteria = [Gene.homologene_id == homologene_id.as_scalar(), Gene.entrez_id != entrez_id]
+            if tax_id_filter is not None:
+                criteria.append(Species.taxonomy_id.in_(list(tax_id_filter)))
+            return self._get_gene_records(*criteria)
+
+        gene = self.get_gene_by_entrez_id(entrez_id)
+        if gene is None or gene.homologene_id is None:
+            return []
+
+        members = self.get_homologene_members([gene.homologene_id], tax_id_filter=tax_id_filter)
+        return [
+            ortholog
+            for ortholog in members.get(gene.homologene_id, [])
+            if ortholog.id != gene.id
+        ]
+
     def add_homologene_namespace_to_graph(self, graph: BELGraph) -> Namespace:
         """Add the homologene namespace to the graph."""
         homologene_manager = HomologeneManager(engine=self.engine, session=self.session)
@@ -391,6 +1137,10 @@ class Manager(AbstractManager, BELNamespaceManagerMixin, FlaskMixin):
         """Count the HomoloGenes in the database."""
         return self._count_model(Homologene)
 
+    def count_gene_locations(self) -> int:
+        """Count the locations of genes in the database."""
+        return self._count_model(GeneLocation)
+
     def count_species(self) -> int:
         """Count the species in the database."""
         return self._count_model(Species)
@@ -411,8 +1161,139 @@ class Manager(AbstractManager, BELNamespaceManagerMixin, FlaskMixin):
             homologenes=self.count_homologenes()
         )
 
-    def list_genes(self, limit: Optional[int] = None, offset: Optional[int] = None) -> List[Gene]:
-        """List genes in the database."""
+    def get_data_version(self) -> Optional[DataVersion]:
+        """Get the record of the latest load of the database, or None if no load was recorded."""
+        return self.session.query(DataVersion).order_by(DataVersion.id.desc()).first()
+
+    def check_data_version(self) -> Optional[str]:
+        """Get the version of the loaded data, emptying the in-process caches and indexes if it changed.
+
+        When the version changed since the last check, e.g., because another process reloaded the database, the
+        caches of the ``get_or_create_*`` methods are emptied, the location index is dropped to be rebuilt on first
+        use, and the cross-reference index is rebuilt for the same databases. The first check only remembers the
+        version.
+        """
+        data_version = self.get_data_version()
+        version = data_version and data_version.version
+        if self._data_version is not _UNCHECKED and version != self._data_version:
+            log.info('the data version changed from %s to %s', self._data_version, version)
+            self._reset_indexes()
+        self._data_version = version
+        return version
+
+    def _reset_indexes(self) -> None:
+        """Empty the caches and indexes that were built from a previous version of the data."""
+        self.clear_caches()
+        self.location_index = None
+        databases = list(self.xref_index)
+        self.xref_index = {}
+        if databases:
+            self.build_xref_index(databases)
+
+    def get_source_stamps(self,
+                          gene_info_url: Optional[str] = None,
+                          homologene_url: Optional[str] = None,
+                          locations: bool = False,
+                          gene2refseq_url: Optional[str] = None,
+                          check: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Get the size and checksum of each source file, first downloading the missing default files in parallel.
+
+        :param gene_info_url: A custom url. If none, uses the default gene_info.
+        :param homologene_url: A custom url. If none, uses the default HomoloGene and its release number.
+        :param locations: If true, also get gene2refseq
+        :param gene2refseq_url: A custom url. If none, uses the default gene2refseq.
+        :param check: If true, downloads the default files again that changed on the server
+        :return: A dictionary from the names of the sources to their stamps from
+         :func:`bio2bel_entrez.download.get_source_stamp`
+        """
+        urls = dict(gene_info=gene_info_url, homologene=homologene_url)
+        if homologene_url is None:
+            urls['homologene_build'] = None
+        if locations:
+            urls['gene2refseq'] = gene2refseq_url
+
+        results = download_sources({name: SOURCES[name] for name, url in urls.items() if url is None}, check=check)
+        rv = {
+            name: get_source_stamp(url if url is not None else results[name].path)
+            for name, url in urls.items()
+        }
+        if 'homologene_build' in rv:
+            rv['homologene_build']['release'] = read_homologene_release(results['homologene_build'].path)
+
+        if not locations:
+            # the locations are kept when the genes are loaded again, so they still come from the same gene2refseq
+            data_version = self.get_data_version()
+            if data_version is not None and 'gene2refseq' in data_version.get_sources() and self.count_gene_locations():
+                rv['gene2refseq'] = data_version.get_sources()['gene2refseq']
+
+        return rv
+
+    def is_up_to_date(self,
+                      gene_info_url: Optional[str] = None,
+                      homologene_url: Optional[str] = None,
+                      tax_id_filter: Optional[Iterable[str]] = DEFAULT_TAX_IDS,
+                      locations: bool = False,
+                      gene2refseq_url: Optional[str] = None,
+                      check: bool = True) -> bool:
+        """Check if the database was loaded from the same source files for the same species.
+
+        :param gene_info_url: A custom url
+        :param homologene_url: A custom url
+        :param tax_id_filter: Species to keep. Explicitly set to None to get all taxonomies.
+        :param locations: If true, also check gene2refseq
+        :param gene2refseq_url: A custom url
+        :param check: If true, first downloads the default files again that changed on the server
+        """
+        data_version = self.get_data_version()
+        if data_version is None:
+            return False
+
+        stamps = self.get_source_stamps(
+            gene_info_url=gene_info_url,
+            homologene_url=homologene_url,
+            locations=locations,
+            gene2refseq_url=gene2refseq_url,
+            check=check,
+        )
+        return data_version.version == make_data_version(stamps, get_tax_ids(tax_id_filter))
+
+    def _record_data_version(self,
+                             stamps: Mapping[str, Mapping[str, Any]],
+                             tax_id_filter: Optional[Iterable[str]]) -> DataVersion:
+        """Record the source files and species the database was loaded from, with the row counts of each table."""
+        tax_ids = get_tax_ids(tax_id_filter)
+        counts = dict(self.summarize(), xrefs=self._count_model(Xref), locations=self.count_gene_locations())
+        data_version = DataVersion(
+            version=make_data_version(stamps, tax_ids),
+            homologene_release=stamps.get('homologene_build', {}).get('release'),
+            sources=json.dumps(stamps, sort_keys=True),
+            tax_ids=json.dumps(tax_ids),
+            counts=json.dumps(counts, sort_keys=True),
+        )
+        self.session.add(data_version)
+        self.session.commit()
+        log.info('recorded data version %s', data_version.version)
+
+        self._set_data_version(data_version.version)
+        return data_version
+
+    def _set_data_version(self, version: Optional[str]) -> None:
+        self._reset_indexes()
+        self._data_version = version
+
+    def list_genes(self,
+                   limit: Optional[int] = None,
+                   offset: Optional[int] = None,
+                   records: bool = False) -> List[Union[Gene, GeneRecord]]:
+        """List genes in the database.
+
+        :param limit: The maximum number of genes to list
+        :param offset: The number of genes to skip
+        :param records: If true, return :class:`GeneRecord` snapshots from a column-only query instead of models
+        """
+        if records:
+            return self._get_gene_records(limit=limit, offset=offset)
+
         query = self.session.query(Gene)
         if limit:
             query = query.limit(limit)
@@ -422,10 +1303,39 @@ class Manager(AbstractManager, BELNamespaceManagerMixin, FlaskMixin):
 
         return query.all()
 
+    def iter_genes_table(self,
+                         chunksize: int = EXPORT_CHUNKSIZE,
+                         tax_id_filter: Optional[Iterable[str]] = None) -> Iterable[pd.DataFrame]:
+        """Iterate over all genes in data frames with the columns of :class:`GeneRecord`, in constant memory.
+
+        Unlike :meth:`list_genes`, the genes are paged through by primary key (i.e., keyset pagination) instead of
+        with ``OFFSET``, so each page costs the same however far into the table it is, and the species and HomoloGene
+        groups are joined in SQL instead of being lazily loaded.
+
+        :param chunksize: The number of genes in each data frame
+        :param tax_id_filter: If given, only export genes from these species
+        """
+        query = _select_gene_records(Gene.id).order_by(Gene.id).limit(chunksize)
+        if tax_id_filter is not None:
+            query = query.where(Species.taxonomy_id.in_(list(tax_id_filter)))
+
+        last_id = None
+        while True:
+            page = query if last_id is None else query.where(Gene.id > last_id)
+            rows = self.session.execute(page).fetchall()
+            if not rows:
+                return
+
+            last_id = rows[-1][-1]
+            yield pd.DataFrame.from_records([row[:-1] for row in rows], columns=GeneRecord._fields)
+
+            if len(rows) < chunksize:
+                return
+
     @staticmethod
     def _cli_add_populate(main: click.Group) -> click.Group:
         """Overwrite the populate method since it needs to check tax identifiers."""
-        return add_populate_to_cli(main)
+        return add_update_to_cli(add_populate_to_cli(main))
 
 
 def add_populate_to_cli(main: click.Group) -> click.Group:  # noqa: D202
@@ -438,26 +1348,155 @@ def add_populate_to_cli(main: click.Group) -> click.Group:  # noqa: D202
                   help='Keep this taxonomy identifier. Can specify multiple. Defaults to 9606 (human), 10090 (mouse), '
                        '10116 (rat), 7227 (fly), and 4932 (yeast).')
     @click.option('-a', '--all-tax-id', is_flag=True, help='Use all taxonomy identifiers')
+    @click.option('--orm', is_flag=True, help='Build ORM models instead of using bulk inserts')
+    @click.option('--swap', 'use_swap', is_flag=True,
+                  help='Load into staging tables and atomically swap them in, keeping the previous tables')
+    @click.option('-w', '--workers', type=int, default=1, show_default=True,
+                  help='Number of worker processes that prepare gene_info for the bulk loader')
+    @click.option('--report', type=click.Path(dir_okay=False),
+                  help='Write the timings and row counts of the phases of the load as JSON to this path')
+    @click.option('--locations', is_flag=True, help='Also load the locations of genes from gene2refseq')
     @click.pass_obj
-    def populate(manager, reset, force, tax_id, all_tax_id):
+    def populate(manager, reset, force, tax_id, all_tax_id, orm, use_swap, workers, report, locations):
         """Populate the database."""
-        if all_tax_id:
-            tax_id_filter = None
-        elif not tax_id:
-            tax_id_filter = DEFAULT_TAX_IDS
-        else:
-            tax_id_filter = tax_id
-
-        if reset:
+        tax_id_filter = _get_tax_id_filter(tax_id, all_tax_id)
+
+        if use_swap:
+            try:
+                counts = manager.reload(tax_id_filter=tax_id_filter, workers=workers, locations=locations)
+            except swap.StagingValidationError as e:
+                click.secho(f'Staged tables failed validation: {e}', fg='red')
+                sys.exit(1)
+            finally:
+                if report:
+                    manager.load_metrics.write(report)
+            click.echo(f'Swapped in new tables: {counts}')
+            click.echo(f'Data version: {manager.check_data_version()}')
+            return
+
+        if reset or (force and manager.is_populated()):
             click.echo('Deleting the previous instance of the database')
             manager.drop_all()
             click.echo('Creating new models')
             manager.create_all()
 
-        if manager.is_populated() and not force:
-            click.echo('Database already populated. Use --force to overwrite')
+        # the populate method checks if the sources changed and swallows errors, so compare the versions around it
+        previous = manager.get_data_version()
+        manager.populate(tax_id_filter=tax_id_filter, use_bulk=not orm, workers=workers, locations=locations)
+        if report:
+            manager.load_metrics.write(report)
+
+        data_version = manager.get_data_version()
+        if data_version is None:
+            click.secho('Populating failed. See the log for details', fg='red')
+            sys.exit(1)
+        if previous is not None and previous.id == data_version.id:
+            click.echo(f'Database unchanged at data version {data_version.version}. Nothing was loaded, either since '
+                       f'it is up to date or since the new tables failed validation (see the log)')
             sys.exit(0)
+        click.echo(f'Data version: {manager.check_data_version()}')
+
+    return main
 
-        manager.populate(tax_id_filter=tax_id_filter)
+
+def add_update_to_cli(main: click.Group) -> click.Group:  # noqa: D202
+    """Add commands for updating and rolling back the database to the command line interface."""
+
+    @main.command()
+    @click.option('-t', '--tax-id', multiple=True,
+                  help='Update this taxonomy identifier. Can specify multiple. Defaults to 9606 (human), 10090 (mouse), '
+                       '10116 (rat), 7227 (fly), and 4932 (yeast).')
+    @click.option('-a', '--all-tax-id', is_flag=True, help='Update all taxonomy identifiers')
+    @click.option('--cached', is_flag=True, help='Use the previously downloaded files instead of downloading again')
+    @click.pass_obj
+    def update(manager, tax_id, all_tax_id, cached):
+        """Incrementally update the database to the latest gene_info and HomoloGene."""
+        tax_id_filter = _get_tax_id_filter(tax_id, all_tax_id)
+
+        if not manager.is_populated():
+            click.echo('Database is not populated. Use populate first')
+            sys.exit(1)
+
+        for key, value in manager.update(tax_id_filter=tax_id_filter, force_download=not cached).items():
+            click.echo(f'{key}: {value}')
+
+    @main.command()
+    @click.pass_obj
+    def rollback(manager):
+        """Exchange the live tables with the ones from before the last populate --swap."""
+        manager.rollback()
+        click.echo(f'Rolled back to: {manager.summarize()}')
 
     return main
+
+
+def _get_tax_id_filter(tax_id: Tuple[str, ...], all_tax_id: bool) -> Optional[Iterable[str]]:
+    """Get the taxonomy identifiers to use from the command line options."""
+    if all_tax_id:
+        return None
+    if not tax_id:
+        return DEFAULT_TAX_IDS
+    return tax_id
+
+
+def _iter_prepared_gene_info(url: Optional[str] = None,
+                             cache: bool = True,
+                             force_download: bool = False,
+                             chunksize: Optional[int] = None,
+                             tax_id_filter: Optional[Iterable[str]] = None,
+                             workers: Optional[int] = None,
+                             metrics: Optional[LoadMetrics] = None,
+                             ) -> Iterable[parallel.PreparedSpecies]:
+    """Iterate over the prepared rows of each species, in worker processes if there is more than one worker."""
+    if workers is not None and 1 < workers:
+        yield from parallel.iter_prepared_gene_info(
+            url=url,
+            cache=cache,
+            force_download=force_download,
+            chunksize=chunksize,
+            tax_id_filter=tax_id_filter,
+            workers=workers,
+            metrics=metrics,
+        )
+        return
+
+    chunks = iter_gene_info_chunks(
+        url=url,
+        cache=cache,
+        force_download=force_download,
+        chunksize=chunksize,
+        tax_id_filter=tax_id_filter,
+        metrics=metrics,
+    )
+    for df in chunks:
+        for taxonomy_id, sub_df in df.groupby('#tax_id'):
+            yield (taxonomy_id, *bulk.prepare_gene_info_df(sub_df))
+
+
+def _select_gene_records(*columns):
+    """Select the columns of :class:`GeneRecord` then the given columns, joining the species and HomoloGene groups."""
+    return select([
+        Gene.entrez_id,
+        Gene.name,
+        Gene.description,
+        Gene.type_of_gene,
+        Species.taxonomy_id,
+        Homologene.homologene_id,
+        *columns,
+    ]).select_from(
+        Gene.__table__
+        .outerjoin(Species.__table__, Gene.species_id == Species.id)
+        .outerjoin(Homologene.__table__, Gene.homologene_id == Homologene.id)
+    )
+
+
+def _get_namespace(node: BaseEntity) -> Optional[str]:
+    """Get the namespace of a node, if it has one."""
+    if isinstance(node, BaseAbundance):
+        return node.namespace
+
+
+def _chunked(values: List[X], size: int) -> Iterable[List[X]]:
+    """Split a list into sub-lists of the given size."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
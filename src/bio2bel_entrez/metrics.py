@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+"""Instrumentation for loading Bio2BEL Entrez.
+
+A :class:`LoadMetrics` accumulates the wall time and row counts of each phase of a load (e.g., ``download``,
+``parse``, ``filter``, ``prepare``, ``insert``, ``commit``), the number of genes loaded per species, and the peak
+resident set size. Phases nest, and the time of a nested phase is not counted towards the phase around it, so the
+phase times add up to the time of the load.
+
+The summary is logged with the full metrics in the ``metrics`` attribute of the log record for structured log
+handlers, and can be written as a JSON report.
+"""
+
+import json
+import logging
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+__all__ = [
+    'LoadMetrics',
+    'get_peak_rss',
+]
+
+log = logging.getLogger(__name__)
+
+X = TypeVar('X')
+
+
+def get_peak_rss() -> Optional[int]:
+    """Get the peak resident set size in bytes of this process and its finished child processes, if available."""
+    if resource is None:
+        return None
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return scale * max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+
+
+class LoadMetrics:
+    """Accumulates timings and row counts of the phases of a load."""
+
+    def __init__(self):  # noqa: D107
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.rows: Dict[str, int] = Counter()
+        self.species_rows: Dict[str, int] = Counter()
+        self._stack: List[List[Any]] = []
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str, rows: Optional[int] = None):
+        """Time a phase. The time spent in phases nested inside it is not counted.
+
+        :param name: The name of the phase, like ``parse``
+        :param rows: The number of rows handled in the phase, if known up front
+        """
+        now = time.perf_counter()
+        if self._stack:
+            parent = self._stack[-1]
+            self.seconds[parent[0]] += now - parent[1]
+
+        self._stack.append([name, now])
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self.seconds[name] += now - self._stack.pop()[1]
+            if self._stack:
+                self._stack[-1][1] = now
+
+        if rows is not None:
+            self.add_rows(name, rows)
+
+    def add_rows(self, name: str, rows: int) -> None:
+        """Count rows handled in a phase."""
+        self.rows[name] += rows
+
+    def add_species_rows(self, taxonomy_id: str, rows: int) -> None:
+        """Count rows loaded for a species."""
+        self.species_rows[taxonomy_id] += rows
+
+    def iter_phase(self, name: str, iterable: Iterable[X], count: Optional[Callable[[X], int]] = None) -> Iterable[X]:
+        """Iterate, counting the time spent getting each element towards a phase.
+
+        :param name: The name of the phase, like ``parse``
+        :param iterable: An iterable, e.g., of data frames that are lazily read
+        :param count: A function to count the rows in each element, e.g., ``len``
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                try:
+                    element = next(iterator)
+                except StopIteration:
+                    return
+            if count is not None:
+                self.add_rows(name, count(element))
+            yield element
+
+    def to_json(self) -> Dict[str, Any]:
+        """Get the metrics as a JSON dictionary."""
+        return dict(
+            seconds=time.perf_counter() - self._start,
+            peak_rss=get_peak_rss(),
+            phases={
+                name: dict(
+                    seconds=seconds,
+                    rows=self.rows.get(name),
+                    rows_per_second=self.rows[name] / seconds if self.rows.get(name) and seconds else None,
+                )
+                for name, seconds in self.seconds.items()
+            },
+            species=dict(self.species_rows),
+        )
+
+    def log(self, message: str = 'load metrics') -> None:
+        """Log a summary of the phases, with the full metrics in the ``metrics`` attribute of the log record."""
+        metrics = self.to_json()
+
+        phases = []
+        for name, phase in metrics['phases'].items():
+            summary = f'{name} {phase["seconds"]:.2f}s'
+            if phase['rows_per_second']:
+                summary += f' ({phase["rows_per_second"]:.0f} rows/s)'
+            phases.append(summary)
+
+        log.info('%s: %s', message, ', '.join(phases), extra=dict(metrics=metrics))
+
+    def write(self, path: str) -> None:
+        """Write the metrics as JSON."""
+        with open(path, 'w') as file:
+            json.dump(self.to_json(), file, indent=2, sort_keys=True)
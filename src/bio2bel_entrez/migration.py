@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+"""Migration of databases made before the identifier columns were stored as integers.
+
+Earlier versions stored the Entrez Gene, NCBI Taxonomy, and HomoloGene identifiers in ``VARCHAR`` columns. The
+migration copies the rows into staging tables with the current schema, casting the identifiers to integers, then swaps
+them in with :func:`bio2bel_entrez.swap.swap_staging`, so readers never see a partially migrated database.
+
+Columns that were added since, like ``name_lower`` of the genes, are filled in from the columns they are derived from,
+or left empty.
+"""
+
+import logging
+from typing import Callable, Collection, Dict, List, Mapping
+
+from sqlalchemy import Integer, Table, cast, func, inspect, null, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql import ColumnElement
+from sqlalchemy.types import String
+
+from .bulk import live_tables
+from .models import IntegerString
+from .swap import (
+    PREVIOUS_SUFFIX, STAGING_SUFFIX, StagingValidationError, count_tables, create_staging_tables, drop_tables,
+    swap_staging,
+)
+
+__all__ = [
+    'get_string_key_columns',
+    'migrate_to_integer_keys',
+]
+
+log = logging.getLogger(__name__)
+
+#: Functions from a table with an earlier schema to the values of the columns that were added since
+ADDED_COLUMNS: Mapping[str, Callable[[Table], ColumnElement]] = {
+    'name_lower': lambda table: func.lower(table.c.name),
+}
+
+
+def get_string_key_columns(engine: Engine) -> Mapping[str, List[str]]:
+    """Get the identifier columns that are still stored as strings in the database.
+
+    :param engine: An engine
+    :return: A dictionary from table names to the names of their identifier columns with a string type
+    """
+    inspector = inspect(engine)
+    existing = set(inspector.get_table_names())
+
+    rv = {}
+    for table in live_tables:
+        if table.name not in existing:
+            continue
+
+        key_columns = {column.name for column in table.columns if isinstance(column.type, IntegerString)}
+        string_columns = [
+            column['name']
+            for column in inspector.get_columns(table.name)
+            if column['name'] in key_columns and isinstance(column['type'], String)
+        ]
+        if string_columns:
+            rv[table.name] = string_columns
+
+    return rv
+
+
+def migrate_to_integer_keys(engine: Engine, keep_previous: bool = False) -> Dict[str, int]:
+    """Copy the tables into the integer identifier schema and swap them in, if they use the string schema.
+
+    :param engine: An engine
+    :param keep_previous: If true, keep the string tables as the previous generation. They can be swapped back with
+     :func:`bio2bel_entrez.swap.rollback`, but only SQLite can compare their string columns to integers.
+    :return: The counts of the migrated tables, or an empty dictionary if there was nothing to migrate
+    """
+    string_key_columns = get_string_key_columns(engine)
+    if not string_key_columns:
+        log.info('identifier columns are already integers')
+        return {}
+
+    log.info('migrating string identifier columns: %s', string_key_columns)
+    inspector = inspect(engine)
+    tables = create_staging_tables(engine)
+
+    try:
+        with engine.begin() as connection:
+            for live_table, staging_table in zip(live_tables, tables):
+                existing = {column['name'] for column in inspector.get_columns(live_table.name)}
+                columns = _get_migrated_columns(live_table, existing, string_key_columns.get(live_table.name, []))
+                insert = staging_table.insert().from_select([column.name for column in live_table.columns],
+                                                            select(columns).select_from(live_table))
+                connection.execute(insert)
+
+            if connection.dialect.name == 'postgresql':
+                for staging_table in tables:
+                    _reset_sequence(connection, staging_table)
+
+        counts = count_tables(engine, tables)
+        live_counts = count_tables(engine, live_tables)
+        if counts != live_counts:
+            raise StagingValidationError(f'copied {counts} but expected {live_counts}')
+    except Exception:
+        drop_tables(engine, STAGING_SUFFIX)
+        raise
+
+    swap_staging(engine)
+    if not keep_previous:
+        drop_tables(engine, PREVIOUS_SUFFIX)
+
+    log.info('migrated to integer identifier columns: %s', counts)
+    return counts
+
+
+def _get_migrated_columns(table: Table,
+                          existing: Collection[str],
+                          string_columns: Collection[str]) -> List[ColumnElement]:
+    """Get the values of the columns of a live table in the current schema, from the columns it has in the database.
+
+    :param table: A live table with the current schema
+    :param existing: The names of the columns the table has in the database
+    :param string_columns: The names of the identifier columns that are stored as strings in the database
+    """
+    rv = []
+    for column in table.columns:
+        if column.name in string_columns:
+            rv.append(cast(column, Integer).label(column.name))
+        elif column.name in existing:
+            rv.append(column)
+        elif column.name in ADDED_COLUMNS:
+            rv.append(ADDED_COLUMNS[column.name](table).label(column.name))
+        else:
+            rv.append(null().label(column.name))
+    return rv
+
+
+def _reset_sequence(connection: Connection, table: Table) -> None:
+    """Move a PostgreSQL table's primary key sequence past the primary keys that were copied into it."""
+    connection.execute(text(
+        f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), COALESCE(MAX(id), 0) + 1, false) "
+        f"FROM {table.name}"
+    ))
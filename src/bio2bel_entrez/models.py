@@ -2,11 +2,14 @@
 
 """SQLAlchemy models for Bio2BEL Entrez."""
 
-from typing import Mapping, Optional
+import json
+from datetime import datetime
+from typing import Any, Mapping, NamedTuple, Optional
 
-from sqlalchemy import Column, ForeignKey, Index, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.ext.declarative import DeclarativeMeta, declarative_base
 from sqlalchemy.orm import backref, relationship
+from sqlalchemy.types import TypeDecorator
 
 from pybel.dsl import CentralDogma, FUNC_TO_DSL, gene
 from .constants import ENCODING, MODULE_NAME
@@ -15,17 +18,46 @@ GENE_TABLE_NAME = f'{MODULE_NAME}_gene'
 GROUP_TABLE_NAME = f'{MODULE_NAME}_homologene'
 SPECIES_TABLE_NAME = f'{MODULE_NAME}_species'
 XREF_TABLE_NAME = f'{MODULE_NAME}_xref'
+LOCATION_TABLE_NAME = f'{MODULE_NAME}_location'
+DATA_VERSION_TABLE_NAME = f'{MODULE_NAME}_data_version'
 
 Base: DeclarativeMeta = declarative_base()
 
 
+class IntegerString(TypeDecorator):
+    """A numeric identifier that is stored as an integer but used as a string in Python.
+
+    Entrez Gene, NCBI Taxonomy, and HomoloGene identifiers are all numeric, so storing them as integers makes their
+    indexes smaller and comparisons faster, while the rest of the package keeps passing them around as strings.
+    Values that are not integers are bound as ``NULL``, so looking them up matches nothing.
+    """
+
+    impl = Integer
+
+    def process_bind_param(self, value, dialect) -> Optional[int]:  # noqa: D102
+        if value is None or isinstance(value, int):
+            return value
+        try:
+            return int(value)
+        except ValueError:
+            return None
+
+    def process_result_value(self, value, dialect) -> Optional[str]:  # noqa: D102
+        if value is None:
+            return None
+        return str(value)
+
+    def coerce_compared_value(self, op, value):  # noqa: D102
+        return self
+
+
 class Species(Base):
     """Represents a Species."""
 
     __tablename__ = SPECIES_TABLE_NAME
     id = Column(Integer, primary_key=True)
 
-    taxonomy_id = Column(String(32), unique=True, nullable=False, index=True, doc='NCBI Taxonomy Identifier')
+    taxonomy_id = Column(IntegerString, unique=True, nullable=False, index=True, doc='NCBI Taxonomy Identifier')
 
     def __repr__(self):  # noqa: D105
         return f'<Species taxonomy_id={self.taxonomy_id}>'
@@ -37,7 +69,7 @@ class Homologene(Base):
     __tablename__ = GROUP_TABLE_NAME
     id = Column(Integer, primary_key=True)
 
-    homologene_id = Column(String(255), index=True, unique=True, nullable=False)
+    homologene_id = Column(IntegerString, index=True, unique=True, nullable=False, doc='HomoloGene Identifier')
 
     bel_encoding = 'GRP'
 
@@ -65,8 +97,9 @@ class Gene(Base):
     species_id = Column(Integer, ForeignKey(f'{Species.__tablename__}.id'), index=True)
     species = relationship('Species', backref=backref('genes'))
 
-    entrez_id = Column(String(32), nullable=False, index=True, doc='NCBI Entrez Gene Identifier')
+    entrez_id = Column(IntegerString, nullable=False, index=True, doc='NCBI Entrez Gene Identifier')
     name = Column(String(255), doc='Entrez Gene Symbol')
+    name_lower = Column(String(255), doc='Lower case Entrez Gene Symbol, for case insensitive lookups')
     description = Column(Text, doc='Gene Description')
     type_of_gene = Column(String(32), doc='Type of Gene')
 
@@ -115,9 +148,49 @@ class Gene(Base):
 
     __table_args__ = (
         Index('species-name-index', species_id, name),  # for fast queries on a specific species' names
+        Index('species-name-lower-index', species_id, name_lower),  # for case insensitive queries on names
     )
 
 
+class GeneRecord(NamedTuple):
+    """A lightweight, read-only snapshot of a gene that is built from a column-only query instead of the ORM.
+
+    It has the same :data:`bel_encoding`, :meth:`as_bel`, and :meth:`to_json` as :class:`Gene`.
+    """
+
+    entrez_id: str
+    name: Optional[str]
+    description: Optional[str]
+    type_of_gene: Optional[str]
+    taxonomy_id: Optional[str]
+    homologene_id: Optional[str]
+
+    @property
+    def bel_encoding(self) -> str:
+        """Return the BEL encoding."""
+        return ENCODING.get(self.type_of_gene, 'GRP')
+
+    def as_bel(self, func=None) -> CentralDogma:
+        """Make a PyBEL DSL object from this gene."""
+        dsl = gene if func is None else FUNC_TO_DSL[func]
+
+        return dsl(
+            namespace=MODULE_NAME,
+            name=str(self.name),
+            identifier=str(self.entrez_id),
+        )
+
+    def to_json(self) -> Mapping[str, str]:
+        """Return this gene as a JSON dictionary."""
+        return dict(
+            entrez_id=str(self.entrez_id),
+            name=str(self.name),
+            species=f'<Species taxonomy_id={self.taxonomy_id}>',
+            description=str(self.description),
+            type=str(self.type_of_gene),
+        )
+
+
 class Xref(Base):
     """Represents a database cross reference."""
 
@@ -133,5 +206,71 @@ class Xref(Base):
 
     __table_args__ = (
         Index('gene-database-value-index', gene_id, database, value),
+        Index('database-value-index', database, value),  # for reverse lookups from external identifiers
         # UniqueConstraint(gene_id, database, value),
     )
+
+
+class GeneLocation(Base):
+    """Represents the location of a gene on a genomic accession, from gene2refseq.
+
+    Locations refer to genes and species by their identifiers instead of by foreign keys, so they are loaded
+    independently of gene_info and survive reloading and updating the genes. Positions are 0-based and inclusive, like
+    in gene2refseq.
+    """
+
+    __tablename__ = LOCATION_TABLE_NAME
+
+    id = Column(Integer, primary_key=True)
+
+    taxonomy_id = Column(IntegerString, nullable=False, index=True, doc='NCBI Taxonomy Identifier')
+    entrez_id = Column(IntegerString, nullable=False, index=True, doc='Entrez Gene Identifier')
+    accession = Column(String(32), nullable=False, doc='Genomic nucleotide accession and version, like NC_000022.11')
+    start_position = Column(Integer, nullable=False, doc='The 0-based position of the start of the gene')
+    end_position = Column(Integer, nullable=False, doc='The 0-based position of the end of the gene')
+    orientation = Column(String(1), doc='The strand, either + or -')
+    assembly = Column(String(255), doc='The name of the assembly, like Reference GRCh38.p14 Primary Assembly')
+
+    __table_args__ = (
+        Index('accession-start-index', accession, start_position),  # for queries on a region of an accession
+    )
+
+    def __repr__(self):  # noqa: D105
+        return f'<GeneLocation entrez_id={self.entrez_id}, {self.accession}:{self.start_position}-{self.end_position}>'
+
+
+class DataVersion(Base):
+    """Represents a load of the database and the versions of the source files it was loaded from.
+
+    The latest row describes the data in the database. See :mod:`bio2bel_entrez.data_version`.
+    """
+
+    __tablename__ = DATA_VERSION_TABLE_NAME
+
+    id = Column(Integer, primary_key=True)
+
+    version = Column(String(32), nullable=False, index=True,
+                     doc='A digest of the checksums of the source files and the species that were loaded')
+    homologene_release = Column(String(32), doc='The HomoloGene release number')
+    loaded = Column(DateTime, nullable=False, default=datetime.utcnow, doc='When the load finished, in UTC')
+    sources = Column(Text, nullable=False, doc='JSON of the URL or path, size, and MD5 checksum of each source file')
+    tax_ids = Column(Text, doc='JSON of the NCBI taxonomy identifiers of the species that were loaded, or null for all')
+    counts = Column(Text, nullable=False, doc='JSON of the number of rows in each table')
+
+    def get_sources(self) -> Mapping[str, Mapping[str, Any]]:
+        """Get the URL or path, size, and MD5 checksum of each source file."""
+        return json.loads(self.sources)
+
+    def to_json(self) -> Mapping[str, Any]:
+        """Return this data version as a JSON dictionary."""
+        return dict(
+            version=self.version,
+            homologene_release=self.homologene_release,
+            loaded=self.loaded.isoformat(),
+            sources=self.get_sources(),
+            tax_ids=json.loads(self.tax_ids) if self.tax_ids else None,
+            counts=json.loads(self.counts),
+        )
+
+    def __repr__(self):  # noqa: D105
+        return f'<DataVersion version={self.version}, loaded={self.loaded}>'
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+"""Parallel preparation of gene_info for the bulk loader.
+
+Worker processes parse and prepare the rows of each species with :func:`bio2bel_entrez.bulk.prepare_gene_info_df`
+while a single writer in the parent process inserts them. The prepared species are handed to the writer in the same
+order as the serial loader reads them, so both give exactly the same database, including primary keys.
+
+When the Parquet cache of gene_info is up to date, each worker reads the partitions of its own species from the cache.
+Otherwise, the parent process streams gene_info (building the cache along the way, like the serial loader) and only
+the preparation is done in the workers.
+"""
+
+import logging
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Callable, Deque, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from .bulk import prepare_gene_info_df
+from .metrics import LoadMetrics
+from .parser import (
+    download_gene_info, get_cache_tax_ids, get_gene_info_cache, iter_gene_info_cache_partitions,
+    iter_gene_info_chunks,
+)
+
+__all__ = [
+    'PreparedSpecies',
+    'iter_prepared_gene_info',
+]
+
+log = logging.getLogger(__name__)
+
+#: A triple of an NCBI taxonomy identifier and the gene and cross-reference rows for that species
+PreparedSpecies = Tuple[str, pd.DataFrame, pd.DataFrame]
+
+
+def iter_prepared_gene_info(url: Optional[str] = None,
+                            cache: bool = True,
+                            force_download: bool = False,
+                            chunksize: Optional[int] = None,
+                            tax_id_filter: Optional[Iterable[str]] = None,
+                            workers: Optional[int] = None,
+                            metrics: Optional[LoadMetrics] = None,
+                            ) -> Iterable[PreparedSpecies]:
+    """Iterate over the prepared rows of each species in gene_info, preparing them in a pool of worker processes.
+
+    :param url: The URL (or file path) to download.
+    :param cache: If true, the data is downloaded to the file system, else it is loaded from the internet
+    :param force_download: If true, overwrites a previously cached file
+    :param chunksize: The number of rows to read at a time
+    :param tax_id_filter: Species to keep
+    :param workers: The number of worker processes. Defaults to the number of CPUs.
+    :param metrics: Counts the time and rows of the phases of reading gene_info in the parent process
+    """
+    if metrics is None:
+        metrics = LoadMetrics()
+
+    if url is None and cache:
+        with metrics.phase('download'):
+            url = download_gene_info(force_download=force_download)
+
+    if tax_id_filter is not None:
+        tax_id_filter = set(tax_id_filter)
+
+    cache_path = get_gene_info_cache(url) if url is not None else None
+
+    workers = workers or os.cpu_count() or 1
+    window = 2 * workers
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if cache_path is not None:
+            log.info('preparing species from cached gene_info at %s', cache_path)
+            taxonomy_ids = get_cache_tax_ids(cache_path, tax_id_filter=tax_id_filter)
+            yield from _map_ordered(
+                executor,
+                _prepare_cached_species,
+                ((cache_path, taxonomy_id) for taxonomy_id in taxonomy_ids),
+                window=window,
+            )
+        else:
+            chunks = iter_gene_info_chunks(url=url, cache=cache, chunksize=chunksize, tax_id_filter=tax_id_filter,
+                                           metrics=metrics)
+            yield from _map_ordered(
+                executor,
+                _prepare_species,
+                (
+                    (taxonomy_id, sub_df)
+                    for df in chunks
+                    for taxonomy_id, sub_df in df.groupby('#tax_id')
+                ),
+                window=window,
+            )
+
+
+def _map_ordered(executor: Executor, func: Callable, iterable: Iterable[tuple], window: int) -> Iterable:
+    """Map a function over the argument tuples in the executor and yield the results in order.
+
+    At most ``window`` tasks are submitted ahead of the consumer, which bounds the memory used by results that are
+    waiting to be written.
+    """
+    futures: Deque[Future] = deque()
+    for args in iterable:
+        futures.append(executor.submit(func, *args))
+        if len(futures) >= window:
+            yield futures.popleft().result()
+
+    while futures:
+        yield futures.popleft().result()
+
+
+def _prepare_species(taxonomy_id: str, df: pd.DataFrame) -> PreparedSpecies:
+    return (taxonomy_id, *prepare_gene_info_df(df))
+
+
+def _prepare_cached_species(cache_path: str, taxonomy_id: str) -> PreparedSpecies:
+    df = pd.concat(iter_gene_info_cache_partitions(cache_path, taxonomy_id), ignore_index=True)
+    return _prepare_species(taxonomy_id, df)
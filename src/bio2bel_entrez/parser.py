@@ -2,37 +2,314 @@
 
 """Parsers for Entrez and HomoloGene data."""
 
+import json
+import logging
 import os
+import shutil
+from contextlib import ExitStack
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 import pandas as pd
 
-from bio2bel.downloading import make_df_getter
 from .constants import (
-    GENE2REFSEQ_COLUMNS, GENE2REFSEQ_DATA_PATH, GENE2REFSEQ_HUMAN_DATA_PATH, GENE2REFSEQ_HUMAN_SLIM_DATA_PATH,
-    GENE2REFSEQ_URL, GENE_INFO_COLUMNS, GENE_INFO_DATA_PATH, GENE_INFO_URL, HOMOLOGENE_COLUMNS, HOMOLOGENE_DATA_PATH,
-    HOMOLOGENE_URL,
+    CACHE_MANIFEST, GENE2REFSEQ_CACHE_COLUMNS, GENE2REFSEQ_CACHE_PATH, GENE2REFSEQ_CHUNKSIZE, GENE2REFSEQ_COLUMNS,
+    GENE2REFSEQ_DATA_PATH, GENE2REFSEQ_URL, GENE_INFO_CACHE_PATH, GENE_INFO_CHUNKSIZE, GENE_INFO_COLUMNS,
+    GENE_INFO_DATA_PATH, GENE_INFO_URL, HOMOLOGENE_COLUMNS, HOMOLOGENE_DATA_PATH, HOMOLOGENE_URL,
 )
+from .download import Download, download, get_md5, get_source_stamp, open_decompressed
+from .metrics import LoadMetrics
 
 __all__ = [
     'get_gene_info_df',
+    'iter_gene_info_chunks',
+    'get_gene_info_cache',
+    'get_cache_tax_ids',
+    'iter_gene_info_cache_partitions',
     'get_homologene_df',
     'get_refseq_df',
     'get_human_refseq_slim_df',
+    'iter_gene2refseq_chunks',
+    'iter_gene_location_chunks',
 ]
 
-get_gene_info_df = make_df_getter(
-    GENE_INFO_URL,
-    GENE_INFO_DATA_PATH,
+log = logging.getLogger(__name__)
+
+gene_info_kwargs = dict(
     sep='\t',
     na_values=['-', 'NEWENTRY'],
     usecols=GENE_INFO_COLUMNS,
+    dtype={
+        '#tax_id': str,
+        'GeneID': str,
+    },
 )
 
-get_homologene_df = make_df_getter(
+
+def _make_df_getter(data_url: str, data_path: str, **kwargs) -> Callable[..., pd.DataFrame]:  # noqa: D202
+    """Build a function that downloads tabular data with :mod:`bio2bel_entrez.download` and reads it.
+
+    :param data_url: The URL of the data
+    :param data_path: The path where the data should get stored
+    :param kwargs: Any other arguments to pass to :func:`pandas.read_csv`
+    """
+
+    def get_df(url: Optional[str] = None, cache: bool = True, force_download: bool = False) -> pd.DataFrame:
+        """Get the data as a pandas DataFrame.
+
+        :param url: The URL (or file path) to download.
+        :param cache: If true, the data is downloaded to the file system, else it is loaded from the internet
+        :param force_download: If true, downloads the file again if it changed on the server
+        """
+        if url is None and cache:
+            url = download(data_url, data_path, check=force_download).path
+
+        if url is not None and os.path.exists(url):
+            with open_decompressed(url) as file:
+                return pd.read_csv(file, **kwargs)
+
+        return pd.read_csv(url or data_url, **kwargs)
+
+    return get_df
+
+
+get_gene_info_df = _make_df_getter(GENE_INFO_URL, GENE_INFO_DATA_PATH, **gene_info_kwargs)
+
+
+def download_gene_info(force_download: bool = False) -> str:
+    """Download gene_info.gz unless it was downloaded before, and get its path.
+
+    :param force_download: If true, downloads the file again if it changed on the server
+    """
+    return download(GENE_INFO_URL, GENE_INFO_DATA_PATH, check=force_download).path
+
+
+def iter_gene_info_chunks(url: Optional[str] = None,
+                          cache: bool = True,
+                          force_download: bool = False,
+                          chunksize: Optional[int] = None,
+                          tax_id_filter: Optional[Iterable[str]] = None,
+                          use_cache: bool = True,
+                          cache_path: Optional[str] = None,
+                          metrics: Optional[LoadMetrics] = None,
+                          ) -> Iterable[pd.DataFrame]:
+    """Iterate over gene_info in chunks, keeping only the given species.
+
+    Unlike :func:`get_gene_info_df`, the whole file is never held in memory so the peak memory is bounded by
+    the chunk size.
+
+    When :mod:`pyarrow` is installed and the data is read from a local file, the first pass over the file also writes
+    a Parquet cache partitioned by ``#tax_id``. Later passes read only the partitions in ``tax_id_filter``. The cache
+    is rebuilt when the source file's modification time, size, and checksum no longer match.
+
+    When gene_info is downloaded, it is parsed while it is downloaded and decompressed.
+
+    :param url: The URL (or file path) to download.
+    :param cache: If true, the data is downloaded to the file system, else it is loaded from the internet
+    :param force_download: If true, downloads the file again if it changed on the server
+    :param chunksize: The number of rows to read at a time. Defaults to
+     :data:`bio2bel_entrez.constants.GENE_INFO_CHUNKSIZE`.
+    :param tax_id_filter: Species to keep
+    :param use_cache: If true, use the Parquet cache of gene_info
+    :param cache_path: The directory of the Parquet cache. Defaults to
+     :data:`bio2bel_entrez.constants.GENE_INFO_CACHE_PATH` when reading the default gene_info file, otherwise no
+     cache is used unless given explicitly.
+    :param metrics: Counts the time and rows of the ``download``, ``parse``, ``filter``, and ``cache`` phases
+    """
+    if metrics is None:
+        metrics = LoadMetrics()
+
+    if tax_id_filter is not None:
+        tax_id_filter = set(tax_id_filter)
+
+    with ExitStack() as stack:
+        file = None
+        if url is None and cache:
+            with metrics.phase('download'):
+                url, file = _open_download(stack, GENE_INFO_URL, GENE_INFO_DATA_PATH, force_download)
+
+        cache_path = _get_cache_path(url, cache_path) if use_cache else None
+        if file is None and cache_path is not None and _is_cache_valid(url, cache_path):
+            log.info('using cached gene_info at %s', cache_path)
+            yield from metrics.iter_phase('parse', _iter_gene_info_cache(cache_path, tax_id_filter), count=_count_rows)
+            return
+
+        if file is None:
+            file = _open_local(stack, url)
+
+        reader = pd.read_csv(file or url or GENE_INFO_URL, chunksize=chunksize or GENE_INFO_CHUNKSIZE,
+                             **gene_info_kwargs)
+        reader = metrics.iter_phase('parse', reader, count=_count_rows)
+
+        if cache_path is not None:
+            log.info('caching gene_info to %s', cache_path)
+            reader = _iter_and_cache_gene_info(url, cache_path, reader, metrics)
+
+        for df in reader:
+            if tax_id_filter is not None:
+                with metrics.phase('filter'):
+                    df = df[df['#tax_id'].isin(tax_id_filter)]
+
+            if not df.empty:
+                yield df
+
+
+def _open_download(stack: ExitStack, url: str, path: str, force_download: bool) -> Tuple[str, Optional[BinaryIO]]:
+    """Start downloading a file and get its path, plus a stream to parse it from if it is being downloaded."""
+    source = stack.enter_context(Download(url, path, check=force_download))
+    if source.is_current:
+        return source.path, None
+    return source.path, stack.enter_context(source.open())
+
+
+def _open_local(stack: ExitStack, url: Optional[str]) -> Optional[BinaryIO]:
+    """Open the URL if it is a local file, decompressing it in parallel with the reader if possible."""
+    if url is not None and os.path.exists(url):
+        return stack.enter_context(open_decompressed(url))
+
+
+def _count_rows(df: pd.DataFrame) -> int:
+    return len(df.index)
+
+
+def get_gene_info_cache(url: str, cache_path: Optional[str] = None) -> Optional[str]:
+    """Get the directory of the Parquet cache of gene_info if it is up to date with the given file.
+
+    :param url: The file path of gene_info
+    :param cache_path: The directory of the Parquet cache. Defaults like in :func:`iter_gene_info_chunks`.
+    :return: The directory of the cache, or None if it is missing, stale, or can not be used
+    """
+    cache_path = _get_cache_path(url, cache_path)
+    if cache_path is not None and _is_cache_valid(url, cache_path):
+        return cache_path
+
+
+def _get_cache_path(url: Optional[str],
+                    cache_path: Optional[str] = None,
+                    default_url: str = GENE_INFO_DATA_PATH,
+                    default_cache_path: str = GENE_INFO_CACHE_PATH,
+                    ) -> Optional[str]:
+    """Get the directory of the Parquet cache of a file, or None if it can not be used for the given file."""
+    if cache_path is None and url == default_url:
+        cache_path = default_cache_path
+
+    if cache_path is None or url is None or '://' in url:
+        return
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        log.debug('pyarrow is not installed. Not using the Parquet cache of %s', url)
+        return
+
+    return cache_path
+
+
+def _iter_and_cache_gene_info(url: str,
+                              cache_path: str,
+                              reader: Iterable[pd.DataFrame],
+                              metrics: LoadMetrics,
+                              ) -> Iterable[pd.DataFrame]:
+    """Iterate over the chunks of gene_info while writing all of them to the Parquet cache."""
+    temporary_path = f'{cache_path}.tmp'
+    shutil.rmtree(temporary_path, ignore_errors=True)
+    os.makedirs(temporary_path)
+
+    for part, df in enumerate(reader):
+        with metrics.phase('cache', rows=len(df.index)):
+            df['type_of_gene'] = df['type_of_gene'].astype('category')
+            for taxonomy_id, sub_df in df.groupby('#tax_id'):
+                directory = os.path.join(temporary_path, f'tax_id={taxonomy_id}')
+                os.makedirs(directory, exist_ok=True)
+                sub_df.to_parquet(os.path.join(directory, f'part-{part:06d}.parquet'), index=False)
+
+        yield df
+
+    with open(os.path.join(temporary_path, CACHE_MANIFEST), 'w') as file:
+        json.dump(get_source_stamp(url), file)
+
+    shutil.rmtree(cache_path, ignore_errors=True)
+    os.rename(temporary_path, cache_path)
+
+
+def _iter_gene_info_cache(cache_path: str, tax_id_filter: Optional[Set[str]] = None) -> Iterable[pd.DataFrame]:
+    """Iterate over the partitions of the Parquet cache of gene_info."""
+    for taxonomy_id in get_cache_tax_ids(cache_path, tax_id_filter=tax_id_filter):
+        yield from iter_gene_info_cache_partitions(cache_path, taxonomy_id)
+
+
+def get_cache_tax_ids(cache_path: str, tax_id_filter: Optional[Iterable[str]] = None) -> List[str]:
+    """Get the sorted NCBI taxonomy identifiers in a Parquet cache partitioned by species, of gene_info or gene2refseq.
+
+    :param cache_path: The directory of the Parquet cache
+    :param tax_id_filter: Species to keep
+    """
+    taxonomy_ids = sorted(
+        name[len('tax_id='):]
+        for name in os.listdir(cache_path)
+        if name.startswith('tax_id=')
+    )
+    if tax_id_filter is not None:
+        tax_id_filter = set(tax_id_filter)
+        taxonomy_ids = [taxonomy_id for taxonomy_id in taxonomy_ids if taxonomy_id in tax_id_filter]
+    return taxonomy_ids
+
+
+def iter_gene_info_cache_partitions(cache_path: str, taxonomy_id: str) -> Iterable[pd.DataFrame]:
+    """Iterate over the memory-mapped partitions of one species in the Parquet cache of gene_info.
+
+    :param cache_path: The directory of the Parquet cache
+    :param taxonomy_id: An NCBI taxonomy identifier
+    """
+    import pyarrow.parquet as pq
+
+    directory = os.path.join(cache_path, f'tax_id={taxonomy_id}')
+    for name in sorted(os.listdir(directory)):
+        table = pq.read_table(os.path.join(directory, name), memory_map=True)
+        yield table.to_pandas()[GENE_INFO_COLUMNS]
+
+
+def _is_cache_valid(url: str, cache_path: str) -> bool:
+    """Check the cache was built from the same version of the source file.
+
+    The checksum is only calculated when the modification time or size has changed.
+    """
+    manifest = _read_manifest(cache_path)
+    if manifest is None or not os.path.exists(url):
+        return False
+
+    stamp = get_source_stamp(url, checksum=False)
+    if stamp['mtime'] == manifest['mtime'] and stamp['size'] == manifest['size']:
+        return True
+
+    stamp['md5'] = get_md5(url)
+    if stamp['md5'] != manifest['md5']:
+        return False
+
+    manifest.update(stamp)
+    with open(os.path.join(cache_path, CACHE_MANIFEST), 'w') as file:
+        json.dump(manifest, file)
+    return True
+
+
+def _read_manifest(cache_path: str) -> Optional[Dict[str, Any]]:
+    manifest_path = os.path.join(cache_path, CACHE_MANIFEST)
+    if not os.path.exists(manifest_path):
+        return
+
+    with open(manifest_path) as file:
+        return json.load(file)
+
+
+get_homologene_df = _make_df_getter(
     HOMOLOGENE_URL,
     HOMOLOGENE_DATA_PATH,
     sep='\t',
     names=HOMOLOGENE_COLUMNS,
+    dtype={
+        'homologene_id': str,
+        'tax_id': str,
+        'gene_id': str,
+    },
 )
 """Download the HomoloGene data.
 
@@ -50,59 +327,279 @@ refseq_dtype = {
     'GeneID': str,
 }
 
-get_refseq_df = make_df_getter(
+get_refseq_df = _make_df_getter(
     GENE2REFSEQ_URL,
     GENE2REFSEQ_DATA_PATH,
     sep='\t',
     usecols=GENE2REFSEQ_COLUMNS,
     dtype=refseq_dtype,
 )
+"""Get all of gene2refseq.gz in memory. Use :func:`iter_gene2refseq_chunks` to get only some species."""
 
 
-def get_human_refseq_df() -> pd.DataFrame:
-    """Get the human subset of gene2refseq.gz."""
-    if os.path.exists(GENE2REFSEQ_HUMAN_DATA_PATH):
-        return pd.read_csv(
-            GENE2REFSEQ_HUMAN_DATA_PATH,
+def download_gene2refseq(force_download: bool = False) -> str:
+    """Download gene2refseq.gz unless it was downloaded before, and get its path.
+
+    :param force_download: If true, downloads the file again if it changed on the server
+    """
+    return download(GENE2REFSEQ_URL, GENE2REFSEQ_DATA_PATH, check=force_download).path
+
+
+def iter_gene2refseq_chunks(url: Optional[str] = None,
+                            cache: bool = True,
+                            force_download: bool = False,
+                            chunksize: Optional[int] = None,
+                            tax_id_filter: Optional[Iterable[str]] = None,
+                            assembly_filter: Optional[Iterable[str]] = None,
+                            use_cache: bool = True,
+                            cache_path: Optional[str] = None,
+                            ) -> Iterable[pd.DataFrame]:
+    """Iterate over gene2refseq in chunks, keeping only the given species and assemblies.
+
+    Rows are filtered while reading, so the peak memory is bounded by the chunk size however large the file is. The
+    chunks have the columns in :data:`bio2bel_entrez.constants.GENE2REFSEQ_CACHE_COLUMNS`, all as strings.
+
+    When :mod:`pyarrow` is installed and the data is read from a local file, a pass over the file also writes the rows
+    it keeps to a Parquet cache with a file per species. Later passes for the same or fewer species and assemblies read
+    only their species' files. The cache is rebuilt when the source file changes or when more species or assemblies
+    are asked for.
+
+    When gene2refseq is downloaded, it is parsed while it is downloaded and decompressed.
+
+    :param url: The URL (or file path) to download.
+    :param cache: If true, the data is downloaded to the file system, else it is loaded from the internet
+    :param force_download: If true, downloads the file again if it changed on the server
+    :param chunksize: The number of rows to read at a time. Defaults to
+     :data:`bio2bel_entrez.constants.GENE2REFSEQ_CHUNKSIZE`.
+    :param tax_id_filter: Species to keep
+    :param assembly_filter: Assemblies to keep, like ``Reference GRCh38.p14 Primary Assembly``. Rows without a
+     genomic location have the assembly ``-``.
+    :param use_cache: If true, use the Parquet cache of gene2refseq
+    :param cache_path: The directory of the Parquet cache. Defaults to
+     :data:`bio2bel_entrez.constants.GENE2REFSEQ_CACHE_PATH` when reading the default gene2refseq file, otherwise
+     no cache is used unless given explicitly.
+    """
+    if tax_id_filter is not None:
+        tax_id_filter = set(tax_id_filter)
+    if assembly_filter is not None:
+        assembly_filter = set(assembly_filter)
+    chunksize = chunksize or GENE2REFSEQ_CHUNKSIZE
+
+    with ExitStack() as stack:
+        file = None
+        if url is None and cache:
+            url, file = _open_download(stack, GENE2REFSEQ_URL, GENE2REFSEQ_DATA_PATH, force_download)
+
+        if use_cache:
+            cache_path = _get_cache_path(url, cache_path, GENE2REFSEQ_DATA_PATH, GENE2REFSEQ_CACHE_PATH)
+        else:
+            cache_path = None
+
+        is_cache_valid = file is None and cache_path is not None and _is_gene2refseq_cache_valid(
+            url, cache_path, tax_id_filter, assembly_filter,
+        )
+        if is_cache_valid:
+            log.info('using cached gene2refseq at %s', cache_path)
+            yield from _iter_gene2refseq_cache(cache_path, chunksize, tax_id_filter, assembly_filter)
+            return
+
+        if file is None:
+            file = _open_local(stack, url)
+
+        reader = pd.read_csv(
+            file or url or GENE2REFSEQ_URL,
             sep='\t',
-            dtype=refseq_dtype,
+            usecols=GENE2REFSEQ_CACHE_COLUMNS,
+            dtype=str,
+            chunksize=chunksize,
         )
+        reader = _iter_filtered(reader, tax_id_filter, assembly_filter)
+
+        if cache_path is not None:
+            log.info('caching gene2refseq to %s', cache_path)
+            reader = _iter_and_cache_gene2refseq(url, cache_path, reader, tax_id_filter, assembly_filter)
+
+        yield from reader
+
+
+def _iter_filtered(reader: Iterable[pd.DataFrame],
+                   tax_id_filter: Optional[Set[str]],
+                   assembly_filter: Optional[Set[str]],
+                   ) -> Iterable[pd.DataFrame]:
+    for df in reader:
+        if tax_id_filter is not None:
+            df = df[df['#tax_id'].isin(tax_id_filter)]
+        if assembly_filter is not None:
+            df = df[df['assembly'].isin(assembly_filter)]
+        if not df.empty:
+            yield df[GENE2REFSEQ_CACHE_COLUMNS]
+
+
+def _iter_and_cache_gene2refseq(url: str,
+                                cache_path: str,
+                                reader: Iterable[pd.DataFrame],
+                                tax_id_filter: Optional[Set[str]],
+                                assembly_filter: Optional[Set[str]],
+                                ) -> Iterable[pd.DataFrame]:
+    """Iterate over the chunks of gene2refseq while appending them to a Parquet file per species."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    temporary_path = f'{cache_path}.tmp'
+    shutil.rmtree(temporary_path, ignore_errors=True)
+    os.makedirs(temporary_path)
+
+    schema = pa.schema([(column, pa.string()) for column in GENE2REFSEQ_CACHE_COLUMNS])
+    writers = {}
+    try:
+        for df in reader:
+            for taxonomy_id, sub_df in df.groupby('#tax_id', sort=False):
+                writer = writers.get(taxonomy_id)
+                if writer is None:
+                    directory = os.path.join(temporary_path, f'tax_id={taxonomy_id}')
+                    os.makedirs(directory)
+                    writer = writers[taxonomy_id] = pq.ParquetWriter(
+                        os.path.join(directory, 'part-000000.parquet'),
+                        schema,
+                    )
+                writer.write_table(pa.Table.from_pandas(sub_df, schema=schema, preserve_index=False))
 
-    df = get_refseq_df()
-    df = df[df['#tax_id'] == '9606']
-    del df['#tax_id']
-    df.to_csv(
-        GENE2REFSEQ_HUMAN_DATA_PATH,
-        sep='\t',
-        index=False,
+            yield df
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    manifest = get_source_stamp(url)
+    manifest.update(
+        tax_ids=tax_id_filter and sorted(tax_id_filter),
+        assemblies=assembly_filter and sorted(assembly_filter),
     )
-    return df
+    with open(os.path.join(temporary_path, CACHE_MANIFEST), 'w') as file:
+        json.dump(manifest, file)
 
+    shutil.rmtree(cache_path, ignore_errors=True)
+    os.rename(temporary_path, cache_path)
 
-def get_human_refseq_slim_df() -> pd.DataFrame:
-    """Get the human RefSeq coordinates."""
-    if os.path.exists(GENE2REFSEQ_HUMAN_SLIM_DATA_PATH):
-        return pd.read_csv(
-            GENE2REFSEQ_HUMAN_SLIM_DATA_PATH,
-            sep='\t',
-            dtype=refseq_dtype,
-        )
 
-    df = get_human_refseq_df()
+def _is_gene2refseq_cache_valid(url: str,
+                                cache_path: str,
+                                tax_id_filter: Optional[Set[str]],
+                                assembly_filter: Optional[Set[str]],
+                                ) -> bool:
+    """Check the cache was built from the same version of gene2refseq and has the given species and assemblies."""
+    manifest = _read_manifest(cache_path)
+    if manifest is None:
+        return False
+
+    for cached, requested in ((manifest['tax_ids'], tax_id_filter), (manifest['assemblies'], assembly_filter)):
+        if cached is not None and (requested is None or not requested.issubset(cached)):
+            return False
+
+    return _is_cache_valid(url, cache_path)
+
+
+def _iter_gene2refseq_cache(cache_path: str,
+                            chunksize: int,
+                            tax_id_filter: Optional[Set[str]],
+                            assembly_filter: Optional[Set[str]],
+                            ) -> Iterable[pd.DataFrame]:
+    """Iterate over the cached rows of the given species in chunks."""
+    import pyarrow.parquet as pq
+
+    for taxonomy_id in get_cache_tax_ids(cache_path, tax_id_filter=tax_id_filter):
+        directory = os.path.join(cache_path, f'tax_id={taxonomy_id}')
+        for name in sorted(os.listdir(directory)):
+            parquet_file = pq.ParquetFile(os.path.join(directory, name), memory_map=True)
+            batches = (batch.to_pandas() for batch in parquet_file.iter_batches(batch_size=chunksize))
+            yield from _iter_filtered(batches, None, assembly_filter)
+
+
+#: The names of the columns of the data frames from :func:`iter_gene_location_chunks`
+GENE_LOCATION_COLUMNS = {
+    '#tax_id': 'taxonomy_id',
+    'GeneID': 'entrez_id',
+    'genomic_nucleotide_accession.version': 'accession',
+    'start_position_on_the_genomic_accession': 'start_position',
+    'end_position_on_the_genomic_accession': 'end_position',
+    'orientation': 'orientation',
+    'assembly': 'assembly',
+}
+
+
+def iter_gene_location_chunks(url: Optional[str] = None,
+                              cache: bool = True,
+                              force_download: bool = False,
+                              chunksize: Optional[int] = None,
+                              tax_id_filter: Optional[Iterable[str]] = None,
+                              ) -> Iterable[pd.DataFrame]:
+    """Iterate over the distinct locations of genes on genomic accessions in gene2refseq, keeping only given species.
+
+    gene2refseq has a row for each RNA and protein of a gene, which all repeat the location of the gene on each
+    genomic accession it is annotated on. The repeats are dropped, as are rows without a genomic accession. Positions
+    are 0-based like in gene2refseq. The rows are read with :func:`iter_gene2refseq_chunks`, so they come from its
+    cache when possible.
 
+    :param url: The URL (or file path) to download.
+    :param cache: If true, the data is downloaded to the file system, else it is loaded from the internet
+    :param force_download: If true, downloads the file again if it changed on the server
+    :param chunksize: The number of rows to read at a time. Defaults to
+     :data:`bio2bel_entrez.constants.GENE2REFSEQ_CHUNKSIZE`.
+    :param tax_id_filter: Species to keep
+    :return: Data frames with the columns in :data:`GENE_LOCATION_COLUMNS`
+    """
+    chunks = iter_gene2refseq_chunks(
+        url=url,
+        cache=cache,
+        force_download=force_download,
+        chunksize=chunksize,
+        tax_id_filter=tax_id_filter,
+    )
+
+    held = None
+    for df in chunks:
+        df = df.loc[df['genomic_nucleotide_accession.version'] != '-', list(GENE_LOCATION_COLUMNS)]
+        if held is not None:
+            df = pd.concat([held, df])
+        if df.empty:
+            continue
+
+        # gene2refseq is sorted by gene, so the rows of the last gene can continue in the next chunk
+        is_last_gene = (df['GeneID'] == df['GeneID'].iloc[-1]).values
+        held = df[is_last_gene]
+        if not is_last_gene.all():
+            yield _prepare_gene_location_df(df[~is_last_gene])
+
+    if held is not None and not held.empty:
+        yield _prepare_gene_location_df(held)
+
+
+def _prepare_gene_location_df(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.drop_duplicates().rename(columns=GENE_LOCATION_COLUMNS)
+    return df.astype({'start_position': int, 'end_position': int})
+
+
+def get_human_refseq_df() -> pd.DataFrame:
+    """Get the human subset of gene2refseq.gz.
+
+    Only the human rows are kept while reading, and they are cached by :func:`iter_gene2refseq_chunks`.
+    """
+    chunks = iter_gene2refseq_chunks(tax_id_filter=['9606'])
+    return _concat_refseq_chunks(chunks, GENE2REFSEQ_COLUMNS[1:])
+
+
+def get_human_refseq_slim_df() -> pd.DataFrame:
+    """Get the human RefSeq coordinates on the primary assembly of GRCh38.p12."""
     # FIXME still have problem where there are about 49 duplicated genes
-    df = df[df['assembly'] == 'Reference GRCh38.p12 Primary Assembly']
-    del df['assembly']
-    df.drop_duplicates(inplace=True)
-    df[[
-        'GeneID',
-        'Symbol',
-        'start_position_on_the_genomic_accession',
-        'end_position_on_the_genomic_accession',
-
-    ]].to_csv(
-        GENE2REFSEQ_HUMAN_SLIM_DATA_PATH,
-        sep='\t',
-        index=False,
+    chunks = iter_gene2refseq_chunks(
+        tax_id_filter=['9606'],
+        assembly_filter=['Reference GRCh38.p12 Primary Assembly'],
     )
-    return df
+    df = _concat_refseq_chunks(chunks, [column for column in GENE2REFSEQ_COLUMNS[1:] if column != 'assembly'])
+    return df.drop_duplicates()
+
+
+def _concat_refseq_chunks(chunks: Iterable[pd.DataFrame], columns: List[str]) -> pd.DataFrame:
+    dfs = [df[columns] for df in chunks]
+    if not dfs:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(dfs, ignore_index=True)
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+
+"""Profiling of the manager's read methods.
+
+A :class:`QueryProfiler` listens to the SQLAlchemy engine and ORM events to count, per profiled method, the calls, the
+SQL statements issued, the time spent executing them, the ORM instances hydrated, and the wall time. Statistics are
+cumulative like :mod:`cProfile`'s: a method's statistics include those of the profiled methods it calls, so if
+``enrich_genes_with_homologenes`` issues many more statements than the ``iter_genes`` it calls, the difference comes
+from lazy loading in its own loop.
+
+Enable it with :meth:`bio2bel_entrez.Manager.start_profiling`:
+
+>>> profiler = manager.start_profiling()
+>>> manager.enrich_orthologies(graph)
+>>> print(profiler.report())
+"""
+
+import inspect
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, List, NamedTuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .models import Base
+
+__all__ = [
+    'MethodStats',
+    'QueryProfiler',
+    'profiled',
+]
+
+log = logging.getLogger(__name__)
+
+
+class MethodStats(NamedTuple):
+    """The cumulative statistics of a profiled method."""
+
+    name: str
+    calls: int
+    statements: int
+    db_seconds: float
+    rows: int
+    seconds: float
+
+    @property
+    def statements_per_call(self) -> float:
+        """Get the average number of statements per call. Many statements per call hint at an N+1 pattern."""
+        return self.statements / self.calls if self.calls else 0.0
+
+
+class QueryProfiler:
+    """Counts the statements, database time, hydrated rows, and wall time of profiled methods."""
+
+    def __init__(self, engine: Engine):  # noqa: D107
+        self.engine = engine
+        self._stats: Dict[str, Counter] = defaultdict(Counter)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.active = False
+
+    def _get_stack(self) -> List[str]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _add(self, **values) -> None:
+        """Add to the statistics of the methods that are running in this thread."""
+        stack = self._get_stack()
+        if not stack:
+            return
+        with self._lock:
+            for name in set(stack):
+                self._stats[name].update(values)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('bio2bel_entrez_query_start', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('bio2bel_entrez_query_start', [])
+        if not starts:  # the statement started before profiling did
+            return
+        start = starts.pop()
+        self._add(statements=1, db_seconds=time.perf_counter() - start)
+
+    def _on_load(self, target, context):
+        self._add(rows=1)
+
+    def start(self) -> None:
+        """Start listening to the engine and ORM events."""
+        if self.active:
+            return
+        event.listen(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(self.engine, 'after_cursor_execute', self._after_cursor_execute)
+        event.listen(Base, 'load', self._on_load, propagate=True)
+        self.active = True
+
+    def stop(self) -> None:
+        """Stop listening to the engine and ORM events. The statistics are kept."""
+        if not self.active:
+            return
+        event.remove(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.remove(self.engine, 'after_cursor_execute', self._after_cursor_execute)
+        event.remove(Base, 'load', self._on_load)
+        self.active = False
+
+    def reset(self) -> None:
+        """Forget the statistics."""
+        with self._lock:
+            self._stats.clear()
+
+    @contextmanager
+    def profile(self, name: str, call: bool = True):
+        """Count the statements, rows, and time in the block towards a method.
+
+        :param name: The name of the method
+        :param call: If false, only count the time, e.g., when resuming a generator
+        """
+        stack = self._get_stack()
+        stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stack.pop()
+            seconds = time.perf_counter() - start
+            if name not in stack:  # recursive calls are already timed by the outer call
+                with self._lock:
+                    self._stats[name].update(calls=int(call), seconds=seconds)
+
+    def get_stats(self) -> List[MethodStats]:
+        """Get the statistics of each profiled method, by descending wall time."""
+        with self._lock:
+            rv = [
+                MethodStats(
+                    name=name,
+                    calls=stats['calls'],
+                    statements=stats['statements'],
+                    db_seconds=stats['db_seconds'],
+                    rows=stats['rows'],
+                    seconds=stats['seconds'],
+                )
+                for name, stats in self._stats.items()
+            ]
+        return sorted(rv, key=lambda stats: stats.seconds, reverse=True)
+
+    def to_json(self) -> List[Dict[str, Any]]:
+        """Get the statistics as a JSON list."""
+        return [
+            dict(stats._asdict(), statements_per_call=stats.statements_per_call)
+            for stats in self.get_stats()
+        ]
+
+    def report(self) -> str:
+        """Summarize the statistics as a table."""
+        lines = [
+            f'{"method":<32} {"calls":>8} {"statements":>10} {"per call":>9} {"db s":>9} {"rows":>9} {"wall s":>9}',
+        ]
+        for stats in self.get_stats():
+            lines.append(
+                f'{stats.name:<32} {stats.calls:>8} {stats.statements:>10} {stats.statements_per_call:>9.1f} '
+                f'{stats.db_seconds:>9.3f} {stats.rows:>9} {stats.seconds:>9.3f}'
+            )
+        return '\n'.join(lines)
+
+
+def profiled(func: Callable) -> Callable:
+    """Decorate a manager method to be profiled when the manager's profiler is enabled.
+
+    The time a generator spends suspended is not counted, so the consumer's work is not attributed to it.
+    """
+    name = func.__name__
+
+    if inspect.isgeneratorfunction(func):
+        @wraps(func)
+        def generator_wrapper(self, *args, **kwargs):
+            profiler = self.profiler
+            if profiler is None:
+                yield from func(self, *args, **kwargs)
+                return
+
+            iterator = func(self, *args, **kwargs)
+            call = True
+            while True:
+                with profiler.profile(name, call=call):
+                    try:
+                        element = next(iterator)
+                    except StopIteration:
+                        return
+                call = False
+                yield element
+
+        return generator_wrapper
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        profiler = self.profiler
+        if profiler is None:
+            return func(self, *args, **kwargs)
+
+        with profiler.profile(name):
+            return func(self, *args, **kwargs)
+
+    return wrapper
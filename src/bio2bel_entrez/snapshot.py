@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+
+"""Read-only, memory-mapped snapshots of the Bio2BEL Entrez tables.
+
+A snapshot is a directory of uncompressed :mod:`numpy` arrays that are opened with ``mmap_mode='r'``, so opening one
+costs nothing up front and many processes share the same page-cached copy without a database connection.
+
+The arrays are:
+
+- ``entrez_ids``: the sorted Entrez Gene identifiers, as integers
+- ``taxonomy_ids``: the NCBI taxonomy identifier of each gene
+- ``homologene_ids``: the HomoloGene identifier of each gene, or -1
+- ``types``: the index of each gene's type in ``meta.json``
+- ``names`` and ``descriptions``: UTF-8 string heaps, with ``name_offsets`` and ``description_offsets`` giving the
+  start and end of each gene's string
+- ``symbol_index``: the genes sorted by taxonomy identifier, lower case symbol, then Entrez Gene identifier
+- ``homologene_index`` and ``homologene_sorted``: the genes sorted by HomoloGene identifier, and the sorted
+  HomoloGene identifiers
+"""
+
+import json
+import logging
+import os
+import shutil
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.engine.base import Connectable
+
+from .constants import CONSORTIUM_SPECIES_MAPPING, SNAPSHOT_PATH
+from .models import Gene, GeneRecord, Homologene, Species
+
+__all__ = [
+    'SNAPSHOT_VERSION',
+    'export_snapshot',
+    'Snapshot',
+]
+
+log = logging.getLogger(__name__)
+
+#: The version of the snapshot format, stored in ``meta.json``
+SNAPSHOT_VERSION = 1
+
+SNAPSHOT_META = 'meta.json'
+
+
+def export_snapshot(connectable: Connectable,
+                    directory: Optional[str] = None,
+                    data_version: Optional[str] = None) -> int:
+    """Write the genes with their species and HomoloGene groups to a snapshot directory.
+
+    The snapshot is written to a temporary directory then renamed, so readers never see a partial snapshot.
+
+    :param connectable: An engine or connection
+    :param directory: The directory of the snapshot. Defaults to :data:`bio2bel_entrez.constants.SNAPSHOT_PATH`.
+    :param data_version: The version of the data in the database, from
+     :meth:`bio2bel_entrez.Manager.check_data_version`, to record in ``meta.json``
+    :return: The number of genes written
+    """
+    directory = directory or SNAPSHOT_PATH
+
+    query = select([
+        Gene.entrez_id,
+        Gene.name,
+        Gene.description,
+        Gene.type_of_gene,
+        Species.taxonomy_id,
+        Homologene.homologene_id,
+    ]).select_from(
+        Gene.__table__
+        .outerjoin(Species.__table__, Gene.species_id == Species.id)
+        .outerjoin(Homologene.__table__, Gene.homologene_id == Homologene.id)
+    )
+    result = connectable.execute(query)
+    df = pd.DataFrame.from_records(result.fetchall(), columns=list(result.keys()))
+    df['entrez_id'] = df['entrez_id'].astype(np.int64)
+    df = df.sort_values('entrez_id', ignore_index=True)
+
+    types = sorted(df['type_of_gene'].dropna().unique())
+    type_codes = pd.Categorical(df['type_of_gene'], categories=types).codes
+
+    names, name_offsets = _make_heap(df['name'])
+    descriptions, description_offsets = _make_heap(df['description'])
+
+    taxonomy_ids = pd.to_numeric(df['taxonomy_id']).fillna(-1).astype(np.int64).values
+    homologene_ids = pd.to_numeric(df['homologene_id']).fillna(-1).astype(np.int64).values
+
+    symbol_df = pd.DataFrame({
+        'taxonomy_id': taxonomy_ids,
+        'name_lower': df['name'].fillna('').str.lower(),
+        'entrez_id': df['entrez_id'],
+    })
+    symbol_index = symbol_df.sort_values(['taxonomy_id', 'name_lower', 'entrez_id']).index.values
+    homologene_index = np.argsort(homologene_ids, kind='stable')
+
+    arrays = dict(
+        entrez_ids=df['entrez_id'].values,
+        taxonomy_ids=taxonomy_ids,
+        homologene_ids=homologene_ids,
+        types=type_codes.astype(np.int16),
+        names=names,
+        name_offsets=name_offsets,
+        descriptions=descriptions,
+        description_offsets=description_offsets,
+        symbol_index=symbol_index.astype(np.int64),
+        homologene_index=homologene_index.astype(np.int64),
+        homologene_sorted=homologene_ids[homologene_index],
+    )
+
+    temporary_directory = f'{directory}.tmp'
+    shutil.rmtree(temporary_directory, ignore_errors=True)
+    os.makedirs(temporary_directory)
+    for key, array in arrays.items():
+        np.save(os.path.join(temporary_directory, f'{key}.npy'), array)
+
+    with open(os.path.join(temporary_directory, SNAPSHOT_META), 'w') as file:
+        json.dump(dict(version=SNAPSHOT_VERSION, genes=len(df.index), types=types, data_version=data_version), file)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.rename(temporary_directory, directory)
+
+    log.info('wrote %d genes to snapshot at %s', len(df.index), directory)
+    return len(df.index)
+
+
+def _parse_int(value: str) -> Optional[int]:
+    """Parse an identifier, or return None if it is not numeric, like :class:`bio2bel_entrez.models.IntegerString`."""
+    try:
+        return int(value)
+    except ValueError:
+        return
+
+
+def _make_heap(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """Encode strings into a single UTF-8 byte array with an array of offsets. Missing strings are empty."""
+    encoded = [value.encode('utf-8') if isinstance(value, str) else b'' for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+class Snapshot:
+    """Look up genes in a snapshot written by :func:`export_snapshot`, with the read methods of the manager.
+
+    Genes are returned as :class:`bio2bel_entrez.models.GeneRecord` instances.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """Open a snapshot.
+
+        :param directory: The directory of the snapshot. Defaults to
+         :data:`bio2bel_entrez.constants.SNAPSHOT_PATH`.
+        """
+        self.directory = directory or SNAPSHOT_PATH
+
+        with open(os.path.join(self.directory, SNAPSHOT_META)) as file:
+            meta = json.load(file)
+        if meta['version'] != SNAPSHOT_VERSION:
+            raise ValueError(f'unsupported snapshot version {meta["version"]} in {self.directory}')
+        self.types: List[str] = meta['types']
+        #: The version of the data the snapshot was exported from, if it was recorded
+        self.data_version: Optional[str] = meta.get('data_version')
+
+        self.entrez_ids = self._load('entrez_ids')
+        self.taxonomy_ids = self._load('taxonomy_ids')
+        self.homologene_ids = self._load('homologene_ids')
+        self.type_codes = self._load('types')
+        self.names = self._load('names')
+        self.name_offsets = self._load('name_offsets')
+        self.descriptions = self._load('descriptions')
+        self.description_offsets = self._load('description_offsets')
+        self.symbol_index = self._load('symbol_index')
+        self.homologene_index = self._load('homologene_index')
+        self.homologene_sorted = self._load('homologene_sorted')
+
+    def _load(self, key: str) -> np.ndarray:
+        return np.load(os.path.join(self.directory, f'{key}.npy'), mmap_mode='r')
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self.entrez_ids)
+
+    def _get_string(self, heap: np.ndarray, offsets: np.ndarray, row: int) -> Optional[str]:
+        start, end = offsets[row], offsets[row + 1]
+        if start == end:
+            return None
+        return heap[start:end].tobytes().decode('utf-8')
+
+    def _get_name(self, row: int) -> Optional[str]:
+        return self._get_string(self.names, self.name_offsets, row)
+
+    def _get_record(self, row: int) -> GeneRecord:
+        type_code = self.type_codes[row]
+        taxonomy_id = self.taxonomy_ids[row]
+        homologene_id = self.homologene_ids[row]
+        return GeneRecord(
+            entrez_id=str(self.entrez_ids[row]),
+            name=self._get_name(row),
+            description=self._get_string(self.descriptions, self.description_offsets, row),
+            type_of_gene=self.types[type_code] if 0 <= type_code else None,
+            taxonomy_id=str(taxonomy_id) if 0 <= taxonomy_id else None,
+            homologene_id=str(homologene_id) if 0 <= homologene_id else None,
+        )
+
+    def _get_row(self, entrez_id: str) -> Optional[int]:
+        key = _parse_int(entrez_id)
+        if key is None:
+            return
+        row = int(np.searchsorted(self.entrez_ids, key))
+        if row < len(self.entrez_ids) and self.entrez_ids[row] == key:
+            return row
+
+    def get_gene_by_entrez_id(self, entrez_id: str) -> Optional[GeneRecord]:
+        """Get a gene with the given Entrez Gene identifier, if it exists.
+
+        :param entrez_id: Entrez Gene identifier
+        """
+        row = self._get_row(entrez_id)
+        if row is not None:
+            return self._get_record(row)
+
+    def get_genes_by_entrez_ids(self, entrez_ids: Iterable[str]) -> Dict[str, GeneRecord]:
+        """Get a dictionary from Entrez Gene identifiers to genes, for the identifiers that exist.
+
+        :param entrez_ids: Entrez Gene identifiers
+        """
+        rv = {}
+        for entrez_id in entrez_ids:
+            row = self._get_row(entrez_id)
+            if row is not None:
+                rv[entrez_id] = self._get_record(row)
+        return rv
+
+    def get_gene_by_symbol(self, taxonomy_id: str, symbol: str) -> Optional[GeneRecord]:
+        """Get a gene by its symbol (case insensitive) in the given species.
+
+        Like :meth:`bio2bel_entrez.Manager.get_gene_by_symbol`, if several genes match, the one whose symbol matches
+        exactly is preferred, then the one with the lowest Entrez Gene identifier.
+
+        :param taxonomy_id: NCBI taxonomy identifier
+        :param symbol: Entrez Gene symbol
+        """
+        taxonomy_key = _parse_int(taxonomy_id)
+        if taxonomy_key is None:
+            return
+
+        key = taxonomy_key, symbol.lower()
+        position = bisect_left(_SymbolKeys(self), key)
+
+        candidates = []
+        while position < len(self.symbol_index):
+            row = int(self.symbol_index[position])
+            name = self._get_name(row) or ''
+            if (self.taxonomy_ids[row], name.lower()) != key:
+                break
+            if name == symbol:
+                return self._get_record(row)
+            candidates.append(row)
+            position += 1
+
+        if candidates:
+            return self._get_record(candidates[0])
+
+    def get_gene_by_hgnc_name(self, name: str) -> Optional[GeneRecord]:
+        """Get a gene by its HGNC gene symbol."""
+        return self.get_gene_by_symbol(CONSORTIUM_SPECIES_MAPPING['HGNC'], name)
+
+    def get_gene_by_mgi_name(self, name: str) -> Optional[GeneRecord]:
+        """Get a gene by its MGI gene symbol."""
+        return self.get_gene_by_symbol(CONSORTIUM_SPECIES_MAPPING['MGI'], name)
+
+    def get_gene_by_rgd_name(self, name: str) -> Optional[GeneRecord]:
+        """Get a gene by its RGD gene symbol."""
+        return self.get_gene_by_symbol(CONSORTIUM_SPECIES_MAPPING['RGD'], name)
+
+    def get_homologene_members(self,
+                               homologene_ids: Iterable[str],
+                               tax_id_filter: Optional[Iterable[str]] = None,
+                               ) -> Dict[str, List[GeneRecord]]:
+        """Get the member genes of several HomoloGene groups.
+
+        Unlike :meth:`bio2bel_entrez.Manager.get_homologene_members`, the groups are given by their HomoloGene
+        identifiers since the snapshot has no primary keys.
+
+        :param homologene_ids: HomoloGene identifiers
+        :param tax_id_filter: If given, only return members from these species
+        :return: A dictionary from HomoloGene identifiers to their member genes
+        """
+        if tax_id_filter is not None:
+            tax_id_filter = {_parse_int(taxonomy_id) for taxonomy_id in tax_id_filter} - {None}
+
+        rv = defaultdict(list)
+        for homologene_id in homologene_ids:
+            if homologene_id is None:
+                continue
+            key = int(homologene_id)
+            start = int(np.searchsorted(self.homologene_sorted, key, side='left'))
+            end = int(np.searchsorted(self.homologene_sorted, key, side='right'))
+            for row in self.homologene_index[start:end]:
+                if tax_id_filter is None or self.taxonomy_ids[row] in tax_id_filter:
+                    rv[homologene_id].append(self._get_record(int(row)))
+
+        return dict(rv)
+
+    def get_orthologs(self, entrez_id: str, tax_id_filter: Optional[Iterable[str]] = None) -> List[GeneRecord]:
+        """Get the orthologs of a gene, not including the gene itself.
+
+        :param entrez_id: Entrez Gene identifier
+        :param tax_id_filter: If given, only return orthologs from these species
+        """
+        gene = self.get_gene_by_entrez_id(entrez_id)
+        if gene is None or gene.homologene_id is None:
+            return []
+
+        members = self.get_homologene_members([gene.homologene_id], tax_id_filter=tax_id_filter)
+        return [
+            ortholog
+            for ortholog in members.get(gene.homologene_id, [])
+            if ortholog.entrez_id != gene.entrez_id
+        ]
+
+
+class _SymbolKeys:
+    """A lazy sequence of the ``(taxonomy_id, lower case symbol)`` keys of a snapshot's symbol index, for bisection."""
+
+    def __init__(self, snapshot: Snapshot):  # noqa: D107
+        self.snapshot = snapshot
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self.snapshot.symbol_index)
+
+    def __getitem__(self, position: int) -> Tuple[int, str]:  # noqa: D105
+        row = int(self.snapshot.symbol_index[position])
+        return int(self.snapshot.taxonomy_ids[row]), (self.snapshot._get_name(row) or '').lower()
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+"""Blue/green generations of the Bio2BEL Entrez tables.
+
+A new generation of the tables is loaded under staging names (e.g., ``ncbigene_gene_staging``) while readers keep
+using the live tables. Once it is validated, the live tables are renamed to their previous names (e.g.,
+``ncbigene_gene_previous``) and the staging tables are renamed to the live names in a single transaction, so readers
+never see a partially loaded database. The previous generation is kept so the swap can be rolled back.
+"""
+
+import logging
+import time
+from typing import Callable, Iterable, Mapping, Optional, Tuple
+
+from sqlalchemy import Column, ForeignKey, Index, MetaData, Table, func, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.base import Connectable
+
+from .bulk import Tables, live_tables
+
+__all__ = [
+    'STAGING_SUFFIX',
+    'PREVIOUS_SUFFIX',
+    'StagingValidationError',
+    'make_tables',
+    'create_staging_tables',
+    'drop_tables',
+    'count_tables',
+    'validate_counts',
+    'swap_staging',
+    'rollback',
+]
+
+log = logging.getLogger(__name__)
+
+STAGING_SUFFIX = '_staging'
+PREVIOUS_SUFFIX = '_previous'
+
+
+class StagingValidationError(ValueError):
+    """Raised when the staging tables do not pass validation and are not swapped in."""
+
+
+def make_tables(suffix: str, generation: Optional[str] = None) -> Tables:
+    """Make copies of the live tables whose names end with the given suffix.
+
+    Foreign keys point to the copies and index names end with the generation, since index names have to be unique
+    across all tables.
+
+    :param suffix: The suffix for the table names, like :data:`STAGING_SUFFIX`
+    :param generation: The suffix for index names. Defaults to the current time.
+    """
+    if generation is None:
+        generation = str(int(time.time() * 1000))
+
+    metadata = MetaData()
+    return Tables(*(
+        _copy_table(table, metadata, lambda name: f'{name}{suffix}', generation)
+        for table in live_tables
+    ))
+
+
+def _copy_table(table: Table, metadata: MetaData, rename: Callable[[str], str], generation: str) -> Table:
+    columns = [
+        Column(
+            column.name,
+            column.type,
+            *[
+                ForeignKey(f'{rename(foreign_key.column.table.name)}.{foreign_key.column.name}')
+                for foreign_key in column.foreign_keys
+            ],
+            primary_key=column.primary_key,
+            nullable=column.nullable,
+            unique=column.unique,
+        )
+        for column in table.columns
+    ]
+    rv = Table(rename(table.name), metadata, *columns)
+
+    for index in table.indexes:
+        Index(f'{index.name}_{generation}', *[rv.c[column.name] for column in index.columns], unique=index.unique)
+
+    return rv
+
+
+def create_staging_tables(connectable: Connectable, generation: Optional[str] = None) -> Tables:
+    """Drop any leftover staging tables then create new, empty ones.
+
+    :param connectable: An engine or connection
+    :param generation: The suffix for index names. Defaults to the current time.
+    """
+    drop_tables(connectable, STAGING_SUFFIX)
+    tables = make_tables(STAGING_SUFFIX, generation=generation)
+    tables.gene.metadata.create_all(connectable)
+    return tables
+
+
+def drop_tables(connectable: Connectable, suffix: str) -> None:
+    """Drop the tables with the given suffix, if they exist.
+
+    :param connectable: An engine or connection
+    :param suffix: The suffix of the table names, like :data:`STAGING_SUFFIX` or :data:`PREVIOUS_SUFFIX`
+    """
+    existing = set(inspect(connectable).get_table_names())
+    for table in reversed(live_tables):
+        name = f'{table.name}{suffix}'
+        if name in existing:
+            log.info('dropping %s', name)
+            connectable.execute(text(f'DROP TABLE {name}'))
+
+
+def count_tables(connectable: Connectable, tables: Tables) -> Mapping[str, int]:
+    """Count the rows in the tables like :meth:`bio2bel_entrez.Manager.summarize`.
+
+    :param connectable: An engine or connection
+    :param tables: The tables to count
+    """
+    return dict(
+        genes=connectable.execute(select([func.count()]).select_from(tables.gene)).scalar(),
+        species=connectable.execute(select([func.count()]).select_from(tables.species)).scalar(),
+        homologenes=connectable.execute(select([func.count()]).select_from(tables.homologene)).scalar(),
+    )
+
+
+def validate_counts(staging: Mapping[str, int], live: Mapping[str, int], min_ratio: Optional[float] = None) -> None:
+    """Check that the staging tables are not empty and did not shrink too much compared to the live tables.
+
+    :param staging: The counts of the staging tables
+    :param live: The counts of the live tables
+    :param min_ratio: The smallest allowed ratio of staging to live counts. If none, only checks for empty tables.
+    :raises StagingValidationError: If a staging table is empty or shrunk too much
+    """
+    for key, count in staging.items():
+        if 0 == count:
+            raise StagingValidationError(f'no {key} in staging tables')
+
+        if min_ratio is not None and count < min_ratio * live.get(key, 0):
+            raise StagingValidationError(f'only {count} {key} in staging tables compared to {live[key]} live')
+
+
+def swap_staging(engine: Engine) -> None:
+    """Replace the live tables with the staging tables, keeping the live tables as the previous generation.
+
+    :param engine: An engine
+    """
+    drop_tables(engine, PREVIOUS_SUFFIX)
+    _rename_tables(engine, [
+        *((table.name, f'{table.name}{PREVIOUS_SUFFIX}') for table in live_tables),
+        *((f'{table.name}{STAGING_SUFFIX}', table.name) for table in live_tables),
+    ])
+
+
+def rollback(engine: Engine) -> None:
+    """Exchange the live tables and the previous generation of tables.
+
+    Calling this function a second time restores the original state.
+
+    :param engine: An engine
+    """
+    existing = set(inspect(engine).get_table_names())
+    missing = [
+        f'{table.name}{PREVIOUS_SUFFIX}'
+        for table in live_tables
+        if f'{table.name}{PREVIOUS_SUFFIX}' not in existing
+    ]
+    if missing:
+        raise ValueError(f'no previous generation to roll back to. Missing: {", ".join(missing)}')
+
+    drop_tables(engine, STAGING_SUFFIX)
+    _rename_tables(engine, [
+        *((table.name, f'{table.name}{STAGING_SUFFIX}') for table in live_tables),
+        *((f'{table.name}{PREVIOUS_SUFFIX}', table.name) for table in live_tables),
+        *((f'{table.name}{STAGING_SUFFIX}', f'{table.name}{PREVIOUS_SUFFIX}') for table in live_tables),
+    ])
+
+
+def _rename_tables(engine: Engine, renames: Iterable[Tuple[str, str]]) -> None:
+    """Rename several tables in a single transaction."""
+    statements = [
+        f'ALTER TABLE {old} RENAME TO {new}'
+        for old, new in renames
+    ]
+
+    with engine.connect() as connection:
+        if connection.dialect.name != 'sqlite':
+            with connection.begin():
+                for statement in statements:
+                    connection.execute(text(statement))
+            return
+
+        # pysqlite does not open a transaction before DDL statements, so it has to be done explicitly
+        dbapi_connection = connection.connection
+        isolation_level = dbapi_connection.isolation_level
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            for statement in statements:
+                cursor.execute(statement)
+            cursor.execute('COMMIT')
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+        finally:
+            cursor.close()
+            dbapi_connection.isolation_level = isolation_level
@@ -5,6 +5,7 @@
 import os
 
 __all__ = [
+    'TEST_GENE2REFSEQ_PATH',
     'TEST_GENE_INFO_PATH',
     'TEST_HOMOLOGENE_PATH',
 ]
@@ -12,3 +13,4 @@ __all__ = [
 HERE = os.path.dirname(os.path.realpath(__file__))
 TEST_GENE_INFO_PATH = os.path.join(HERE, 'gene_info')
 TEST_HOMOLOGENE_PATH = os.path.join(HERE, 'homologene.data')
+TEST_GENE2REFSEQ_PATH = os.path.join(HERE, 'gene2refseq')
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the JSON lookup API."""
+
+import threading
+import time
+from unittest import mock
+
+from flask import Flask
+
+from bio2bel_entrez.api import register_api
+from tests.cases import PopulatedDatabaseMixin
+
+
+class TestApi(PopulatedDatabaseMixin):
+    """Test the JSON lookup API."""
+
+    def setUp(self):
+        """Make a test client for the application."""
+        super().setUp()
+        self.app = Flask(__name__)
+        self.service = register_api(self.app, self.manager)
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        """Stop profiling."""
+        self.manager.stop_profiling()
+        super().tearDown()
+
+    def test_genes(self):
+        """Test getting genes by Entrez Gene identifiers."""
+        response = self.client.get('/api/genes?entrez_id=5594,116590&entrez_id=0')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual({'5594', '116590'}, set(response.json))
+        self.assertEqual('MAPK1', response.json['5594']['name'])
+
+        response = self.client.post('/api/genes', json=[5594])
+        self.assertEqual(['5594'], list(response.json))
+
+        self.assertEqual('MAPK1', self.client.get('/api/genes/5594').json['name'])
+        self.assertEqual(404, self.client.get('/api/genes/0').status_code)
+
+    def test_lookups(self):
+        """Test looking up genes by symbol, orthologs, and cross-references."""
+        response = self.client.get('/api/species/10116/genes?symbol=Mapk1,nope')
+        self.assertEqual(['Mapk1'], list(response.json))
+        self.assertEqual('116590', self.client.get('/api/species/10116/genes/Mapk1').json['entrez_id'])
+
+        response = self.client.get('/api/genes/5594/orthologs?tax_id=10116')
+        self.assertEqual(['116590'], [ortholog['entrez_id'] for ortholog in response.json])
+
+        self.assertEqual({'70500': ['116590']}, self.client.get('/api/xrefs/RGD?value=70500').json)
+
+    def test_cache(self):
+        """Test that warm and repeated lookups are served from memory, including misses."""
+        self.assertEqual(self.manager.count_genes(), len(self.service.cache))
+
+        profiler = self.manager.start_profiling()
+        self.client.get('/api/genes?entrez_id=5594')
+        self.client.get('/api/genes/0')
+        self.client.get('/api/genes/0')
+        self.assertEqual(1, {stats.name: stats for stats in profiler.get_stats()}['get_genes_by_entrez_ids'].calls)
+
+    def test_etag(self):
+        """Test that revalidating with the entity tag of the current data version gives a 304."""
+        response = self.client.get('/api/genes/5594')
+        self.assertIsNotNone(response.headers['ETag'])
+        self.assertIn('max-age', response.headers['Cache-Control'])
+
+        etag = response.headers['ETag']
+        response = self.client.get('/api/genes/5594', headers={'If-None-Match': etag})
+        self.assertEqual(304, response.status_code)
+
+        self.service.data_version = 'new'
+        response = self.client.get('/api/genes/5594', headers={'If-None-Match': etag})
+        self.assertEqual(200, response.status_code)
+        self.assertNotEqual(etag, response.headers['ETag'])
+
+    def test_check_data_version(self):
+        """Test that the cache is emptied and the entity tags change when a new data version is loaded."""
+        self.assertEqual(self.manager.get_data_version().version, self.service.data_version)
+        etag = self.client.get('/api/genes/5594').headers['ETag']
+
+        self.service.check_interval = 0
+        with mock.patch.object(self.manager, 'check_data_version', return_value='new'):
+            response = self.client.get('/api/genes/5594', headers={'If-None-Match': etag})
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('new', self.service.data_version)
+        self.assertEqual(1, len(self.service.cache))
+
+    def test_check_data_version_concurrent(self):
+        """Test that concurrent requests check the data version once per interval."""
+        self.service._checked -= self.service.check_interval
+
+        def check_data_version():
+            time.sleep(0.05)
+            return 'new'
+
+        with mock.patch.object(self.manager, 'check_data_version', side_effect=check_data_version) as check:
+            threads = [threading.Thread(target=self.service.check_data_version) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(1, check.call_count)
+        self.assertEqual('new', self.service.data_version)
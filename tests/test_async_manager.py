@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the async manager."""
+
+import asyncio
+
+from bio2bel_entrez.async_manager import AsyncManager
+from bio2bel_entrez.models import GeneRecord
+from pybel.dsl import gene
+from tests.cases import PopulatedDatabaseMixin
+
+
+class TestAsyncManager(PopulatedDatabaseMixin):
+    """Test the async manager."""
+
+    def setUp(self):
+        """Make an event loop."""
+        super().setUp()
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        """Close the event loop."""
+        self.loop.close()
+        super().tearDown()
+
+    def test_lookups(self):
+        """Test that concurrent lookups return records."""
+        async def lookup():
+            async with AsyncManager(self.manager, max_workers=4) as manager:
+                return await asyncio.gather(
+                    *(manager.get_gene_by_entrez_id('5594') for _ in range(20)),
+                    manager.get_gene_by_symbol('10116', 'mapk1'),
+                    manager.get_orthologs('5594', tax_id_filter=['10116']),
+                    manager.get_genes_by_xref('RGD', '70500'),
+                    manager.map_xrefs('RGD', ['70500']),
+                    manager.lookup_nodes([gene(namespace='HGNC', name='MAPK1')]),
+                    manager.get_gene_by_entrez_id('0'),
+                )
+
+        *genes, symbol_gene, orthologs, xref_genes, xref_map, node_genes, missing = self.loop.run_until_complete(
+            lookup())
+
+        for gene_record in genes:
+            self.assertIsInstance(gene_record, GeneRecord)
+            self.assertEqual('MAPK1', gene_record.name)
+        self.assertEqual('116590', symbol_gene.entrez_id)
+        self.assertEqual(['116590'], [ortholog.entrez_id for ortholog in orthologs])
+        self.assertEqual(['116590'], [xref_gene.entrez_id for xref_gene in xref_genes])
+        self.assertEqual({'70500': ['116590']}, xref_map)
+        self.assertEqual(['5594'], [gene_record.entrez_id for gene_record in node_genes.values()])
+        self.assertIsNone(missing)
+
+    def test_from_connection(self):
+        """Test building an async manager with its own pool."""
+        manager = AsyncManager.from_connection(self.manager.connection, pool_size=2)
+        try:
+            gene_record = self.loop.run_until_complete(manager.get_gene_by_entrez_id('116590'))
+        finally:
+            manager.close()
+        self.assertEqual('Mapk1', gene_record.name)
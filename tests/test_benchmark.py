@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the benchmarks."""
+
+import unittest
+
+from bio2bel_entrez.benchmark import BENCHMARK_VERSION, run_benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+    """Test the benchmarks on a small scale."""
+
+    def test_run_benchmark(self):
+        """Test that the synthetic data loads and the steps are timed."""
+        results = run_benchmark(n_genes=60, n_nodes=10, steps=['lookup_node', 'iter_genes', 'to_bel'])
+
+        self.assertEqual(BENCHMARK_VERSION, results['version'])
+        self.assertEqual(60, results['counts']['genes'])
+        self.assertEqual(6, results['counts']['species'])
+        self.assertLess(0, results['counts']['homologenes'])
+        self.assertEqual(
+            {'generate', 'populate_gene_info', 'populate_homologene', 'lookup_node', 'iter_genes', 'to_bel'},
+            set(results['timings']),
+        )
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the caches."""
+
+import unittest
+
+from bio2bel_entrez.cache import CacheInfo, LRUCache
+from tests.cases import PopulatedDatabaseMixin
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test the LRU cache."""
+
+    def test_eviction(self):
+        """Test that the least recently used entry is evicted and the statistics are counted."""
+        cache = LRUCache(2)
+        cache['a'] = 1
+        cache['b'] = 2
+        self.assertEqual(1, cache.get('a'))
+        cache['c'] = 3
+
+        self.assertNotIn('b', cache)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(3, cache.get('c'))
+        self.assertEqual(CacheInfo(hits=2, misses=1, evictions=1, maxsize=2, currsize=2), cache.info())
+
+    def test_unbounded(self):
+        """Test that a cache without a maximum size never evicts."""
+        cache = LRUCache(None)
+        for i in range(100):
+            cache[i] = i
+        self.assertEqual(100, len(cache))
+        self.assertEqual(0, cache.info().evictions)
+
+
+class TestManagerCache(PopulatedDatabaseMixin):
+    """Test the caches used by the manager's get_or_create methods."""
+
+    def test_get_or_create_species(self):
+        """Test that species are cached by primary key and stale keys are dropped."""
+        self.manager.clear_caches()
+
+        species = self.manager.get_or_create_species('9606')
+        self.assertEqual(species.id, self.manager.species_cache.get('9606'))
+        self.assertIs(species, self.manager.get_or_create_species('9606'))
+
+        new_species = self.manager.get_or_create_species('1')
+        self.assertIsNotNone(new_species.id)
+        self.assertEqual(new_species.id, self.manager.species_cache.get('1'))
+
+        self.manager.session.delete(new_species)
+        self.manager.session.commit()
+        self.assertIsNot(new_species, self.manager.get_or_create_species('1'))
+        self.manager.session.rollback()
+
+        info = self.manager.cache_info()['species']
+        self.assertEqual(4, info.hits)
+        self.assertEqual(2, info.misses)
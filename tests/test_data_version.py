@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for recording the versions of the loaded data."""
+
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from bio2bel.testing import TemporaryConnectionMethodMixin
+from bio2bel_entrez import Manager
+from bio2bel_entrez.data_version import get_tax_ids, make_data_version
+from bio2bel_entrez.download import download_sources, get_source_stamp
+from bio2bel_entrez.models import DataVersion
+from tests.constants import TEST_GENE_INFO_PATH, TEST_HOMOLOGENE_PATH
+
+
+class TestDataVersion(TemporaryConnectionMethodMixin):
+    """Test recording data versions when loading the database."""
+
+    def setUp(self):
+        """Make a manager and a temporary directory for modified data."""
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.manager = Manager(connection=self.connection)
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.directory)
+        super().tearDown()
+
+    def write_gene_info(self) -> str:
+        """Write the test gene_info without its last gene and return its path."""
+        path = os.path.join(self.directory, 'gene_info')
+        with open(TEST_GENE_INFO_PATH) as file, open(path, 'w') as out:
+            out.writelines(file.readlines()[:-1])
+        return path
+
+    def populate(self, gene_info_url: str = TEST_GENE_INFO_PATH, **kwargs) -> None:
+        """Populate the manager with the test data."""
+        self.manager.populate(gene_info_url=gene_info_url, homologene_url=TEST_HOMOLOGENE_PATH, **kwargs)
+
+    def test_make_data_version(self):
+        """Test the version only depends on the checksums and the species."""
+        stamps = dict(gene_info=get_source_stamp(TEST_GENE_INFO_PATH))
+        version = make_data_version(stamps, get_tax_ids(['9606', '10116', '9606']))
+        self.assertEqual(version, make_data_version(stamps, ['10116', '9606']))
+        self.assertNotEqual(version, make_data_version(stamps, None))
+
+        unknown = dict(gene_info=get_source_stamp('https://example.com/gene_info.gz'))
+        self.assertNotEqual(make_data_version(unknown, None), make_data_version(unknown, None))
+
+    def test_populate(self):
+        """Test populating records a version, and populating again from the same sources is skipped."""
+        self.assertIsNone(self.manager.check_data_version())
+        self.populate()
+
+        data_version = self.manager.get_data_version()
+        self.assertEqual(data_version.version, self.manager.check_data_version())
+        self.assertEqual(3, data_version.to_json()['counts']['genes'])
+        self.assertEqual({'gene_info', 'homologene'}, set(data_version.get_sources()))
+        self.assertTrue(self.manager.is_up_to_date(gene_info_url=TEST_GENE_INFO_PATH,
+                                                   homologene_url=TEST_HOMOLOGENE_PATH))
+
+        with mock.patch.object(self.manager, 'populate_gene_info') as populate_gene_info:
+            self.populate()
+        populate_gene_info.assert_not_called()
+        self.assertEqual(1, self.manager.session.query(DataVersion).count())
+
+        self.assertFalse(self.manager.is_up_to_date(gene_info_url=TEST_GENE_INFO_PATH,
+                                                    homologene_url=TEST_HOMOLOGENE_PATH,
+                                                    tax_id_filter=None))
+
+        path = self.write_gene_info()
+        self.assertFalse(self.manager.is_up_to_date(gene_info_url=path, homologene_url=TEST_HOMOLOGENE_PATH))
+
+    def test_populate_other_sources(self):
+        """Test populating a database loaded from other sources swaps in new tables instead of appending."""
+        self.populate(tax_id_filter=None)
+        version = self.manager.check_data_version()
+
+        # the new tables would be too small, so the live ones are kept
+        self.populate(tax_id_filter=['9606'])
+        self.assertEqual(3, self.manager.count_genes())
+        self.assertEqual(version, self.manager.check_data_version())
+
+        self.populate(gene_info_url=self.write_gene_info(), tax_id_filter=None, use_bulk=False)
+        self.assertEqual(2, self.manager.count_genes())
+        self.assertNotEqual(version, self.manager.check_data_version())
+
+        self.manager.rollback()
+        self.assertEqual(3, self.manager.count_genes())
+        self.assertEqual(version, self.manager.check_data_version())
+
+    def test_stamps_revalidated(self):
+        """Test the sources are revalidated when stamping a load that downloaded the latest releases."""
+        self.populate()
+        path = self.write_gene_info()
+
+        for method in (self.manager.update, self.manager.reload):
+            with self.subTest(method=method.__name__):
+                with mock.patch('bio2bel_entrez.manager.download_sources', wraps=download_sources) as mocked:
+                    method(gene_info_url=path, homologene_url=TEST_HOMOLOGENE_PATH, force_download=True)
+                self.assertTrue(mocked.call_args[1]['check'])
+
+    def test_reload_rollback(self):
+        """Test rolling back restores the version of the previous generation and empties the caches."""
+        self.populate()
+        original = self.manager.check_data_version()
+        self.assertIsNotNone(self.manager.get_gene_by_entrez_id('116590'))
+
+        self.manager.reload(gene_info_url=self.write_gene_info(), homologene_url=TEST_HOMOLOGENE_PATH)
+        reloaded = self.manager.check_data_version()
+        self.assertNotEqual(original, reloaded)
+        self.assertEqual(2, self.manager.get_data_version().to_json()['counts']['genes'])
+        self.assertIsNone(self.manager.get_gene_by_entrez_id('116590'))
+
+        self.manager.rollback()
+        self.assertEqual(original, self.manager.check_data_version())
+        self.assertIsNotNone(self.manager.get_gene_by_entrez_id('116590'))
+
+        self.manager.rollback()
+        self.assertEqual(reloaded, self.manager.check_data_version())
+
+    def test_check_data_version(self):
+        """Test the caches of a manager are emptied when another manager loads a new version."""
+        self.populate()
+        self.manager.check_data_version()
+        self.assertIsNotNone(self.manager.get_gene_by_entrez_id('116590'))
+
+        other = Manager(connection=self.connection)
+        other.reload(gene_info_url=self.write_gene_info(), homologene_url=TEST_HOMOLOGENE_PATH)
+
+        self.manager.session.expire_all()
+        self.assertEqual(other.check_data_version(), self.manager.check_data_version())
+        self.assertIsNone(self.manager.get_gene_by_entrez_id('116590'))
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for downloading the source files."""
+
+import email.utils
+import gzip
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from unittest import mock
+
+import pandas as pd
+
+from bio2bel_entrez.download import Download, DownloadError, Source, download, download_sources, open_decompressed
+from tests.constants import TEST_GENE_INFO_PATH, TEST_HOMOLOGENE_PATH
+
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    """Serves files with support for conditional and range requests, optionally dropping the connection part way."""
+
+    def log_message(self, format, *args):  # noqa: D102
+        pass
+
+    def do_GET(self):  # noqa: D102,N802
+        self.server.requests.append(dict(self.headers))
+
+        path = os.path.join(self.server.directory, self.path.lstrip('/'))
+        mtime = int(os.stat(path).st_mtime)
+        last_modified = self.date_time_string(mtime)
+
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since and mtime <= email.utils.parsedate_to_datetime(if_modified_since).timestamp():
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        start = 0
+        if 'Range' in self.headers and self.headers.get('If-Range') == last_modified:
+            start = int(self.headers['Range'][len('bytes='):].split('-')[0])
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{len(data) - 1}/{len(data)}')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(data) - start))
+        self.send_header('Last-Modified', last_modified)
+        self.end_headers()
+
+        body = data[start:]
+        if self.server.limit is not None:
+            body, self.server.limit = body[:self.server.limit], None
+            self.close_connection = True
+        self.wfile.write(body)
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """An HTTP server that handles each request in a thread."""
+
+    daemon_threads = True
+
+
+class TestDownload(unittest.TestCase):
+    """Test downloading from a local HTTP server."""
+
+    def setUp(self):
+        """Serve a temporary directory and make another one to download to."""
+        self.remote_directory = tempfile.mkdtemp()
+        self.directory = tempfile.mkdtemp()
+
+        self.remote_path = os.path.join(self.remote_directory, 'gene_info.gz')
+        with open(TEST_GENE_INFO_PATH, 'rb') as file, gzip.open(self.remote_path, 'wb') as remote_file:
+            shutil.copyfileobj(file, remote_file)
+        shutil.copy(TEST_HOMOLOGENE_PATH, self.remote_directory)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), RangeRequestHandler)
+        self.server.directory = self.remote_directory
+        self.server.requests = []
+        self.server.limit = None
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.url = f'http://127.0.0.1:{self.server.server_port}/gene_info.gz'
+        self.path = os.path.join(self.directory, 'gene_info.gz')
+
+    def tearDown(self):
+        """Stop the server and remove the temporary directories."""
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.remote_directory)
+        shutil.rmtree(self.directory)
+
+    def read(self, path: str) -> bytes:
+        """Read a file."""
+        with open(path, 'rb') as file:
+            return file.read()
+
+    def update_remote(self) -> None:
+        """Change the remote file and move its modification time forward."""
+        with gzip.open(self.remote_path, 'wb') as file:
+            file.write(b'#tax_id\tGeneID\n9606\t5594\n')
+        mtime = os.stat(self.remote_path).st_mtime + 10
+        os.utime(self.remote_path, (mtime, mtime))
+
+    def test_download(self):
+        """Test a file is only downloaded again when it changed on the server."""
+        result = download(self.url, self.path)
+        self.assertEqual('downloaded', result.status)
+        self.assertEqual(self.read(self.remote_path), self.read(self.path))
+        self.assertEqual(hashlib.md5(self.read(self.remote_path)).hexdigest(), result.md5)
+        self.assertEqual(int(os.stat(self.remote_path).st_mtime), os.stat(self.path).st_mtime)
+
+        self.assertEqual('cached', download(self.url, self.path).status)
+        self.assertEqual(1, len(self.server.requests))
+
+        result = download(self.url, self.path, check=True)
+        self.assertEqual('not_modified', result.status)
+        self.assertIn('If-Modified-Since', self.server.requests[-1])
+        self.assertIsNotNone(result.md5)
+
+        self.update_remote()
+        self.assertEqual('downloaded', download(self.url, self.path, check=True).status)
+        self.assertEqual(self.read(self.remote_path), self.read(self.path))
+
+    def test_resume(self):
+        """Test an interrupted download resumes where it stopped."""
+        self.server.limit = 100
+        with self.assertRaises(DownloadError):
+            download(self.url, self.path)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(100, os.path.getsize(f'{self.path}.part'))
+
+        result = download(self.url, self.path)
+        self.assertEqual('resumed', result.status)
+        self.assertEqual('bytes=100-', self.server.requests[-1]['Range'])
+        self.assertEqual(self.read(self.remote_path), self.read(self.path))
+        self.assertEqual(hashlib.md5(self.read(self.remote_path)).hexdigest(), result.md5)
+        self.assertFalse(os.path.exists(f'{self.path}.part'))
+
+    def test_resume_changed(self):
+        """Test an interrupted download starts over if the file changed on the server."""
+        self.server.limit = 100
+        with self.assertRaises(DownloadError):
+            download(self.url, self.path)
+
+        self.update_remote()
+        self.assertEqual('downloaded', download(self.url, self.path).status)
+        self.assertEqual(self.read(self.remote_path), self.read(self.path))
+
+    def test_checksum(self):
+        """Test a download with the wrong checksum is discarded."""
+        with self.assertRaises(DownloadError):
+            download(self.url, self.path, md5='0' * 32)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(f'{self.path}.part'))
+
+    def test_download_sources(self):
+        """Test downloading several files at once."""
+        sources = {
+            'gene_info': Source(self.url, self.path),
+            'homologene': Source(
+                f'http://127.0.0.1:{self.server.server_port}/homologene.data',
+                os.path.join(self.directory, 'homologene.data'),
+            ),
+        }
+        results = download_sources(sources)
+        self.assertEqual({'downloaded'}, {result.status for result in results.values()})
+        self.assertEqual(self.read(TEST_HOMOLOGENE_PATH), self.read(results['homologene'].path))
+
+    def read_df(self, pigz=None) -> pd.DataFrame:
+        """Parse the file while it is downloaded, decompressing it with the given executable."""
+        with mock.patch('bio2bel_entrez.download.get_pigz', return_value=pigz):
+            with Download(self.url, self.path, check=True) as source:
+                return pd.read_csv(source.open(), sep='\t', dtype=str)
+
+    def test_stream(self):
+        """Test parsing a file while it is downloaded, then parsing the downloaded file."""
+        expected = pd.read_csv(TEST_GENE_INFO_PATH, sep='\t', dtype=str)
+        for pigz in (None, shutil.which('pigz') or shutil.which('gzip')):
+            with self.subTest(pigz=pigz):
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                self.assertEqual(expected.values.tolist(), self.read_df(pigz).values.tolist())
+                self.assertEqual(self.read(self.remote_path), self.read(self.path))
+
+                with Download(self.url, self.path, check=True) as source:
+                    self.assertTrue(source.is_current)
+                with mock.patch('bio2bel_entrez.download.get_pigz', return_value=pigz):
+                    with open_decompressed(self.path) as file:
+                        self.assertEqual(expected.values.tolist(), pd.read_csv(file, sep='\t', dtype=str).values.tolist())
+
+    def test_stream_interrupted(self):
+        """Test the error of an interrupted download is raised to the reader."""
+        self.server.limit = 100
+        with self.assertRaises(DownloadError):
+            self.read_df()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertTrue(os.path.exists(f'{self.path}.part'))
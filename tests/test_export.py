@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for exporting genes."""
+
+import io
+import json
+
+import pandas as pd
+
+from bio2bel_entrez.export import export_genes
+from bio2bel_entrez.models import GeneRecord
+from tests.cases import PopulatedDatabaseMixin
+
+
+class TestExport(PopulatedDatabaseMixin):
+    """Test exporting genes."""
+
+    def test_iter_genes_table(self):
+        """Test that paging by primary key gives every gene once."""
+        dfs = list(self.manager.iter_genes_table(chunksize=2))
+        self.assertEqual([2, 1], [len(df.index) for df in dfs])
+
+        genes = [GeneRecord(*row) for df in dfs for row in df.itertuples(index=False)]
+        self.assertEqual(sorted(self.manager.list_genes(records=True)), sorted(genes))
+
+        df, = self.manager.iter_genes_table(tax_id_filter=['10116'])
+        self.assertEqual(['116590'], list(df['entrez_id']))
+
+    def test_formats(self):
+        """Test writing each format."""
+        for fmt in ('tsv', 'jsonl', 'parquet'):
+            with self.subTest(format=fmt):
+                file = io.BytesIO()
+                self.assertEqual(3, export_genes(self.manager, file, fmt=fmt, chunksize=2))
+                file.seek(0)
+
+                if fmt == 'tsv':
+                    df = pd.read_csv(file, sep='\t', dtype=str)
+                elif fmt == 'jsonl':
+                    df = pd.DataFrame([json.loads(line) for line in file])
+                else:
+                    df = pd.read_parquet(file)
+
+                self.assertEqual(list(GeneRecord._fields), list(df.columns))
+                self.assertEqual({'5594', '116590', '3354888'}, set(df['entrez_id']))
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the locations of genes."""
+
+import random
+import unittest
+
+from bio2bel_entrez.locations import Location, LocationIndex
+from bio2bel_entrez.parser import iter_gene_location_chunks
+from tests.cases import PopulatedDatabaseMixin
+from tests.constants import TEST_GENE2REFSEQ_PATH
+
+chromosome_22 = 'NC_000022.11'
+
+
+class TestLocationIndex(unittest.TestCase):
+    """Test the interval index."""
+
+    def setUp(self):
+        """Index a few genes on two accessions."""
+        self.index = LocationIndex.from_locations([
+            Location('1', 'a', 0, 99, '+'),
+            Location('2', 'a', 50, 1049, '-'),  # the longest gene
+            Location('3', 'a', 1100, 1199, '+'),
+            Location('4', 'a', 1300, 1399, '+'),
+            Location('5', 'b', 0, 9, '+'),
+        ])
+
+    def test_overlapping(self):
+        """Test finding the genes overlapping a region."""
+        for start, end, expected in [
+            (0, 10, ['1']),
+            (60, 70, ['1', '2']),
+            (1000, 1000, ['2']),
+            (1050, 1099, []),
+            (1000, 1350, ['2', '3', '4']),
+            (2000, 3000, []),
+        ]:
+            with self.subTest(start=start, end=end):
+                locations = self.index.get_overlapping('a', start, end)
+                self.assertEqual(expected, [location.entrez_id for location in locations])
+
+        self.assertEqual([], self.index.get_overlapping('c', 0, 10))
+
+    def test_nearest(self):
+        """Test finding the gene nearest to a position."""
+        for position, expected in [(75, '1'), (1060, '2'), (1090, '3'), (1249, '3'), (1250, '4'), (5000, '4')]:
+            with self.subTest(position=position):
+                self.assertEqual(expected, self.index.get_nearest('a', position).entrez_id)
+
+        self.assertIsNone(self.index.get_nearest('c', 0))
+
+    def test_random(self):
+        """Test the interval tree against a linear scan, with a very long gene among short ones."""
+        rng = random.Random(0)
+        for size in (1, 2, 3, 7, 8, 100):
+            locations = [Location('0', 'a', 10, 1_000_000, '+')]
+            for i in range(1, size):
+                start = rng.randrange(0, 100_000)
+                locations.append(Location(str(i), 'a', start, start + rng.randrange(0, 1_000), '+'))
+            index = LocationIndex.from_locations(locations)
+
+            for _ in range(50):
+                start = rng.randrange(-10, 1_100_000)
+                end = start + rng.randrange(0, 5_000)
+                with self.subTest(size=size, start=start, end=end):
+                    expected = sorted(
+                        (location for location in locations
+                         if location.start_position <= end and start <= location.end_position),
+                        key=lambda location: (location.start_position, location.end_position, location.entrez_id),
+                    )
+                    self.assertEqual(expected, index.get_overlapping('a', start, end))
+
+
+class TestPopulateLocations(PopulatedDatabaseMixin):
+    """Test loading the locations of genes from gene2refseq."""
+
+    def test_parse(self):
+        """Test that repeated locations are dropped even when the rows of a gene are split across chunks."""
+        expected = sorted(
+            tuple(row)
+            for df in iter_gene_location_chunks(TEST_GENE2REFSEQ_PATH, tax_id_filter=['9606'])
+            for row in df.itertuples(index=False)
+        )
+        self.assertEqual(['5594', '5595', '8940', '9647'], [row[1] for row in expected])
+
+        chunked = sorted(
+            tuple(row)
+            for df in iter_gene_location_chunks(TEST_GENE2REFSEQ_PATH, tax_id_filter=['9606'], chunksize=2)
+            for row in df.itertuples(index=False)
+        )
+        self.assertEqual(expected, chunked)
+
+    def test_populate(self):
+        """Test loading locations and querying them."""
+        self.assertEqual(7, self.manager.populate_gene_locations(url=TEST_GENE2REFSEQ_PATH))
+        self.assertEqual(5, self.manager.populate_gene_locations(url=TEST_GENE2REFSEQ_PATH,
+                                                                 tax_id_filter=['9606', '7227']))
+        self.assertEqual(7, self.manager.count_gene_locations())
+
+        locations = self.manager.get_genes_overlapping(chromosome_22, 21_800_000, 21_930_000)
+        self.assertEqual(['5594', '9647'], [location.entrez_id for location in locations])
+
+        self.assertEqual('5594', self.manager.get_nearest_gene(chromosome_22, 21_000_000).entrez_id)
+        self.assertEqual('8940', self.manager.get_nearest_gene(chromosome_22, 21_955_000).entrez_id)
+
+        self.manager.build_location_index(tax_id_filter=['10116'])
+        self.assertEqual([], self.manager.get_genes_overlapping(chromosome_22, 0, 30_000_000))
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for looking up genes."""
+
+from pybel import BELGraph
+from pybel.dsl import gene, protein
+from tests.cases import PopulatedDatabaseMixin
+
+
+class TestLookup(PopulatedDatabaseMixin):
+    """Test looking up genes."""
+
+    def test_get_genes_by_entrez_ids(self):
+        """Test getting several genes by their Entrez Gene identifiers."""
+        genes = self.manager.get_genes_by_entrez_ids(['5594', '116590', '1'])
+        self.assertEqual({'5594', '116590'}, set(genes))
+        self.assertEqual('MAPK1', genes['5594'].name)
+
+    def test_lookup_nodes(self):
+        """Test looking up several nodes at once."""
+        human_gene = gene(namespace='ncbigene', identifier='5594')
+        human_protein = protein(namespace='EGID', name='5594')
+        rat_gene = gene(namespace='ncbigene', name='Mapk1', identifier='116590')
+        missing_gene = gene(namespace='ncbigene', identifier='1')
+        other_gene = gene(namespace='FOO', name='5594')
+
+        graph = BELGraph()
+        for node in (human_gene, human_protein, rat_gene, missing_gene, other_gene):
+            graph.add_node_from_data(node)
+
+        genes = self.manager.lookup_nodes(graph)
+        self.assertEqual({human_gene, human_protein, rat_gene}, set(genes))
+        self.assertEqual('5594', genes[human_protein].entrez_id)
+        self.assertEqual(genes, dict(self.manager.iter_genes(graph)))
+        self.assertEqual(genes[rat_gene], self.manager.lookup_node(rat_gene))
+
+    def test_get_genes_by_symbols(self):
+        """Test getting several genes by their symbols, case insensitively."""
+        genes = self.manager.get_genes_by_symbols('9606', ['MAPK1', 'mapk1', 'Mapk1', 'MAPK2'])
+        self.assertEqual({'MAPK1', 'mapk1', 'Mapk1'}, set(genes))
+        self.assertTrue(all(gene.entrez_id == '5594' for gene in genes.values()))
+
+        self.assertEqual('116590', self.manager.get_gene_by_symbol('10116', 'MAPK1').entrez_id)
+        self.assertIsNone(self.manager.get_gene_by_symbol('10090', 'Mapk1'))
+        self.assertEqual({'5594', '116590'}, {gene.entrez_id for gene in self.manager.get_genes_by_name('mapk1')})
+
+    def test_lookup_symbol_nodes(self):
+        """Test looking up nodes in the namespaces of nomenclature consortia."""
+        hgnc_node = protein(namespace='HGNC', name='MAPK1')
+        rgd_node = gene(namespace='RGD', name='Mapk1')
+        flybase_node = gene(namespace='FLYBASE', name='rl')
+        mgi_node = gene(namespace='MGI', name='Mapk1')
+
+        genes = self.manager.lookup_nodes([hgnc_node, rgd_node, flybase_node, mgi_node])
+        self.assertEqual(
+            {hgnc_node: '5594', rgd_node: '116590', flybase_node: '3354888'},
+            {node: gene.entrez_id for node, gene in genes.items()},
+        )
+
+    def test_xrefs(self):
+        """Test mapping database cross-references to Entrez Gene identifiers."""
+        genes = self.manager.get_genes_by_xref('Ensembl', 'ENSG00000100030')
+        self.assertEqual(['5594'], [gene.entrez_id for gene in genes])
+
+        values = ['ENSG00000100030', 'ENSRNOG00000001849', 'ENSG00000000000']
+        expected = {'ENSG00000100030': ['5594'], 'ENSRNOG00000001849': ['116590']}
+        self.assertEqual(expected, self.manager.map_xrefs('Ensembl', values))
+        self.assertEqual({'HGNC:6871': ['5594']}, self.manager.map_xrefs('HGNC', ['HGNC:6871']))
+
+        self.manager.build_xref_index(['Ensembl'])
+        self.assertIn('Ensembl', self.manager.xref_index)
+        self.assertNotIn('HGNC', self.manager.xref_index)
+        self.assertEqual(expected, self.manager.map_xrefs('Ensembl', values))
+
+    def test_records(self):
+        """Test that gene records match the models they are read from."""
+        model = self.manager.get_gene_by_entrez_id('5594')
+        record = self.manager.get_gene_by_entrez_id('5594', records=True)
+        self.assertEqual(model.to_json(), record.to_json())
+        self.assertEqual(model.as_bel(), record.as_bel())
+        self.assertEqual(model.bel_encoding, record.bel_encoding)
+        self.assertEqual('9606', record.taxonomy_id)
+        self.assertEqual(model.homologene.homologene_id, record.homologene_id)
+        self.assertIsNone(self.manager.get_gene_by_entrez_id('1', records=True))
+
+        self.assertEqual(
+            sorted(gene.entrez_id for gene in self.manager.list_genes()),
+            sorted(record.entrez_id for record in self.manager.list_genes(records=True)),
+        )
+
+        node = protein(namespace='HGNC', name='MAPK1')
+        self.assertEqual(record, self.manager.lookup_node(node, records=True))
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the load metrics."""
+
+import time
+import unittest
+
+from bio2bel_entrez.metrics import LoadMetrics
+from tests.cases import PopulatedDatabaseMixin
+
+
+class TestLoadMetrics(unittest.TestCase):
+    """Test the load metrics."""
+
+    def test_nested_phases(self):
+        """Test that the time of a nested phase is not counted towards the phase around it."""
+        metrics = LoadMetrics()
+        with metrics.phase('outer', rows=3):
+            time.sleep(0.01)
+            with metrics.phase('inner'):
+                time.sleep(0.05)
+
+        self.assertLess(metrics.seconds['outer'], metrics.seconds['inner'])
+        self.assertEqual({'outer': 3}, metrics.rows)
+
+    def test_iter_phase(self):
+        """Test that getting elements is counted and the rows of each element are summed."""
+        metrics = LoadMetrics()
+        self.assertEqual([[1, 2], [3]], list(metrics.iter_phase('parse', [[1, 2], [3]], count=len)))
+        self.assertEqual(3, metrics.to_json()['phases']['parse']['rows'])
+
+
+class TestPopulateMetrics(PopulatedDatabaseMixin):
+    """Test the metrics of populating the database."""
+
+    def test_phases(self):
+        """Test that populating records the phases of the load and the genes per species."""
+        metrics = self.manager.load_metrics.to_json()
+
+        for name in ('parse', 'filter', 'prepare', 'insert', 'commit', 'homologene_parse', 'homologene_insert'):
+            with self.subTest(phase=name):
+                self.assertIn(name, metrics['phases'])
+
+        self.assertEqual(self.manager.count_genes(), sum(metrics['species'].values()))
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for migrating to integer identifier columns."""
+
+from unittest import mock
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, MetaData, String, Table, Text, inspect
+
+from bio2bel.testing import TemporaryConnectionMethodMixin
+from bio2bel_entrez import Manager
+from bio2bel_entrez.migration import get_string_key_columns, migrate_to_integer_keys
+from bio2bel_entrez.swap import StagingValidationError
+
+#: A copy of the schema of the released package, before the identifiers were integers and genes had lower case symbols
+old_metadata = MetaData()
+old_species = Table(
+    'ncbigene_species', old_metadata,
+    Column('id', Integer, primary_key=True),
+    Column('taxonomy_id', String(32), unique=True, nullable=False, index=True),
+)
+old_homologene = Table(
+    'ncbigene_homologene', old_metadata,
+    Column('id', Integer, primary_key=True),
+    Column('homologene_id', String(255), index=True, unique=True, nullable=False),
+)
+old_gene = Table(
+    'ncbigene_gene', old_metadata,
+    Column('id', Integer, primary_key=True),
+    Column('species_id', Integer, ForeignKey('ncbigene_species.id'), index=True),
+    Column('entrez_id', String(32), nullable=False, index=True),
+    Column('name', String(255)),
+    Column('description', Text),
+    Column('type_of_gene', String(32)),
+    Column('homologene_id', Integer, ForeignKey('ncbigene_homologene.id')),
+    Index('species-name-index', 'species_id', 'name'),
+)
+old_xref = Table(
+    'ncbigene_xref', old_metadata,
+    Column('id', Integer, primary_key=True),
+    Column('gene_id', Integer, ForeignKey('ncbigene_gene.id'), index=True),
+    Column('database', String(64), index=True),
+    Column('value', String(255)),
+    Index('gene-database-value-index', 'gene_id', 'database', 'value'),
+)
+
+
+class TestMigration(TemporaryConnectionMethodMixin):
+    """Test migrating a database with the schema of the released package."""
+
+    def make_manager(self) -> Manager:
+        """Make a manager whose database has the old schema."""
+        manager = Manager(connection=self.connection)
+        manager.drop_all()
+        old_metadata.create_all(manager.engine)
+
+        manager.engine.execute(old_species.insert(), [dict(id=1, taxonomy_id='9606'), dict(id=2, taxonomy_id='10116')])
+        manager.engine.execute(old_homologene.insert(), [dict(id=1, homologene_id='37670')])
+        manager.engine.execute(old_gene.insert(), [
+            dict(id=1, entrez_id='5594', name='MAPK1', species_id=1, homologene_id=1),
+            dict(id=2, entrez_id='116590', name='Mapk1', species_id=2, homologene_id=1),
+        ])
+        manager.engine.execute(old_xref.insert(), [dict(id=1, gene_id=1, database='HGNC', value='HGNC:6871')])
+        return manager
+
+    def get_table_names(self, manager: Manager, suffix: str):
+        """Get the names of the tables with the given suffix."""
+        return [name for name in inspect(manager.engine).get_table_names() if name.endswith(suffix)]
+
+    def test_migrate(self):
+        """Test that the string identifier columns are migrated and the API still uses strings."""
+        manager = self.make_manager()
+
+        self.assertEqual(
+            {
+                'ncbigene_species': ['taxonomy_id'],
+                'ncbigene_homologene': ['homologene_id'],
+                'ncbigene_gene': ['entrez_id'],
+            },
+            get_string_key_columns(manager.engine),
+        )
+
+        counts = migrate_to_integer_keys(manager.engine)
+        self.assertEqual(dict(genes=2, species=2, homologenes=1), counts)
+        self.assertEqual({}, get_string_key_columns(manager.engine))
+        self.assertEqual({}, migrate_to_integer_keys(manager.engine))
+        self.assertEqual([], self.get_table_names(manager, '_staging'))
+
+        gene_model = manager.get_gene_by_entrez_id('5594')
+        self.assertEqual('5594', gene_model.entrez_id)
+        self.assertEqual('9606', gene_model.species.taxonomy_id)
+        self.assertEqual('37670', gene_model.homologene.homologene_id)
+        self.assertEqual(['116590'], [ortholog.entrez_id for ortholog in manager.get_orthologs('5594')])
+        self.assertIsNone(manager.get_gene_by_entrez_id('MAPK1'))
+
+        # the lower case symbols that were added since are filled in
+        self.assertEqual('116590', manager.get_gene_by_symbol('10116', 'MAPK1').entrez_id)
+        self.assertEqual(['5594'], [gene.entrez_id for gene in manager.get_genes_by_xref('HGNC', 'HGNC:6871')])
+
+        manager.get_or_create_species('10090')
+        manager.session.commit()
+        self.assertEqual(3, manager.count_species())
+
+    def test_migrate_failed(self):
+        """Test that the staging tables are dropped and the old tables are kept if the migration fails."""
+        manager = self.make_manager()
+
+        with mock.patch('bio2bel_entrez.migration.count_tables', side_effect=[dict(genes=1), dict(genes=2)]):
+            with self.assertRaises(StagingValidationError):
+                migrate_to_integer_keys(manager.engine)
+
+        self.assertEqual([], self.get_table_names(manager, '_staging'))
+        self.assertEqual(['entrez_id'], get_string_key_columns(manager.engine)['ncbigene_gene'])
@@ -139,3 +139,25 @@ class TestOrthologs(PopulatedDatabaseMixin):
         graph = BELGraph()
         graph.add_node_from_data(hgnc_node)
         self.help_test_enrich_orthologs_on_hgnc(graph, hgnc_node)
+
+        # the HGNC node resolves to the human gene, which is not orthologous to itself
+        self.assertNotIn(human_entrez_node, graph)
+        self.assertEqual({rat_entrez_id, '3354888'}, {node.identifier for node in graph[hgnc_node]})
+
+    def test_get_orthologs(self):
+        """Test getting the orthologs of a gene."""
+        orthologs = self.manager.get_orthologs(human_entrez_id)
+        self.assertEqual({'116590', '3354888'}, {ortholog.entrez_id for ortholog in orthologs})
+
+        orthologs = self.manager.get_orthologs(human_entrez_id, tax_id_filter=['10116'])
+        self.assertEqual([rat_entrez_id], [ortholog.entrez_id for ortholog in orthologs])
+
+    def test_enrich_orthologs_species_filter(self):
+        """Test enriching orthologs from only some species."""
+        graph = BELGraph()
+        node = gene(namespace=MODULE_NAME, identifier=human_entrez_id)
+        graph.add_node_from_data(node)
+
+        self.manager.enrich_orthologies(graph, tax_id_filter=['10116'])
+        self.assertIn(rat_entrez_node, graph[node])
+        self.assertEqual(1, graph.number_of_edges() // 2)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the parsers."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from bio2bel_entrez.parser import iter_gene2refseq_chunks, iter_gene_info_chunks
+from tests.constants import TEST_GENE2REFSEQ_PATH, TEST_GENE_INFO_PATH
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:
+    pyarrow = None
+
+
+@unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+class TestGeneInfoCache(unittest.TestCase):
+    """Test the Parquet cache of gene_info."""
+
+    def setUp(self):
+        """Copy the test data to a temporary directory."""
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'gene_info')
+        shutil.copy(TEST_GENE_INFO_PATH, self.path)
+        self.cache_path = os.path.join(self.directory, 'gene_info.parquet')
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.directory)
+
+    def get_df(self, **kwargs) -> pd.DataFrame:
+        """Read all chunks into a single data frame."""
+        chunks = iter_gene_info_chunks(url=self.path, cache_path=self.cache_path, chunksize=1, **kwargs)
+        return pd.concat(list(chunks)).sort_values('GeneID').reset_index(drop=True)
+
+    def test_cache(self):
+        """Test the cache is written on the first pass and gives the same data on the second pass."""
+        self.assertFalse(os.path.exists(self.cache_path))
+        expected = self.get_df(use_cache=False)
+        self.assertEqual(3, len(expected.index))
+
+        self.assertEqual(expected.values.tolist(), self.get_df().values.tolist())
+        self.assertTrue(os.path.exists(os.path.join(self.cache_path, 'tax_id=9606')))
+
+        cached = self.get_df()
+        self.assertEqual('category', cached['type_of_gene'].dtype.name)
+        self.assertEqual(expected.values.tolist(), cached.values.tolist())
+
+        filtered = self.get_df(tax_id_filter={'9606', '10116'})
+        self.assertEqual(['116590', '5594'], filtered['GeneID'].tolist())
+
+    def test_invalidate(self):
+        """Test the cache is rebuilt when the source file changes."""
+        self.get_df()
+
+        df = pd.read_csv(self.path, sep='\t', dtype=str)
+        df[df['#tax_id'] == '9606'].to_csv(self.path, sep='\t', index=False)
+
+        self.assertEqual(['5594'], self.get_df()['GeneID'].tolist())
+        self.assertFalse(os.path.exists(os.path.join(self.cache_path, 'tax_id=10116')))
+
+
+@unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+class TestGene2refseqCache(unittest.TestCase):
+    """Test the per-species Parquet cache of gene2refseq."""
+
+    def setUp(self):
+        """Copy the test data to a temporary directory."""
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'gene2refseq')
+        shutil.copy(TEST_GENE2REFSEQ_PATH, self.path)
+        self.cache_path = os.path.join(self.directory, 'gene2refseq.parquet')
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.directory)
+
+    def get_df(self, **kwargs) -> pd.DataFrame:
+        """Read all chunks into a single data frame."""
+        chunks = iter_gene2refseq_chunks(url=self.path, cache_path=self.cache_path, chunksize=2, **kwargs)
+        return pd.concat(list(chunks)).reset_index(drop=True)
+
+    def test_cache(self):
+        """Test that the kept species are cached in one pass and read back filtered."""
+        expected = self.get_df(tax_id_filter={'9606', '10116'}, use_cache=False)
+        self.assertEqual({'9606', '10116'}, set(expected['#tax_id']))
+
+        self.assertEqual(expected.values.tolist(), self.get_df(tax_id_filter={'9606', '10116'}).values.tolist())
+        self.assertEqual(['tax_id=10116', 'tax_id=9606'], sorted(
+            name for name in os.listdir(self.cache_path) if name.startswith('tax_id=')
+        ))
+
+        part_path = os.path.join(self.cache_path, 'tax_id=10116', 'part-000000.parquet')
+        mtime = os.stat(part_path).st_mtime_ns
+        self.assertEqual(['116590'], self.get_df(tax_id_filter={'10116'})['GeneID'].tolist())
+        self.assertEqual(mtime, os.stat(part_path).st_mtime_ns, msg='fewer species should not rebuild the cache')
+
+        assemblies = self.get_df(tax_id_filter={'9606'}, assembly_filter={'Reference GRCh38.p14 Primary Assembly'})
+        self.assertEqual(['5594', '5594', '5595', '8940', '9647', '9647'], assemblies['GeneID'].tolist())
+
+    def test_more_species(self):
+        """Test that the cache is rebuilt when more species are asked for than were cached."""
+        self.get_df(tax_id_filter={'10116'})
+        self.assertEqual({'9606', '10116'}, set(self.get_df(tax_id_filter={'9606', '10116'})['#tax_id']))
+        self.assertTrue(os.path.exists(os.path.join(self.cache_path, 'tax_id=9606')))
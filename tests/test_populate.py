@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for populating the database."""
+
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+from sqlalchemy import inspect
+
+from bio2bel.testing import TemporaryConnectionMethodMixin
+from bio2bel_entrez import Manager
+from bio2bel_entrez.bulk import homologene_member_table, live_tables
+from bio2bel_entrez.models import Gene
+from bio2bel_entrez.swap import StagingValidationError
+from tests.constants import TEST_GENE_INFO_PATH, TEST_HOMOLOGENE_PATH
+
+
+def _get_contents(manager: Manager):
+    return sorted(
+        (
+            gene.entrez_id,
+            gene.name,
+            gene.description,
+            gene.type_of_gene,
+            gene.species.taxonomy_id,
+            gene.homologene and gene.homologene.homologene_id,
+            sorted((xref.database, xref.value) for xref in gene.xrefs),
+        )
+        for gene in manager.session.query(Gene)
+    )
+
+
+def _get_rows(manager: Manager):
+    """Get all rows of all tables, including the primary keys."""
+    return {
+        table.name: manager.session.execute(table.select().order_by(*table.primary_key.columns)).fetchall()
+        for table in live_tables
+    }
+
+
+class TestPopulate(TemporaryConnectionMethodMixin):
+    """Test the different ways of populating the database."""
+
+    def setUp(self):
+        """Make a temporary directory for modified data."""
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.directory)
+        super().tearDown()
+
+    def make_manager(self, **kwargs) -> Manager:
+        """Make a manager populated with the test data."""
+        kwargs.setdefault('gene_info_url', TEST_GENE_INFO_PATH)
+        kwargs.setdefault('homologene_url', TEST_HOMOLOGENE_PATH)
+        manager = Manager(connection=self.connection)
+        manager.populate(**kwargs)
+        return manager
+
+    def test_bulk_matches_orm(self):
+        """Test the bulk loader gives the same contents as the ORM loader."""
+        manager = self.make_manager(use_bulk=False)
+        expected = _get_contents(manager)
+        self.assertEqual(3, len(expected))
+        manager.drop_all()
+        manager.create_all()
+
+        manager = self.make_manager(use_bulk=True)
+        self.assertEqual(expected, _get_contents(manager))
+
+    def test_chunked_matches_whole(self):
+        """Test that streaming gene_info in small chunks gives the same contents as a single chunk."""
+        for use_bulk in (True, False):
+            with self.subTest(use_bulk=use_bulk):
+                manager = self.make_manager(use_bulk=use_bulk)
+                expected = _get_contents(manager)
+                manager.drop_all()
+                manager.create_all()
+
+                manager = self.make_manager(use_bulk=use_bulk, chunksize=1)
+                self.assertEqual(expected, _get_contents(manager))
+                manager.drop_all()
+                manager.create_all()
+
+    def test_parallel_matches_serial(self):
+        """Test that preparing species in worker processes gives exactly the same rows as the serial loader."""
+        for chunksize in (None, 1):
+            with self.subTest(chunksize=chunksize):
+                manager = self.make_manager(chunksize=chunksize)
+                expected = _get_rows(manager)
+                self.assertEqual(3, len(expected['ncbigene_gene']))
+                manager.drop_all()
+                manager.create_all()
+
+                manager = self.make_manager(chunksize=chunksize, workers=2)
+                self.assertEqual(expected, _get_rows(manager))
+                manager.drop_all()
+                manager.create_all()
+
+    def write_gene_info(self, df: pd.DataFrame) -> str:
+        """Write a modified gene_info to the temporary directory."""
+        path = os.path.join(self.directory, 'gene_info')
+        df.to_csv(path, sep='\t', index=False)
+        return path
+
+    def test_update(self):
+        """Test that updating to a new release gives the same contents as populating from it."""
+        df = pd.read_csv(TEST_GENE_INFO_PATH, sep='\t', dtype=str)
+        df = df[df['GeneID'] != '116590']  # discontinue the rat gene
+        df.loc[df['GeneID'] == '5594', 'description'] = 'new description'
+        df.loc[df['GeneID'] == '3354888', 'dbXrefs'] = 'FLYBASE:FBgn0003256|Ensembl:FBgn0003256'
+        new_row = df[df['GeneID'] == '5594'].assign(GeneID='5595', Symbol='MAPK3', dbXrefs='HGNC:HGNC:6877')
+        path = self.write_gene_info(pd.concat([df, new_row]))
+
+        manager = self.make_manager(gene_info_url=path)
+        expected = _get_contents(manager)
+        manager.drop_all()
+        manager.create_all()
+
+        manager = self.make_manager()
+        rv = manager.update(gene_info_url=path, homologene_url=TEST_HOMOLOGENE_PATH, chunksize=2)
+        self.assertEqual(dict(inserted=1, updated=2, deleted=1, deleted_homologenes=0), rv)
+        self.assertEqual(expected, _get_contents(manager))
+
+        rv = manager.update(gene_info_url=path, homologene_url=TEST_HOMOLOGENE_PATH)
+        self.assertEqual(dict(inserted=0, updated=0, deleted=0, deleted_homologenes=0), rv)
+
+    def test_reload(self):
+        """Test swapping in a new generation of tables and rolling back."""
+        manager = self.make_manager()
+        original = _get_contents(manager)
+
+        df = pd.read_csv(TEST_GENE_INFO_PATH, sep='\t', dtype=str)
+        path = self.write_gene_info(df[df['GeneID'] != '116590'])
+
+        counts = manager.reload(gene_info_url=path, homologene_url=TEST_HOMOLOGENE_PATH)
+        self.assertEqual(dict(genes=2, species=2, homologenes=1), counts)
+        self.assertEqual(counts, manager.summarize())
+        reloaded = _get_contents(manager)
+        self.assertEqual([row for row in original if row[0] != '116590'], reloaded)
+
+        manager.rollback()
+        self.assertEqual(original, _get_contents(manager))
+
+        manager.rollback()
+        self.assertEqual(reloaded, _get_contents(manager))
+
+        # a second reload drops the oldest generation and reuses the staging names
+        manager.reload(gene_info_url=TEST_GENE_INFO_PATH, homologene_url=TEST_HOMOLOGENE_PATH)
+        self.assertEqual(original, _get_contents(manager))
+
+    def test_reload_validation(self):
+        """Test that a new generation that shrinks too much is not swapped in."""
+        manager = self.make_manager()
+        original = _get_contents(manager)
+
+        df = pd.read_csv(TEST_GENE_INFO_PATH, sep='\t', dtype=str)
+        path = self.write_gene_info(df[df['GeneID'] == '5594'])
+
+        with self.assertRaises(StagingValidationError):
+            manager.reload(gene_info_url=path, homologene_url=TEST_HOMOLOGENE_PATH, min_ratio=0.9)
+        self.assertEqual(original, _get_contents(manager))
+
+    def test_homologene_scratch_table(self):
+        """Test that loading HomoloGene does not touch the scratch rows of another connection."""
+        manager = self.make_manager()
+
+        with manager.engine.connect() as connection:
+            homologene_member_table.create(connection)
+            connection.execute(homologene_member_table.insert(), entrez_id='1', homologene_id=1)
+
+            manager.reload(gene_info_url=TEST_GENE_INFO_PATH, homologene_url=TEST_HOMOLOGENE_PATH)
+
+            self.assertEqual([('1', 1)], connection.execute(homologene_member_table.select()).fetchall())
+            self.assertNotIn(homologene_member_table.name, inspect(manager.engine).get_table_names())
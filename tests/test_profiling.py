@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for profiling the read methods."""
+
+from pybel import BELGraph
+from pybel.dsl import gene
+from tests.cases import PopulatedDatabaseMixin
+
+
+class TestProfiling(PopulatedDatabaseMixin):
+    """Test profiling the read methods."""
+
+    def tearDown(self):
+        """Stop profiling."""
+        self.manager.stop_profiling()
+        super().tearDown()
+
+    def test_profile(self):
+        """Test that statements, rows, and calls are counted cumulatively per method."""
+        graph = BELGraph()
+        graph.add_node_from_data(gene(namespace='HGNC', name='MAPK1'))
+        graph.add_node_from_data(gene(namespace='ncbigene', identifier='116590'))
+
+        self.manager.session.expunge_all()
+        profiler = self.manager.start_profiling()
+        self.manager.enrich_orthologies(graph)
+        self.manager.lookup_node(gene(namespace='ncbigene', identifier='5594'))
+
+        stats = {method.name: method for method in profiler.get_stats()}
+        self.assertEqual(1, stats['enrich_orthologies'].calls)
+        self.assertEqual(1, stats['iter_genes'].calls)
+        self.assertEqual(2, stats['lookup_nodes'].calls)
+        self.assertLess(0, stats['iter_genes'].statements)
+        self.assertLess(stats['iter_genes'].statements, stats['enrich_orthologies'].statements)
+        self.assertLess(0, stats['enrich_orthologies'].rows)
+        self.assertIn('enrich_orthologies', profiler.report())
+
+        self.manager.stop_profiling()
+        self.manager.lookup_node(gene(namespace='ncbigene', identifier='5594'))
+        self.assertEqual(2, {method.name: method for method in profiler.get_stats()}['lookup_nodes'].calls)
+
+    def test_started_during_statement(self):
+        """Test that statements that started before profiling did are skipped."""
+        profiler = self.manager.start_profiling()
+        with self.manager.engine.connect() as connection:
+            profiler._after_cursor_execute(connection, None, 'SELECT 1', (), None, False)
+            self.assertEqual(1, connection.execute('SELECT 1').scalar())
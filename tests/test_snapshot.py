@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for memory-mapped snapshots."""
+
+import shutil
+import tempfile
+
+from bio2bel_entrez.snapshot import Snapshot, export_snapshot
+from tests.cases import PopulatedDatabaseMixin
+
+
+class TestSnapshot(PopulatedDatabaseMixin):
+    """Test that snapshots answer the same as the manager."""
+
+    def setUp(self):
+        """Export a snapshot of the populated database."""
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.assertEqual(3, export_snapshot(self.manager.engine, self.directory))
+        self.snapshot = Snapshot(self.directory)
+
+    def tearDown(self):
+        """Remove the snapshot."""
+        shutil.rmtree(self.directory)
+        super().tearDown()
+
+    def test_get_gene_by_entrez_id(self):
+        """Test getting genes by Entrez Gene identifier."""
+        self.assertEqual(3, len(self.snapshot))
+        for record in self.manager.list_genes(records=True):
+            self.assertEqual(record, self.snapshot.get_gene_by_entrez_id(record.entrez_id))
+        self.assertIsNone(self.snapshot.get_gene_by_entrez_id('1'))
+        self.assertEqual({'5594'}, set(self.snapshot.get_genes_by_entrez_ids(['5594', '1'])))
+
+    def test_get_gene_by_symbol(self):
+        """Test getting genes by symbols of the nomenclature consortia."""
+        self.assertEqual(self.manager.get_gene_by_hgnc_name('MAPK1').entrez_id,
+                         self.snapshot.get_gene_by_hgnc_name('MAPK1').entrez_id)
+        self.assertEqual('116590', self.snapshot.get_gene_by_rgd_name('Mapk1').entrez_id)
+        self.assertEqual('116590', self.snapshot.get_gene_by_rgd_name('MAPK1').entrez_id)
+        self.assertIsNone(self.snapshot.get_gene_by_mgi_name('Mapk1'))
+        self.assertIsNone(self.snapshot.get_gene_by_hgnc_name('MAPK2'))
+
+        self.assertIsNone(self.manager.get_gene_by_symbol('human', 'MAPK1'))
+        self.assertIsNone(self.snapshot.get_gene_by_symbol('human', 'MAPK1'))
+
+    def test_get_orthologs(self):
+        """Test getting orthologs."""
+        expected = sorted(gene.entrez_id for gene in self.manager.get_orthologs('5594'))
+        self.assertEqual(expected, sorted(gene.entrez_id for gene in self.snapshot.get_orthologs('5594')))
+        self.assertEqual(
+            ['116590'],
+            [gene.entrez_id for gene in self.snapshot.get_orthologs('5594', tax_id_filter=['10116'])],
+        )